@@ -1,17 +1,18 @@
 import os
 import sys
-from time import time_ns
+from time import monotonic_ns, time_ns
 
 import pyqtgraph as pg
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from lightshow.audio import detectors
 from lightshow.audio.audio_streams import (
+    AAudioCapture,
     AAudioStreamHandler,
     AudioListener,
     LoopbackAudioStreamHandler,
 )
-from lightshow.audio.detectors.methods.percentil import Percentile
+from lightshow.audio.detectors.methods import DETECTION_METHODS, Percentile
 from lightshow.audio.processors import SpectrumProcessor
 from lightshow.devices.device import OutputDevice, PacketData, PacketStatus, PacketType
 from lightshow.devices.moving_head.moving_head import MovingHead
@@ -19,7 +20,16 @@ from lightshow.gui.main_window import UIManager
 from lightshow.tracks_tracker import PlatformSpecificTracker
 from lightshow.tracks_tracker.types import PlaybackStatus, TrackInfo
 from lightshow.utils import Logger, config
-from lightshow.utils.config import ARCH, OS, PYTHON_VERSION, VERSION, resource_path
+from lightshow.utils.config import (
+    ARCH,
+    OS,
+    PYTHON_VERSION,
+    VERSION,
+    _Settings,
+    resource_path,
+)
+from lightshow.utils.latency import LatencyStats, latency_stats
+from lightshow.utils.tracing import tracer
 from lightshow.utils.update_checker import is_update_available
 from lightshow.visualization.frequencies_visualizer import FrequenciesVisualizer
 from lightshow.visualization.spike_detector_visualizer import SpikeDetectorVisualizer
@@ -30,6 +40,9 @@ ui_manager: UIManager | None = None
 
 logger = Logger("Main")
 
+# Detectors fire up to ~100 ms after the onset (energy lookback, smoothing)
+MAX_ONSET_AGE_NS = 150_000_000
+
 
 class GuiBridge(QObject):
     clear_visualizer_signal = pyqtSignal()
@@ -39,10 +52,22 @@ class MainAudioListener(AudioListener):
     def __init__(self, AudioHandler: AAudioStreamHandler):
         super().__init__(AudioHandler)
         self.logger = Logger("AudioListener")
-        self.kick_detector = detectors.KickDetector(AudioHandler, Percentile)
+        self.kick_detector = detectors.KickDetector(
+            AudioHandler,
+            DETECTION_METHODS.get(
+                config.global_config.settings[_Settings.BEAT_ALGORITHM], Percentile
+            ),
+        )
         self.silent_detector = detectors.SilentDetector()
-        self.break_detector = detectors.BreakDetector(30)
-        self.drop_detector = detectors.DropDetector(30, 5)
+        self.percussion_detector = detectors.MultibandDetector(AudioHandler)
+        self.snare_row = self.percussion_detector.index("snare")
+        self.hihat_row = self.percussion_detector.index("hihat")
+        # Beat timestamps shared by the break and drop detectors
+        self.beat_tracker = detectors.BeatIntervalTracker(30)
+        self.break_detector = detectors.BreakDetector(30, self.beat_tracker)
+        self.drop_detector = detectors.DropDetector(30, 5, self.beat_tracker)
+        self.tempo_tracker = detectors.TempoTracker()
+        self.latest_data = None
         self.kick_visualizer: SpikeDetectorVisualizer | None = None
         self.freq_visualizer: FrequenciesVisualizer | None = None
         self.gui_bridge = GuiBridge()
@@ -53,6 +78,18 @@ class MainAudioListener(AudioListener):
             self.on_playback_status_changed
         )
         self.clear_state()
+        self.tempo_tracker.start(self._on_predicted_beat)
+
+    def on_device_change(self, capture: AAudioCapture) -> None:
+        super().on_device_change(capture)
+        self.tempo_tracker.configure(capture.sample_rate, capture.chunk_size)
+
+    def set_beat_algorithm(self, name: str) -> None:
+        method = DETECTION_METHODS.get(name)
+        if method is None:
+            self.logger.warning(f"Unknown beat algorithm {name}, using Percentile")
+            method = Percentile
+        self.kick_detector.set_detection_method(method)
 
     def changed_visualizer_settings(self) -> None:
         if hasattr(self, "kick_visualizer") and self.kick_visualizer:
@@ -76,13 +113,13 @@ class MainAudioListener(AudioListener):
 
         if status == PlaybackStatus.PAUSED:
             self.music_paused = True
-            self.paused_since = time_ns()
+            self.paused_since = monotonic_ns()
             self.send_packet_to_devices(PacketData(PacketType.BREAK, PacketStatus.ON))
 
         elif status == PlaybackStatus.PLAYING:
             self.music_paused = False
             self.break_detector.clear_old_beats()
-            self.break_detector.clean_beats(time_ns() - self.paused_since)
+            self.break_detector.clean_beats(monotonic_ns() - self.paused_since)
             self.send_packet_to_devices(PacketData(PacketType.BREAK, PacketStatus.OFF))
             self.paused_since = 0
 
@@ -102,18 +139,19 @@ class MainAudioListener(AudioListener):
         self.power_decay_time = 0.5  # Decay power over 0.5 seconds
         if hasattr(self, "kick_detector"):
             self.kick_detector.clear()
-            self.break_detector.clear()
-            self.drop_detector.clear()
+            self.percussion_detector.clear()
+            self.beat_tracker.clear()
+            self.tempo_tracker.reset()
         if hasattr(self, "kick_visualizer") and self.kick_visualizer:
             self.gui_bridge.clear_visualizer_signal.emit()
         if isinstance(self.stream_handler, LoopbackAudioStreamHandler):
             try:
                 if self.stream_handler.audio_capture:
-                    self.stream_handler.audio_capture.audio_buffer.clear()
-                    self.stream_handler.audio_capture.sample_queue.queue.clear()
+                    self.stream_handler.audio_capture.clear_pending()
             except AttributeError as e:
                 logger.error(str(e))
 
+    @tracer.traced("send_packet_to_devices")
     def send_packet_to_devices(self, packet: PacketData, force=False) -> None:
         devices = config.live_devices.copy()
         if force:  # Manual packets
@@ -159,11 +197,61 @@ class MainAudioListener(AudioListener):
             return 0
         return power
 
-    def _stop_break(self, data) -> None:
+    def _predictive_beats(self) -> bool:
+        return (
+            config.global_config.settings[_Settings.PREDICTIVE_BEATS]
+            and self.tempo_tracker.locked
+        )
+
+    def _on_predicted_beat(self, beat_ns: int) -> None:
+        """Called by the tempo tracker's scheduler, lead ms before beat_ns."""
+        if self.music_paused or self.break_detected or not self._predictive_beats():
+            return
+        self.send_packet_to_devices(
+            PacketData(
+                PacketType.BEAT,
+                PacketStatus.ON,
+                audio_data=self.latest_data,
+                power=self.current_power,
+                timestamp=beat_ns,
+            )
+        )
+
+    def _send_percussion(self, data) -> None:
+        onsets = self.percussion_detector.detect(
+            data, append_current_energy=not self.break_detected
+        )
+        for row, packet_type in (
+            (self.snare_row, PacketType.SNARE),
+            (self.hihat_row, PacketType.HIHAT),
+        ):
+            if onsets[row]:
+                self.send_packet_to_devices(
+                    PacketData(packet_type, PacketStatus.ON, audio_data=data)
+                )
+
+    def _onset_ns(self, data, chunk_end_ns: int) -> int:
+        """
+        Time of the bass onset behind a beat detected on data, to the sample
+        when the bass tracker saw it. chunk_end_ns is when the chunk's last
+        sample was captured.
+        """
+        offset = data.onset_offset
+        if offset is None:
+            return chunk_end_ns
+        age = int((self.chunk_size - offset) * 1e9 / self.sample_rate)
+        # An older onset belongs to an earlier beat, not to this detection
+        return chunk_end_ns - age if 0 <= age <= MAX_ONSET_AGE_NS else chunk_end_ns
+
+    def _stop_break(self, data, now_ns: int | None = None) -> None:
         self.break_detected = False
         self.kick_detector.reset_state()
         self.break_detector.clear_old_beats()
-        self.break_detector.clean_beats(time_ns() - self.break_detector.beats[-1])
+        last_beat = self.beat_tracker.last()
+        if last_beat is not None:
+            if now_ns is None:
+                now_ns = monotonic_ns()
+            self.break_detector.clean_beats(now_ns - last_beat)
         self.send_packet_to_devices(
             PacketData(PacketType.BREAK, PacketStatus.OFF, audio_data=data)
         )
@@ -182,34 +270,55 @@ class MainAudioListener(AudioListener):
             self.freq_visualizer(data)
         if self.music_paused:
             return True
+        # Capture time of the chunk's end, so queue / GUI thread delays don't
+        # shift the onsets and the tempo grid
+        chunk_end_ns = data.captured_ns or monotonic_ns()
+        self.latest_data = data
+        self.tempo_tracker.lead_ms = config.global_config.settings[
+            _Settings.BEAT_LEAD_MS
+        ]
+        self.tempo_tracker.update(data, chunk_end_ns)
         beat = self.kick_detector.detect(
             data, append_current_energy=not self.break_detected
         )
+        latency_stats.record(LatencyStats.FFT_TO_DETECTOR, data.processed_ns)
 
         if beat:
-            try:
-                bass_energy = data.frequencies[0]
-                beat_intensity = min(bass_energy / 1e13, 1.0)
-            except IndexError:
-                beat_intensity = 1.0
+            beat_ns = self._onset_ns(data, chunk_end_ns)
+            if data.bass_intensity is not None:
+                beat_intensity = data.bass_intensity
+            else:
+                try:
+                    bass_energy = data.frequencies[0]
+                    beat_intensity = min(bass_energy / 1e13, 1.0)
+                except IndexError:
+                    beat_intensity = 1.0
 
             self.set_beat_power(beat_intensity)
 
             if self.break_detected:
-                self._stop_break(data)
-            self.break_detector.on_beat()
-            self.drop_detector.on_beat()
-            self.send_packet_to_devices(
-                PacketData(
-                    PacketType.BEAT,
-                    PacketStatus.ON,
-                    audio_data=data,
-                    power=self.current_power,
+                self._stop_break(data, beat_ns)
+            self.beat_tracker.on_beat(beat_ns)
+            self.tempo_tracker.on_beat(beat_ns)
+            # Once locked, beats go out from the tempo tracker ahead of time
+            if not self._predictive_beats():
+                self.send_packet_to_devices(
+                    PacketData(
+                        PacketType.BEAT,
+                        PacketStatus.ON,
+                        audio_data=data,
+                        power=self.current_power,
+                        timestamp=beat_ns,
+                    )
                 )
-            )
+
+        if config.global_config.settings[_Settings.PERCUSSION_PACKETS]:
+            self._send_percussion(data)
 
         mbreak, drop = False, False
-        if not self.break_detected and self.break_detector.detect(data):
+        if not self.break_detected and self.break_detector.detect(
+            data, now_ns=chunk_end_ns
+        ):
             self.break_detected = True
             self.send_packet_to_devices(
                 PacketData(PacketType.BREAK, PacketStatus.ON, audio_data=data)
@@ -1,7 +1,8 @@
 import threading
+import time
 import traceback
 from collections.abc import Callable
-from queue import Full, Queue
+from queue import Empty, Full, Queue
 
 import numpy as np
 import soundcard as sc
@@ -13,10 +14,15 @@ from lightshow.audio.audio_types import (
     AudioListenerType,
     Processor,
 )
+from lightshow.audio.data import AudioData
+from lightshow.audio.processors import BufferedSpectrumProcessor, SpectrumProcessor
+from lightshow.audio.ring_buffer import SampleRingBuffer, normalize_chunk
 from lightshow.gui.utils.ui_signals import ui_signals
 from lightshow.utils import global_config
-from lightshow.utils.config import Config
+from lightshow.utils.config import Config, _Settings
+from lightshow.utils.latency import LatencyStats, latency_stats
 from lightshow.utils.logger import Logger
+from lightshow.utils.tracing import tracer
 
 # ---------------------------------------------------------------------------
 # LoopbackAudioCapture
@@ -31,6 +37,11 @@ class LoopbackAudioCapture(AAudioCapture):
     soundcard's record() is a blocking call, so capture runs in its own
     thread and pushes chunks into a bounded queue — identical pattern to
     the sounddevice-based AudioCapture.
+
+    With dsp_thread=True a second worker thread drains the queue as soon as
+    a chunk arrives, so the FFT, detectors and packet sending no longer wait
+    on the Qt timer. Otherwise the GUI thread must call
+    process_queued_samples() itself.
     """
 
     def __init__(
@@ -42,6 +53,7 @@ class LoopbackAudioCapture(AAudioCapture):
         max_buffer: int = 256,
         channels: int = 1,
         sample_rate: int = 44100,
+        dsp_thread: bool = False,
     ):
         # AAudioCapture sets: sample_rate, chunk_size, audio_buffer, channels
         super().__init__(
@@ -63,6 +75,11 @@ class LoopbackAudioCapture(AAudioCapture):
         self._stop_event = threading.Event()
         self._capture_thread: threading.Thread | None = None
 
+        # Set by the capture thread whenever a chunk is pushed
+        self.dsp_thread_enabled = dsp_thread
+        self._data_ready = threading.Event()
+        self._dsp_thread: threading.Thread | None = None
+
     # ------------------------------------------------------------------
     # AAudioCapture interface
     # ------------------------------------------------------------------
@@ -78,8 +95,13 @@ class LoopbackAudioCapture(AAudioCapture):
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _enqueue(self, raw: np.ndarray) -> None:
-        """Normalise a raw frame array and push it onto the queue."""
+    def _enqueue(self, raw: np.ndarray, captured_ns: int | None = None) -> None:
+        """
+        Normalise a raw frame array and push it onto the queue with its
+        time.monotonic_ns() capture stamp (now by default).
+        """
+        if captured_ns is None:
+            captured_ns = time.monotonic_ns()
         # raw shape: (frames, channels) — mix down to mono
         if raw.ndim == 2:
             samples = raw[:, 0].copy()
@@ -92,17 +114,12 @@ class LoopbackAudioCapture(AAudioCapture):
         else:
             samples = samples[: self.chunk_size]
 
-        # Normalise / clamp
-        max_abs = float(np.abs(samples).max())
-        if 0.001 < max_abs < 0.1:
-            samples = samples * 5.0
-        elif max_abs > 1.0:
-            samples = np.clip(samples, -1.0, 1.0)
+        normalize_chunk(samples)
 
         self.audio_buffer.append(samples)
 
         try:
-            self.sample_queue.put(samples, block=True, timeout=0.05)
+            self.sample_queue.put((samples, captured_ns), block=True, timeout=0.05)
         except Full:
             self.logger.debug("Loopback queue full – dropping chunk")
 
@@ -118,7 +135,9 @@ class LoopbackAudioCapture(AAudioCapture):
                 while not self._stop_event.is_set():
                     # record() blocks until chunk_size frames are available
                     data = recorder.record(numframes=self.chunk_size)
-                    self._enqueue(data)
+                    # The chunk is complete once record() returns
+                    self._enqueue(data, time.monotonic_ns())
+                    self._data_ready.set()
         except Exception:  # noqa: BLE001
             self.logger.error(f"Loopback capture error: {traceback.format_exc()}")
 
@@ -128,6 +147,18 @@ class LoopbackAudioCapture(AAudioCapture):
             )
         self.logger.info("Loopback capture thread stopped")
 
+    def _dsp_loop(self) -> None:
+        """Processes chunks as soon as they are captured – runs in a dedicated thread."""
+        self.logger.info("DSP worker thread started")
+        while not self._stop_event.is_set():
+            if not self._data_ready.wait(timeout=0.1):
+                continue
+            # Clear before draining so a chunk pushed meanwhile re-arms the event
+            self._data_ready.clear()
+            while self.process_queued_samples() and not self._stop_event.is_set():
+                pass
+        self.logger.info("DSP worker thread stopped")
+
     # ------------------------------------------------------------------
     # Thread control
     # ------------------------------------------------------------------
@@ -138,43 +169,42 @@ class LoopbackAudioCapture(AAudioCapture):
             target=self._capture_loop, daemon=True, name="LoopbackCapture"
         )
         self._capture_thread.start()
+        if self.dsp_thread_enabled:
+            self._dsp_thread = threading.Thread(
+                target=self._dsp_loop, daemon=True, name="DSPWorker"
+            )
+            self._dsp_thread.start()
 
     def stop(self) -> None:
         self._stop_event.set()
         if self._capture_thread:
             self._capture_thread.join(timeout=2.0)
             self._capture_thread = None
+        if self._dsp_thread:
+            self._dsp_thread.join(timeout=2.0)
+            self._dsp_thread = None
 
     # ------------------------------------------------------------------
-    # Queue processing (call from main / GUI thread, same as AudioCapture)
+    # Queue processing (GUI thread, or the DSP worker when dsp_thread=True)
     # ------------------------------------------------------------------
 
-    def process_queued_samples(self, max_per_frame: int = 25) -> None:
+    @tracer.traced("process_queued_samples")
+    def process_queued_samples(self, max_per_frame: int = 25) -> int:
         """
         Drain the queue and call listeners.  Identical contract to the
         sounddevice-based AudioCapture.process_queued_samples().
+        Returns the number of chunks processed.
+
+        A backlog of several chunks is processed as one batch.
         """
+        if min(self.sample_queue.qsize(), max_per_frame) > 1:
+            return self._process_queued_batch(max_per_frame)
+
         processed = 0
         while not self.sample_queue.empty() and processed < max_per_frame:
             try:
-                samples = self.sample_queue.get_nowait()
-                treated = self.processor.process(samples)
-
-                dead: list[AudioListenerType] = []
-                for listener in list(self.listeners):
-                    try:
-                        keep = listener(treated)
-                        if keep is False:
-                            dead.append(listener)
-                    except Exception:  # noqa
-                        self.logger.error(f"Listener error: {traceback.format_exc()}")
-                        ui_signals.show_error.emit(
-                            "Audio Error",
-                            f"Error in callback for listener '{listener.__class__.__name__}': \n {traceback.format_exc()}",
-                        )
-                for d in dead:
-                    self.listeners.remove(d)
-
+                samples, captured_ns = self.sample_queue.get_nowait()
+                self._process_samples(samples, captured_ns)
                 processed += 1
             except Exception as e:  # noqa
                 self.logger.error(f"Queue drain error: {e}")
@@ -183,6 +213,76 @@ class LoopbackAudioCapture(AAudioCapture):
                     f"An error occurred while processing queued samples: \n {traceback.format_exc()}",
                 )
                 break
+        return processed
+
+    def _process_queued_batch(self, max_per_frame: int) -> int:
+        chunks: list[np.ndarray] = []
+        stamps: list[int] = []
+        while len(chunks) < max_per_frame:
+            try:
+                samples, captured_ns = self.sample_queue.get_nowait()
+            except Empty:
+                break
+            chunks.append(samples)
+            stamps.append(captured_ns)
+        if not chunks:
+            return 0
+        try:
+            self._process_batch(np.stack(chunks), stamps)
+        except Exception as e:  # noqa
+            self.logger.error(f"Queue batch error: {e}")
+            ui_signals.show_error.emit(
+                "Audio Error",
+                f"An error occurred while processing queued samples: \n {traceback.format_exc()}",
+            )
+        return len(chunks)
+
+    def _process_samples(
+        self, samples: np.ndarray, captured_ns: int | None = None
+    ) -> None:
+        """Run one chunk through the processor and every listener."""
+        if captured_ns is None:
+            captured_ns = time.monotonic_ns()
+        treated = self.processor.process(samples)
+        self._stamp(treated, captured_ns, time.monotonic_ns())
+        self._notify_listeners(treated)
+
+    def _process_batch(self, batch: np.ndarray, stamps=None) -> None:
+        """Run a (n_chunks, chunk_size) backlog through the processor, then the listeners frame by frame."""
+        if stamps is None:
+            stamps = [time.monotonic_ns()] * len(batch)
+        frames = self.processor.process_batch(batch)
+        processed_ns = time.monotonic_ns()
+        for treated, captured_ns in zip(frames, stamps, strict=True):
+            self._stamp(treated, int(captured_ns), processed_ns)
+            self._notify_listeners(treated)
+
+    @staticmethod
+    def _stamp(treated: AudioData, captured_ns: int, processed_ns: int) -> None:
+        treated.captured_ns = captured_ns
+        treated.processed_ns = processed_ns
+        latency_stats.record(LatencyStats.CAPTURE_TO_FFT, captured_ns, processed_ns)
+
+    def _notify_listeners(self, treated: AudioData) -> None:
+        dead: list[AudioListenerType] = []
+        for listener in list(self.listeners):
+            try:
+                keep = listener(treated)
+                if keep is False:
+                    dead.append(listener)
+            except Exception:  # noqa
+                self.logger.error(f"Listener error: {traceback.format_exc()}")
+                ui_signals.show_error.emit(
+                    "Audio Error",
+                    f"Error in callback for listener '{listener.__class__.__name__}': \n {traceback.format_exc()}",
+                )
+        for d in dead:
+            self.listeners.remove(d)
+
+    def clear_pending(self) -> None:
+        """Drop every captured chunk that has not been processed yet."""
+        self.audio_buffer.clear()
+        self.sample_queue.queue.clear()
 
     # ------------------------------------------------------------------
     # Listener management (mirrors AudioCapture)
@@ -209,6 +309,92 @@ class LoopbackAudioCapture(AAudioCapture):
         return self.audio_buffer[-1] if self.audio_buffer else None
 
 
+# ---------------------------------------------------------------------------
+# RingBufferAudioCapture
+# ---------------------------------------------------------------------------
+
+
+class RingBufferAudioCapture(LoopbackAudioCapture):
+    """
+    LoopbackAudioCapture backed by a preallocated SampleRingBuffer instead of
+    the deque + Queue pair.
+
+    The capture thread normalises each chunk directly into a ring slot and
+    never blocks (a full ring drops the chunk), and process_queued_samples()
+    hands listeners views of the slots, so nothing is allocated per chunk.
+    """
+
+    def __init__(
+        self,
+        processor: Processor,
+        stream_handler: AAudioStreamHandler,
+        loopback_mic,
+        chunk_size: int = 1024,
+        max_buffer: int = 256,
+        channels: int = 1,
+        sample_rate: int = 44100,
+        dsp_thread: bool = False,
+        ring_capacity: int = 64,
+    ):
+        super().__init__(
+            processor=processor,
+            stream_handler=stream_handler,
+            loopback_mic=loopback_mic,
+            chunk_size=chunk_size,
+            max_buffer=max_buffer,
+            channels=channels,
+            sample_rate=sample_rate,
+            dsp_thread=dsp_thread,
+        )
+        self.logger = Logger("RingBufferAudioCapture")
+        self.ring = SampleRingBuffer(chunk_size, ring_capacity)
+        # Set by clear_pending(), the drain clears the ring itself so the read
+        # counter keeps a single writer
+        self._clear_requested = False
+
+    def _enqueue(self, raw: np.ndarray, captured_ns: int | None = None) -> None:
+        if captured_ns is None:
+            captured_ns = time.monotonic_ns()
+        if not self.ring.write(raw, captured_ns):
+            self.logger.debug("Loopback ring full – dropping chunk")
+
+    @tracer.traced("process_queued_samples")
+    def process_queued_samples(self, max_per_frame: int = 25) -> int:
+        if self._clear_requested:
+            # Reset before clearing, a request made meanwhile waits for the next drain
+            self._clear_requested = False
+            self.ring.clear()
+        processed = 0
+        while processed < max_per_frame:
+            # Backlogged slots are contiguous views, batch them without copying
+            chunks = self.ring.peek_batch(max_per_frame - processed)
+            if chunks is None:
+                break
+            stamps = self.ring.peek_timestamps(len(chunks))
+            try:
+                if len(chunks) > 1:
+                    self._process_batch(chunks, stamps)
+                else:
+                    self._process_samples(chunks[0], int(stamps[0]))
+            except Exception as e:  # noqa
+                self.logger.error(f"Ring drain error: {e}")
+                ui_signals.show_error.emit(
+                    "Audio Error",
+                    f"An error occurred while processing queued samples: \n {traceback.format_exc()}",
+                )
+                self.ring.release(len(chunks))
+                break
+            self.ring.release(len(chunks))
+            processed += len(chunks)
+        return processed
+
+    def clear_pending(self) -> None:
+        self._clear_requested = True
+
+    def get_latest_data(self) -> np.ndarray | None:
+        return self.ring.latest()
+
+
 # ---------------------------------------------------------------------------
 # LoopbackAudioStreamHandler
 # ---------------------------------------------------------------------------
@@ -230,7 +416,9 @@ class LoopbackAudioStreamHandler(AAudioStreamHandler):
 
     def __init__(self, processor: type[Processor], config: Config):
         self.logger = Logger("LoopbackAudioStreamHandler")
-        self.chunk_size: int = getattr(config, "chunk_size", 1024) or 1024
+        self.chunk_size: int = 1024
+        self.fft_size: int = 1024
+        self._load_sizes(config)
         self.processor_class = processor
 
         self.device_change_listeners: list[Callable[[LoopbackAudioCapture], None]] = []
@@ -258,7 +446,7 @@ class LoopbackAudioStreamHandler(AAudioStreamHandler):
             self.logger.warning("reinit already in progress, skipping")
             return
         self._reinit_thread = threading.Thread(
-            target=self._reinit_stream_worker, daemon=True
+            target=self._reinit_stream_worker, daemon=True, name="StreamReinit"
         )
         self._reinit_thread.start()
 
@@ -266,7 +454,7 @@ class LoopbackAudioStreamHandler(AAudioStreamHandler):
         self.logger.info("(Re)initialising loopback stream")
         try:
             self.stop_stream()
-            self.chunk_size = getattr(global_config, "chunk_size", 1024) or 1024
+            self._load_sizes(global_config)
             self.setup_device()
             self.start_stream()
 
@@ -285,6 +473,26 @@ class LoopbackAudioStreamHandler(AAudioStreamHandler):
                 f"Loopback stream init failed: \n {traceback.format_exc()}",
             )
 
+    def _load_sizes(self, config: Config) -> None:
+        """
+        CHUNK_SIZE is the FFT window, HOP_SIZE the capture block size. A hop
+        smaller than the window gives overlapping (STFT) frames.
+        """
+        self.fft_size = config.settings[_Settings.CHUNK_SIZE] or 1024
+        hop_size = config.settings[_Settings.HOP_SIZE] or self.fft_size
+        self.chunk_size = min(hop_size, self.fft_size)
+
+    def _create_processor(self) -> Processor:
+        processor_class = self.processor_class
+        if (
+            processor_class is SpectrumProcessor
+            and global_config.settings[_Settings.SPECTRUM_BUFFERS]
+        ):
+            processor_class = BufferedSpectrumProcessor
+        return processor_class(
+            self.chunk_size, self.sample_rate, fft_size=self.fft_size
+        )
+
     def setup_device(self) -> None:
         """Resolve the soundcard loopback microphone for the target speaker."""
         try:
@@ -297,7 +505,7 @@ class LoopbackAudioStreamHandler(AAudioStreamHandler):
 
             self.logger.debug(
                 f"Loopback device: '{self._loopback_mic.name}' ({self._loopback_mic.id}) | "
-                f"SR={self.sample_rate} | chunk={self.chunk_size}"
+                f"SR={self.sample_rate} | hop={self.chunk_size} | fft={self.fft_size}"
             )
 
         except Exception as e:
@@ -306,15 +514,21 @@ class LoopbackAudioStreamHandler(AAudioStreamHandler):
 
     def start_stream(self) -> None:
         try:
-            processor = self.processor_class(self.chunk_size, self.sample_rate)
+            processor = self._create_processor()
 
-            self.audio_capture = LoopbackAudioCapture(
+            capture_class = (
+                RingBufferAudioCapture
+                if global_config.settings[_Settings.CAPTURE_BUFFER] == "Ring Buffer"
+                else LoopbackAudioCapture
+            )
+            self.audio_capture = capture_class(
                 processor=processor,
                 stream_handler=self,
                 loopback_mic=self._loopback_mic,
                 chunk_size=self.chunk_size,
                 channels=self.channels,
                 sample_rate=self.sample_rate,
+                dsp_thread=global_config.settings[_Settings.DSP_THREAD],
             )
 
             for listener in self.device_change_listeners:
@@ -84,15 +84,27 @@ class AudioDevice:
 
 
 class Processor(ABC):
-    def __init__(self, chunk_size: int, sample_rate: int):
+    def __init__(self, chunk_size: int, sample_rate: int, fft_size: int | None = None):
+        """
+        :param chunk_size: Samples per incoming chunk, i.e. the hop between two frames.
+        :param fft_size: Analysis window length, defaults to chunk_size (no overlap).
+        """
         self.chunk_size = chunk_size
         self.sample_rate = sample_rate
+        self.fft_size = fft_size or chunk_size
         super().__init__()
 
     @abstractmethod
     def process(self, data: np.ndarray) -> AudioData:
         pass
 
+    def process_batch(self, chunks: np.ndarray) -> list[AudioData]:
+        """
+        Process a (n_chunks, chunk_size) backlog in order. Override with a
+        vectorized implementation where possible.
+        """
+        return [self.process(chunk) for chunk in chunks]
+
 
 class AAudioCapture(ABC):
     def __init__(
@@ -105,6 +117,7 @@ class AAudioCapture(ABC):
     ):
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
+        self.fft_size = processor.fft_size
         self.audio_buffer: deque = deque(maxlen=max_buffer)
         self.channels = channels
 
@@ -156,12 +169,14 @@ class AudioListener(ABC):
         self.stream_handler.add_device_change_listener(self.on_device_change)
         self.channels: int = 1
         self.chunk_size: int = 1024
+        self.fft_size: int = 1024
         self.sample_rate: int = 44100
         super().__init__()
 
     def on_device_change(self, capture: AAudioCapture) -> None:
         self.channels = capture.channels
         self.chunk_size = capture.chunk_size
+        self.fft_size = capture.fft_size
         self.sample_rate = capture.sample_rate
 
     @abstractmethod
@@ -0,0 +1,132 @@
+import numpy as np
+
+
+class BassTracker:
+    """
+    Sliding DFT of a few bass frequencies over the raw samples.
+
+    The DFT of the last `window` samples is evaluated at the end of every
+    `block` samples instead of once per chunk. Each new block is reduced to
+    its DFT sums with one small matmul against the cos / sin basis of the
+    tracked frequencies; the block sums (kept for the window's worth of
+    earlier blocks) are rotated to a common time origin and prefix-summed,
+    and every window sum is the difference of two prefix sums.
+
+    The block levels give the bass amplitude (0-1, 1 being a full scale sine)
+    and locate onsets within a block.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frequencies=(50.0, 75.0, 100.0, 130.0),
+        window: float = 0.02,  # Seconds, long enough to hold a bass period
+        block: int = 32,
+        min_level: float = 0.01,
+        max_age: float = 0.5,  # Seconds an onset stays reported
+    ):
+        self.sample_rate = sample_rate
+        self.frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.block = block
+        # Whole blocks, the windows then start and end on block boundaries
+        self.window = max(1, round(window * sample_rate / block)) * block
+        self.min_level = min_level
+        self.max_age = int(max_age * sample_rate)
+        self._size = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self._size = 0
+        self._position = 0  # Samples seen so far
+        self._levels = np.zeros(1)  # Previous chunk's levels ...
+        self._positions = np.zeros(1, dtype=np.int64)  # ... and where they end
+        self._onset: int | None = None
+
+    def _allocate(self, size: int) -> None:
+        if size % self.block:
+            raise ValueError(f"Chunk size {size} is not a multiple of {self.block}")
+        self._size = size
+        count = self.frequencies.size
+        window_blocks = self.window // self.block
+        total = window_blocks + size // self.block
+        omega = 2 * np.pi * self.frequencies / self.sample_rate
+
+        # Interleaved re / im columns, so the matmul output views as complex
+        t = np.arange(self.block)[:, None] * omega
+        self._basis = np.stack((np.cos(t), -np.sin(t)), axis=2).reshape(-1, 2 * count)
+        # Block b starts b * block samples after the oldest one in the window
+        offsets = np.arange(total)[:, None] * self.block
+        self._rotation = np.exp(-1j * omega * offsets)
+        # Unrotated sums of the window_blocks previous blocks, then this chunk's
+        self._block_sums = np.zeros((total, count), dtype=complex)
+        # Leading zero row: window sums are prefix[end] - prefix[end - window]
+        self._prefix = np.zeros((total + 1, count), dtype=complex)
+        self._window_blocks = window_blocks
+        self._ends = np.arange(self.block, size + 1, self.block)  # Level ends
+        self._scale = 2.0 / self.window
+
+    def process(self, samples: np.ndarray) -> tuple[int | None, float]:
+        """
+        Feed one chunk. Returns the latest onset as a sample offset from the
+        start of this chunk (negative when it was in an earlier chunk, None
+        without a recent onset) and the peak bass level of the chunk.
+        """
+        size = samples.size
+        if size == 0:
+            return self.onset_offset(), 0.0
+        if size != self._size:
+            self._allocate(size)
+
+        window = self._window_blocks
+        sums, prefix = self._block_sums, self._prefix
+        sums[:window] = sums[-window:]
+        np.matmul(
+            samples.reshape(-1, self.block),
+            self._basis,
+            out=sums[window:].view(np.float64),
+        )
+        blocks = prefix[1:]
+        np.multiply(sums, self._rotation, out=blocks)
+        np.cumsum(blocks, axis=0, out=blocks)
+        windows = prefix[window + 1 :] - prefix[1 : size // self.block + 1]
+        levels = np.abs(windows).max(axis=1) * self._scale
+
+        start = self._position
+        self._locate_onset(levels, start + self._ends)
+        self._position += size
+        return self.onset_offset(start), float(min(levels.max(), 1.0))
+
+    def _locate_onset(self, levels: np.ndarray, positions: np.ndarray) -> None:
+        # Rises can straddle two chunks, look at both
+        history = np.concatenate((self._levels, levels))
+        history_positions = np.concatenate((self._positions, positions))
+        self._levels, self._positions = levels, positions
+
+        peak = history.size - levels.size + int(np.argmax(levels))
+        low = int(np.argmin(history[: peak + 1]))
+        base, top = history[low], history[peak]
+        rise = top - base
+        if rise < self.min_level or rise < 0.5 * top:
+            return
+        if history[low : peak + 1].max() > top:
+            return  # Decay of a louder onset from the previous chunk
+        # A window sliding over a sine onset grows linearly for a window
+        # length: extrapolate the steepest step back to the base level.
+        # Exact on a partial rise too, which is all a detector firing in the
+        # middle of it gets to see.
+        steps = np.diff(history[low : peak + 1])
+        step = int(np.argmax(steps))
+        slope = steps[step] / self.block
+        end = low + step + 1
+        onset = history_positions[end] - (history[end] - base) / slope
+        # A rise that started in the previous chunk is located again and
+        # replaces the earlier estimate
+        self._onset = int(onset)
+
+    def onset_offset(self, chunk_start: int | None = None) -> int | None:
+        if self._onset is None:
+            return None
+        start = self._position if chunk_start is None else chunk_start
+        if start + self._size - self._onset > self.max_age:
+            return None
+        return self._onset - start
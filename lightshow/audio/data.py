@@ -1,22 +1,123 @@
+import threading
+from typing import ClassVar
+
 import numpy as np
 
 
 class AudioData:
     """
     Audio data containing frequency spectrum (FFT) with X frequency elements.
+
+    Band means are cached: every band range ever requested is registered on
+    the class, and the first band lookup on a frame computes all registered
+    bands in a single np.add.reduceat pass. Later lookups on the same frame
+    are dict / array reads, whatever the number of detectors and fixtures
+    asking for them.
     """
 
-    def __init__(self, frequencies):
+    # Registered bands, shared by every frame. Only replaced under the lock,
+    # readers take a consistent snapshot by reading _bands once.
+    _bands: ClassVar[tuple[tuple[int, int], ...]] = ()
+    _band_index: ClassVar[dict[tuple[int, int], int]] = {}
+    _band_names: ClassVar[dict[str, int]] = {}
+    _band_lock: ClassVar[threading.Lock] = threading.Lock()
+    # Spectrum length -> (bands, prefix positions of starts / stops, edges, sizes)
+    _band_layouts: ClassVar[dict[int, tuple]] = {}
+
+    def __init__(self, frequencies, mel=None, onset_offset=None, bass_intensity=None):
         """
         :param frequencies: Array of X frequency magnitude values from FFT
+        :param mel: Optional mel band energies of the same frame
+        :param onset_offset: Samples from the start of the frame's chunk to the
+            latest bass onset (negative if it was in an earlier chunk)
+        :param bass_intensity: Peak bass level of the chunk, 0-1
         """
         self.frequencies = frequencies
+        self.mel = mel
+        self.onset_offset = onset_offset
+        self.bass_intensity = bass_intensity
+        # time.monotonic_ns() when the chunk was captured / its FFT finished,
+        # set by the capture
+        self.captured_ns: int | None = None
+        self.processed_ns: int | None = None
+        self._band_means: np.ndarray | None = None
+        self._band_count = 0
+
+    @classmethod
+    def register_band(cls, range, name: str | None = None) -> int:
+        """
+        Register a [start, stop) bin range so it is computed with the other
+        bands on every frame. Returns the band slot; name allows looking it up
+        with get_band_mean().
+        """
+        key = (int(range[0]), int(range[1]))
+        with cls._band_lock:
+            slot = cls._band_index.get(key)
+            if slot is None:
+                slot = len(cls._bands)
+                cls._band_index = {**cls._band_index, key: slot}
+                cls._band_layouts = {}
+                cls._bands = (*cls._bands, key)
+            if name is not None:
+                cls._band_names = {**cls._band_names, name: slot}
+        return slot
+
+    @classmethod
+    def _band_layout(cls, size: int) -> tuple:
+        layout = cls._band_layouts.get(size)
+        bands = cls._bands
+        if layout is not None and layout[0] is bands:
+            return layout
+
+        ranges = np.clip(np.array(bands, dtype=np.intp).reshape(-1, 2), 0, size)
+        np.maximum(ranges[:, 1], ranges[:, 0], out=ranges[:, 1])
+        edges = np.unique(ranges)
+        edges = edges[edges < size]
+        # Position of each band boundary in the prefix sums over the segments
+        positions = np.searchsorted(edges, ranges)
+        sizes = (ranges[:, 1] - ranges[:, 0]).astype(np.float64)
+        layout = (bands, positions[:, 0], positions[:, 1], edges, sizes)
+        cls._band_layouts = {**cls._band_layouts, size: layout}
+        return layout
+
+    def _compute_bands(self) -> np.ndarray:
+        bands, starts, stops, edges, sizes = self._band_layout(len(self.frequencies))
+        prefix = np.zeros(edges.size + 1, dtype=np.float64)
+        if edges.size:
+            np.cumsum(
+                np.add.reduceat(self.frequencies, edges, dtype=np.float64),
+                out=prefix[1:],
+            )
+        # Empty ranges give nan, like np.mean on an empty slice
+        self._band_means = (prefix[stops] - prefix[starts]) / sizes
+        self._band_count = len(bands)
+        return self._band_means
+
+    def _band_mean(self, slot: int) -> float:
+        means = self._band_means
+        if means is None or slot >= self._band_count:
+            means = self._compute_bands()
+        return float(means[slot])
+
+    def get_band_means(self, slots: np.ndarray) -> np.ndarray:
+        """Means of several registered bands at once, indexed by slot."""
+        means = self._band_means
+        if means is None or int(slots.max()) >= self._band_count:
+            means = self._compute_bands()
+        return means[slots]
+
+    def get_band_mean(self, name: str) -> float:
+        """Get the mean of a band registered with register_band(..., name)."""
+        return self._band_mean(AudioData._band_names[name])
 
     def get_freq_mean(self, range) -> float:
         """Get mean frequency magnitude over a range of indices."""
         if len(range) > 2:
             raise ValueError("Range must be a list of two elements.")
-        return np.mean(self.frequencies[range[0] : range[1]])
+        slot = AudioData._band_index.get((range[0], range[1]))
+        if slot is None:
+            slot = AudioData.register_band(range)
+        return self._band_mean(slot)
 
     # Aliases for backwards compatibility with existing detectors
     def get_ps_mean(self, range):
@@ -24,5 +125,12 @@ class AudioData:
         return self.get_freq_mean(range)
 
     def get_mel_mean(self, range):
-        """Alias for get_freq_mean (mel energies are now represented by frequencies)."""
-        return self.get_freq_mean(range)
+        """
+        Mean of the mel bands in range, or of the linear bins in range when
+        the processor did not compute mel energies.
+        """
+        if self.mel is None:
+            return self.get_freq_mean(range)
+        if len(range) > 2:
+            raise ValueError("Range must be a list of two elements.")
+        return float(self.mel[range[0] : range[1]].mean())
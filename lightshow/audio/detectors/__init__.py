@@ -1,15 +1,25 @@
+from .beat_tracker import BeatIntervalTracker
 from .break_detector import BreakDetector
 from .drop_detector import DropDetector
 from .kick_detector import KickDetector
+from .multiband_detector import MultibandDetector, PercussionBand
+from .rolling_window import QuantileWindow, RollingWindow
 from .silent_detector import SilentDetector
 from .spike_detector import AudioData, DetectionType, SpikeDetector
+from .tempo_tracker import TempoTracker
 
 __all__ = [
     "AudioData",
+    "BeatIntervalTracker",
     "BreakDetector",
     "DetectionType",
     "DropDetector",
     "KickDetector",
+    "MultibandDetector",
+    "PercussionBand",
+    "QuantileWindow",
+    "RollingWindow",
     "SilentDetector",
     "SpikeDetector",
+    "TempoTracker",
 ]
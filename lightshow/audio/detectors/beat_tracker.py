@@ -0,0 +1,64 @@
+import time
+
+
+class BeatIntervalTracker:
+    """
+    Fixed-capacity ring of beat timestamps (ns), shared by the tempo, break
+    and drop logic so beat timing is recorded once per beat.
+
+    The mean interval over the last k beats telescopes to
+    (t[-1] - t[-k]) / (k - 1), so every window query is O(1) whatever the
+    window length.
+    """
+
+    def __init__(self, capacity: int = 30):
+        if capacity < 2:
+            raise ValueError("Capacity must hold at least two beats.")
+        self.capacity = capacity
+        self._stamps = [0] * capacity
+        self._head = 0  # Next write position
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def on_beat(self, timestamp: int | None = None) -> None:
+        self._stamps[self._head] = (
+            time.monotonic_ns() if timestamp is None else timestamp
+        )
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def stamp(self, index: int) -> int:
+        """Timestamp by deque-style index: 0 is the oldest, -1 the latest."""
+        if not -self._count <= index < self._count:
+            raise IndexError("beat index out of range")
+        if index >= 0:
+            index -= self._count
+        return self._stamps[(self._head + index) % self.capacity]
+
+    def last(self) -> int | None:
+        return self.stamp(-1) if self._count else None
+
+    def mean_interval(self, beats: int | None = None) -> float:
+        """Mean time between the last `beats` beats (all stored beats by default), in ns."""
+        count = self._count if beats is None else min(beats, self._count)
+        if count < 2:
+            return 0.0
+        return (self.stamp(-1) - self.stamp(-count)) / (count - 1)
+
+    def bpm(self, beats: int | None = None) -> float:
+        interval = self.mean_interval(beats)
+        return 60e9 / interval if interval > 0 else 0.0
+
+    def shift(self, offset: int) -> None:
+        """Move every stored beat by offset ns, e.g. to skip over a pause."""
+        for i in range(self._count):
+            position = (self._head - 1 - i) % self.capacity
+            self._stamps[position] += offset
+
+    def drop_oldest(self, count: int) -> None:
+        self._count = max(0, self._count - count)
+
+    def clear(self) -> None:
+        self._count = 0
@@ -1,43 +1,47 @@
 import time
 
-import numpy as np
-
 from lightshow.audio.audio_types import AudioData
+from lightshow.utils.tracing import tracer
 
+from .beat_tracker import BeatIntervalTracker
 from .spike_detector import SpikeDetector
 
 
 class BreakDetector(SpikeDetector):
-    def __init__(self, window_size=15):
-        self.beats = []
+    def __init__(self, window_size=15, tracker: BeatIntervalTracker | None = None):
+        # A shared tracker is fed by its owner, on_beat() is only needed otherwise
+        self.tracker = (
+            tracker if tracker is not None else BeatIntervalTracker(window_size)
+        )
         self.window_size = window_size
-
-    def detect(self, data: AudioData, append_current_energy=True):
-        if len(self.beats) < self.window_size - 5:
+        # Time source in ns when detect() gets no capture time, on the same
+        # monotonic clock as the capture stamps. Offline replays swap it for
+        # the audio position
+        self.clock = time.monotonic_ns
+
+    @tracer.traced("BreakDetector.detect")
+    def detect(
+        self, data: AudioData, append_current_energy=True, now_ns: int | None = None
+    ):
+        if len(self.tracker) < self.window_size - 5:
             return False
-        time_since_last_beat = time.time_ns() - self.beats[-1]
-
-        return (
-            time_since_last_beat
-            > np.average(
-                [self.beats[i] - self.beats[i - 1] for i in range(1, len(self.beats))]
-            )
-            * 2.5
-        )
+        if now_ns is None:
+            now_ns = self.clock()
+        time_since_last_beat = now_ns - self.tracker.stamp(-1)
+
+        return time_since_last_beat > self.tracker.mean_interval(self.window_size) * 2.5
 
     def clear(self):
-        self.beats = []
+        self.tracker.clear()
 
     def clear_old_beats(self):
         # After a break clear old breaks to re-adapt
-        if len(self.beats) > 10:
-            self.beats = self.beats[5:]
+        if len(self.tracker) > 10:
+            self.tracker.drop_oldest(5)
 
     def clean_beats(self, offset=0):
         # Destined to be call after a break to compensate for the time the break took
-        self.beats = [beat + offset for beat in self.beats]
+        self.tracker.shift(offset)
 
     def on_beat(self):
-        self.beats.append(time.time_ns())
-        if len(self.beats) > self.window_size:
-            self.beats.pop(0)
+        self.tracker.on_beat()
@@ -1,36 +1,37 @@
-import time
-
-import numpy as np
+from lightshow.utils.tracing import tracer
 
+from .beat_tracker import BeatIntervalTracker
 from .spike_detector import SpikeDetector
 
 
 # Similar to BreakDetector but instead of detecting if not enough beats are detected it detects if too many beats are detected in a short time span, indicating a drop in the music.
-# It does that by comparing the average time between the last window_size beats and all of the previous beats.
+# It does that by comparing the average time between the last comparing_window_size beats and the last window_size beats.
 class DropDetector(SpikeDetector):
-    def __init__(self, window_size=25, comparing_window_size=10):
-        self.beats = []
+    def __init__(
+        self,
+        window_size=25,
+        comparing_window_size=10,
+        tracker: BeatIntervalTracker | None = None,
+    ):
+        # A shared tracker is fed by its owner, on_beat() is only needed otherwise
+        self.tracker = (
+            tracker if tracker is not None else BeatIntervalTracker(window_size)
+        )
         self.window_size = window_size
         self.comparing_window_size = comparing_window_size
 
+    @tracer.traced("DropDetector.detect")
     def detect(self, data, append_current_energy=True):
-        if len(self.beats) < self.comparing_window_size:
+        if len(self.tracker) <= self.comparing_window_size:
             return False
 
         return (
-            self.average_time_between_beats(self.beats)
-            < self.average_time_between_beats(self.beats[-self.window_size :]) * 0.85
+            self.tracker.mean_interval(self.comparing_window_size)
+            < self.tracker.mean_interval(self.window_size) * 0.85
         )
 
-    def average_time_between_beats(self, beats):
-        if len(beats) < 2:
-            return 0
-        return np.average([beats[i] - beats[i - 1] for i in range(1, len(beats))])
-
     def clear(self):
-        self.beats = []
+        self.tracker.clear()
 
     def on_beat(self):
-        self.beats.append(time.time_ns())
-        if len(self.beats) > self.window_size:
-            self.beats.pop(0)
+        self.tracker.on_beat()
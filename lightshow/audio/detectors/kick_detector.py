@@ -1,6 +1,8 @@
+from lightshow.audio.audio_types import AAudioCapture
 from lightshow.audio.data import AudioData
 from lightshow.audio.detectors.methods.detection_method import DetectionMethod
 from lightshow.utils.logger import Logger
+from lightshow.utils.tracing import tracer
 
 from .spike_detector import DetectionType, SpikeDetector
 
@@ -19,8 +21,27 @@ class KickDetector(SpikeDetector):
             250 / 1000,
         )
         self.was_above = False
+        self.device: AAudioCapture | None = None
         self.detector = detection_method()
 
+    def on_device_change(self, device: AAudioCapture):
+        super().on_device_change(device)
+        self.device = device
+        # Hop and FFT size may have changed, rescale the method's frame windows
+        self.detector.configure(device.sample_rate, device.chunk_size, device.fft_size)
+
+    def set_detection_method(self, detection_method: type[DetectionMethod]):
+        """Swap the method, configured for the current stream before use."""
+        if type(self.detector) is detection_method:
+            return
+        detector = detection_method()
+        if self.device is not None:
+            detector.configure(
+                self.device.sample_rate, self.device.chunk_size, self.device.fft_size
+            )
+        self.detector = detector
+        logger.info(f"Beat detection method: {detector.name()}")
+
     def reset_state(self):
         """Reset detector state without clearing energy history."""
         self.detector.cooldown_counter = 0
@@ -29,5 +50,6 @@ class KickDetector(SpikeDetector):
     def clear(self):
         self.detector.clean()
 
+    @tracer.traced("KickDetector.detect")
     def detect(self, data: AudioData, append_current_energy=True):
         return self.detector.detect(data, append_current_energy)
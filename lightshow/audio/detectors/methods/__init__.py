@@ -0,0 +1,19 @@
+from .average_difference import AverageDifference
+from .detection_method import DetectionMethod
+from .percentil import Percentile
+from .spectral_flux import SpectralFlux
+
+# BEAT_ALGORITHM option -> method
+DETECTION_METHODS: dict[str, type[DetectionMethod]] = {
+    "Average Diff": AverageDifference,
+    "Percentile": Percentile,
+    "Spectral Flux": SpectralFlux,
+}
+
+__all__ = [
+    "DETECTION_METHODS",
+    "AverageDifference",
+    "DetectionMethod",
+    "Percentile",
+    "SpectralFlux",
+]
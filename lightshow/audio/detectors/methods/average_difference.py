@@ -16,10 +16,11 @@ class AverageDifference(DetectionMethod):
         current_energy = self.register_energy(audio_data, append_current_energy)
 
         current_diff = 0
-        if len(self.energy_history) > 4:
+        lookback = self.diff_lookback
+        if len(self.energy_history) > lookback:
             current_diff = (
-                current_energy - self.energy_history[-4]
-                if current_energy > self.energy_history[-4]
+                current_energy - self.energy_history[-lookback]
+                if current_energy > self.energy_history[-lookback]
                 else 0
             )
 
@@ -27,11 +28,10 @@ class AverageDifference(DetectionMethod):
             self.cooldown_counter -= 1
             return False
 
-        if len(self.energy_history) < 7:
+        if len(self.energy_history) < self.min_history:
             self.was_above = False
             return False
-        avg_energy = sum(self.energy_history) / len(self.energy_history)
-        limit = self.sensitivity * avg_energy
+        limit = self.limit = self.sensitivity * self.energy_history.mean()
 
         is_above = current_diff > limit
         # Only trigger on rising edge
@@ -49,5 +49,4 @@ class AverageDifference(DetectionMethod):
         """Returns sensitivity * average energy."""
         if len(self.energy_history) < 1:
             return 0
-        avg_energy = sum(self.energy_history) / len(self.energy_history)
-        return self.sensitivity * avg_energy
+        return self.sensitivity * self.energy_history.mean()
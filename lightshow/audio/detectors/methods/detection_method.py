@@ -1,10 +1,20 @@
 from abc import ABC, abstractmethod
-from collections import deque
 
 from lightshow.audio.data import AudioData
+from lightshow.audio.detectors.rolling_window import RollingWindow
+
+# Frame counts and bin ranges below are expressed for the reference stream:
+# non-overlapping 1024-sample frames at 44.1 kHz.
+REFERENCE_FFT_SIZE = 1024
+REFERENCE_CHUNKS_PER_SECOND = 44100 / 1024
 
 
 class DetectionMethod(ABC):
+    # Frames back used for the energy difference, and frames of history
+    # needed before detecting (both at the reference frame rate).
+    DIFF_LOOKBACK = 4
+    MIN_HISTORY = 7
+
     def __init__(
         self,
         sensitivity: float = 1.0,
@@ -17,29 +27,75 @@ class DetectionMethod(ABC):
         if bin_range is None:
             bin_range = [0, 2]
 
-        self.sample_rate = sample_rate
-        self.chunk_size = chunk_size
-        self.chunks_per_second = sample_rate / chunk_size
-
         self.window_size = window_size
-        self.energy_history = deque(maxlen=int(window_size * self.chunks_per_second))
+        self.cooldown_time = cooldown_time
 
         self.sensitivity = sensitivity
-        self.bin_range = bin_range
+        self.p_bin_range = bin_range  # At REFERENCE_FFT_SIZE
 
-        self.cooldown_frame_duration = int(cooldown_time * self.chunks_per_second)
         self.cooldown_counter = 0
         self.was_above = False
 
+        self.configure(sample_rate, chunk_size)
+
+    def configure(self, sample_rate: int, chunk_size: int, fft_size: int | None = None):
+        """
+        Adapt frame-based windows to the stream: chunk_size is the hop between
+        two frames and fft_size the analysis window the bins come from.
+        Clears the energy history.
+        """
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.fft_size = fft_size or chunk_size
+        self.chunks_per_second = sample_rate / chunk_size
+        # Per-frame smoothing factors are raised to this power to keep their time constant
+        self.frame_ratio = REFERENCE_CHUNKS_PER_SECOND / self.chunks_per_second
+
+        self.energy_history = self.make_history(
+            max(1, int(self.window_size * self.chunks_per_second))
+        )
+        self.bin_range = self.scale_bins(self.p_bin_range)
+
+        self.cooldown_frame_duration = int(self.cooldown_time * self.chunks_per_second)
+        self.cooldown_counter = 0
+        # Threshold of the last detect(), published for the visualizer
+        self.limit = 0.0
+        self.diff_lookback = self.frames_for(self.DIFF_LOOKBACK)
+        self.min_history = self.frames_for(self.MIN_HISTORY)
+        AudioData.register_band(self.bin_range)
+        self.on_configure()
+
+    def make_history(self, maxlen: int) -> RollingWindow:
+        """Energy history store, a running-statistics window by default."""
+        return RollingWindow(maxlen)
+
+    def on_configure(self) -> None:
+        """
+        Optional hook, not abstract: called at the end of configure() so
+        subclasses can rescale their own frame counts / bin ranges. Does
+        nothing by default.
+        """
+        return
+
+    def frames_for(self, reference_frames: int) -> int:
+        """Convert a frame count tuned at the reference frame rate."""
+        return max(1, round(reference_frames / self.frame_ratio))
+
+    def scale_bins(self, reference_range) -> list[int]:
+        """Convert a bin range tuned at REFERENCE_FFT_SIZE to the current FFT size."""
+        scale = self.fft_size / REFERENCE_FFT_SIZE
+        return [int(b * scale) for b in reference_range]
+
     @classmethod
     def name(cls) -> str:
         return "Abstract Detection Method"
 
     @abstractmethod
     def get_limit(self) -> float:
-        """Return the current detection limit/threshold for visualization.
+        """Compute the detection limit/threshold of the current frame.
 
-        Should be called after detect() to get the threshold used in detection.
+        Called by detect(), which stores the result in self.limit. It may
+        update the method's state: other threads read self.limit instead.
         """
         raise NotImplementedError("Subclasses must implement get_limit method.")
 
@@ -1,15 +1,25 @@
 from collections import deque
 
-import numpy as np
-
 from lightshow.audio.data import AudioData
-from lightshow.audio.detectors.methods.detection_method import DetectionMethod
+from lightshow.audio.detectors.methods.detection_method import (
+    REFERENCE_CHUNKS_PER_SECOND,
+    DetectionMethod,
+)
+from lightshow.audio.detectors.rolling_window import QuantileWindow
 from lightshow.utils import Logger
 
 logger = Logger.for_class("PercentileDetection")
 
 
 class Percentile(DetectionMethod):
+    # Bins compared against the kick band to reject sustained sub-bass
+    TRANSIENT_RANGE = (2, 5)
+    # Seconds of history the smoothed baseline is seeded from. It must span
+    # a few beats: a shorter seed sits inside the first kick and the slow
+    # baseline decay takes tens of seconds to bring the limit back down
+    BASELINE_SEED_TIME = 1.0
+    PEAK_PERCENTILE = 95
+
     def __init__(self):
         super().__init__(
             sensitivity=1.75,
@@ -21,15 +31,30 @@ class Percentile(DetectionMethod):
         )
         self.percentile = 15
         self.transient_threshold = 0.3
+        self.peak_floor = 0.05
 
         self.smoothed_baseline = None
         self.baseline_attack = 0.995
         self.baseline_decay = 0.999
 
-        self.temp_energy_history = deque(maxlen=10)
-
         self.append_energy = False
 
+    def make_history(self, maxlen: int) -> QuantileWindow:
+        return QuantileWindow(maxlen)
+
+    def on_configure(self):
+        self.transient_range = self.scale_bins(self.TRANSIENT_RANGE)
+        AudioData.register_band(self.transient_range)
+        self.temp_energy_history = deque(maxlen=self.frames_for(10))
+        self.seed_history = self.frames_for(
+            round(self.BASELINE_SEED_TIME * REFERENCE_CHUNKS_PER_SECOND)
+        )
+        self.smoothed_baseline = None
+
+    def clean(self):
+        super().clean()
+        self.smoothed_baseline = None
+
     @classmethod
     def name(cls):
         return "Percentile"
@@ -41,8 +66,8 @@ class Percentile(DetectionMethod):
                 self.temp_energy_history.clear()
             self.temp_energy_history.append(current_energy)
 
-        sub_energy = audio_data.get_ps_mean([0, 2])
-        transient_energy = audio_data.get_ps_mean([2, 5])
+        sub_energy = audio_data.get_ps_mean(self.bin_range)
+        transient_energy = audio_data.get_ps_mean(self.transient_range)
         transient_ratio = transient_energy / (sub_energy + 1e-9)
 
         if self.cooldown_counter > 0:
@@ -50,25 +75,26 @@ class Percentile(DetectionMethod):
             self.was_above = False
             return False
 
-        if len(self.energy_history) < 7:
+        if len(self.energy_history) < self.min_history:
             self.was_above = False
             return False
 
         current_diff = current_energy
+        lookback = self.diff_lookback
         if (
-            len(self.energy_history) > 4
+            len(self.energy_history) > lookback
             if append_current_energy
-            else len(self.temp_energy_history) > 4
+            else len(self.temp_energy_history) > lookback
         ):
             prev = (
-                self.energy_history[-4]
+                self.energy_history[-lookback]
                 if append_current_energy
-                else self.temp_energy_history[-4]
+                else self.temp_energy_history[-lookback]
             )
             current_diff = max(0.0, current_energy - prev)
 
         self._update_baseline = append_current_energy
-        limit = self.get_limit()
+        limit = self.limit = self.get_limit()
 
         is_above = current_diff > limit and transient_ratio > self.transient_threshold
         detected = is_above and not self.was_above
@@ -88,22 +114,26 @@ class Percentile(DetectionMethod):
         return detected
 
     def get_limit(self) -> float:
-        if len(self.energy_history) < 7:
+        if len(self.energy_history) < self.min_history:
             return 0
-        raw_baseline = np.percentile(self.energy_history, self.percentile)
+        raw_baseline = self.energy_history.percentile(self.percentile)
+        # Kicks must stand out of the loud part of the window too, not only
+        # of the floor: near-silent gaps otherwise let noise jitter through
+        floor = self.peak_floor * self.energy_history.percentile(self.PEAK_PERCENTILE)
 
         if self.smoothed_baseline is None:
+            if len(self.energy_history) < self.seed_history:
+                # Not enough history to seed the smoothing yet
+                return max(self.sensitivity * raw_baseline, floor)
             self.smoothed_baseline = raw_baseline
-            return self.sensitivity * self.smoothed_baseline
-
-        if getattr(self, "_update_baseline", True):
+        elif getattr(self, "_update_baseline", True):
             alpha = (
                 self.baseline_attack
                 if raw_baseline > self.smoothed_baseline
                 else self.baseline_decay
-            )
+            ) ** self.frame_ratio
             self.smoothed_baseline = (
                 alpha * self.smoothed_baseline + (1 - alpha) * raw_baseline
             )
 
-        return self.sensitivity * self.smoothed_baseline
+        return max(self.sensitivity * self.smoothed_baseline, floor)
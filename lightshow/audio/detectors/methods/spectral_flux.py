@@ -0,0 +1,93 @@
+import numpy as np
+
+from lightshow.audio.data import AudioData
+from lightshow.audio.detectors.methods.detection_method import DetectionMethod
+from lightshow.audio.detectors.rolling_window import QuantileWindow
+
+
+class SpectralFlux(DetectionMethod):
+    """
+    Onsets from the spectral flux of the low bands: the log-compressed,
+    half-wave rectified rise of every band over the previous frame, averaged
+    over the bands and compared against a sliding median of its own recent
+    values.
+
+    Sustained bass raises the energy but not the flux. The previous frame
+    is max-filtered across neighbouring bands first, so a pitch glide (sub
+    drops, bass slides) moving energy to the next band doesn't count as an
+    onset either.
+    """
+
+    # Mel bands (about 0-700 Hz with 40 bands), or linear bins at
+    # REFERENCE_FFT_SIZE when the processor has no mel stage
+    MEL_RANGE = (0, 8)
+    LINEAR_RANGE = (0, 16)
+
+    def __init__(self):
+        super().__init__(
+            sensitivity=2.0,
+            sample_rate=44100,
+            chunk_size=1024,
+            window_size=1.0,
+            bin_range=list(self.LINEAR_RANGE),
+            cooldown_time=0.2,
+        )
+        # Minimum mean log rise per band, keeps noise out when the median is ~0
+        self.delta = 0.5
+
+    def make_history(self, maxlen: int) -> QuantileWindow:
+        return QuantileWindow(maxlen)
+
+    def on_configure(self):
+        self._previous: np.ndarray | None = None
+        self.flux = 0.0
+
+    @classmethod
+    def name(cls):
+        return "Spectral Flux"
+
+    def clean(self):
+        super().clean()
+        self._previous = None
+
+    def _bands(self, audio_data: AudioData) -> np.ndarray:
+        if audio_data.mel is not None:
+            return audio_data.mel[self.MEL_RANGE[0] : self.MEL_RANGE[1]]
+        return audio_data.frequencies[self.bin_range[0] : self.bin_range[1]]
+
+    def detect(self, audio_data: AudioData, append_current_energy=True) -> bool:
+        current = np.log1p(self._bands(audio_data))
+        previous = self._previous
+        self._previous = current
+        if previous is None or previous.shape != current.shape:
+            return False
+
+        # Max filter over each band and its two neighbours
+        reference = previous.copy()
+        np.maximum(reference[1:], previous[:-1], out=reference[1:])
+        np.maximum(reference[:-1], previous[1:], out=reference[:-1])
+        self.flux = float(np.maximum(current - reference, 0.0).mean())
+        if append_current_energy:
+            self.energy_history.append(self.flux)
+
+        if self.cooldown_counter > 0:
+            self.cooldown_counter -= 1
+            self.was_above = False
+            return False
+
+        if len(self.energy_history) < self.min_history:
+            self.was_above = False
+            return False
+
+        is_above = self.flux > self.get_limit()
+        detected = is_above and not self.was_above
+        if detected:
+            self.cooldown_counter = self.cooldown_frame_duration
+        self.was_above = is_above
+        return detected
+
+    def get_limit(self) -> float:
+        if len(self.energy_history) < self.min_history:
+            return 0
+        self.limit = self.sensitivity * self.energy_history.percentile(50) + self.delta
+        return self.limit
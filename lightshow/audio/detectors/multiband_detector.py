@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from lightshow.audio.audio_types import AAudioCapture, AAudioStreamHandler
+from lightshow.audio.data import AudioData
+from lightshow.audio.detectors.methods.detection_method import (
+    REFERENCE_CHUNKS_PER_SECOND,
+    REFERENCE_FFT_SIZE,
+)
+from lightshow.audio.processors import SpectrumProcessor
+from lightshow.utils.tracing import tracer
+
+
+@dataclass(frozen=True)
+class PercussionBand:
+    """
+    One percussion class of the MultibandDetector.
+
+    :param freq_range: [low, high) Hz range the onsets are measured on
+    :param sensitivity: Standard deviations the flux must exceed its mean by
+    :param cooldown: Seconds after an onset during which the band can't fire
+    :param min_flux: Absolute log-energy rise required, rejects noise jitter.
+        Tuned at the reference stream, rescaled to the FFT size
+    :param masked_by: Bands whose onset in the same frame cancels this one,
+        e.g. the broadband noise of a snare spilling into the hi-hat band
+    """
+
+    name: str
+    freq_range: tuple[float, float]
+    sensitivity: float = 2.5
+    cooldown: float = 0.1
+    min_flux: float = 1.0
+    masked_by: tuple[str, ...] = ()
+
+
+DEFAULT_BANDS = (
+    PercussionBand("kick", (30.0, 150.0), sensitivity=2.0, cooldown=0.2),
+    PercussionBand("snare", (1500.0, 5000.0), sensitivity=2.0, cooldown=0.15),
+    PercussionBand(
+        "hihat",
+        (9000.0, 16000.0),
+        sensitivity=1.0,
+        cooldown=0.08,
+        masked_by=("snare",),
+    ),
+)
+
+
+class MultibandDetector:
+    """
+    Detects onsets of several percussion classes (kick, snare, hi-hat by
+    default) in one vectorized pass per frame.
+
+    Every class is a row of the state arrays: the band energies of a frame
+    come from a single AudioData band lookup, the onset function is the
+    positive log-energy rise over one reference frame (1024 samples at
+    44.1 kHz, several frames back with overlapping hops), and each row's
+    threshold is mean + sensitivity * std of its own recent onset values,
+    kept as running sums. Cross-band masking is a boolean matrix product.
+    Adding a class adds a row, not a detector.
+    """
+
+    def __init__(
+        self,
+        AudioHandler: AAudioStreamHandler,
+        bands: tuple[PercussionBand, ...] = DEFAULT_BANDS,
+        window_size: float = 2.0,  # Seconds of onset history for the thresholds
+    ):
+        if not bands:
+            raise ValueError("At least one percussion band is required.")
+        AudioHandler.add_device_change_listener(self.on_device_change)
+        self.bands = bands
+        self.names = tuple(band.name for band in bands)
+        self.window_time = window_size
+
+        self.sensitivity = np.array([b.sensitivity for b in bands])
+        self.min_flux = np.array([b.min_flux for b in bands])
+        self.cooldown_time = np.array([b.cooldown for b in bands])
+        # masks[i, j]: an onset of band j cancels band i
+        self.masks = np.array(
+            [[other.name in band.masked_by for other in bands] for band in bands]
+        )
+
+        self.configure(44100, 1024, 1024)
+
+    def on_device_change(self, device: AAudioCapture):
+        self.configure(device.sample_rate, device.chunk_size, device.fft_size)
+
+    def configure(self, sample_rate: int, chunk_size: int, fft_size: int):
+        """Rescale bins and frame counts to the stream, clears the history."""
+        chunks_per_second = sample_rate / chunk_size
+        # The rise is measured over a fixed time: with overlapping hops an
+        # onset spreads over several frames, each one only sees part of it
+        self.lookback = max(1, round(chunks_per_second / REFERENCE_CHUNKS_PER_SECOND))
+        # A transient shorter than the window is averaged over all of it, a
+        # longer window dilutes its rise
+        self.flux_floor = self.min_flux * min(1.0, REFERENCE_FFT_SIZE / fft_size)
+        self.window_size = max(2, int(self.window_time * chunks_per_second))
+        self.cooldown_frames = np.maximum(
+            1, (self.cooldown_time * chunks_per_second).astype(np.int64)
+        )
+        self.bin_ranges = []
+        for band in self.bands:
+            low, high = (
+                SpectrumProcessor.hz_to_bin(hz, sample_rate, fft_size)
+                for hz in band.freq_range
+            )
+            self.bin_ranges.append((low, max(high, low + 1)))
+        self.slots = np.array(
+            [AudioData.register_band(r) for r in self.bin_ranges], dtype=np.intp
+        )
+        self.clear()
+
+    def clear(self):
+        rows = len(self.bands)
+        self._history = np.zeros((rows, self.window_size))
+        self._head = 0
+        self._count = 0
+        self._sum = np.zeros(rows)
+        self._sum_sq = np.zeros(rows)
+        # Band energies of the last lookback frames, oldest at _energy_head
+        self._energies = np.zeros((rows, self.lookback))
+        self._energy_head = 0
+        self._energy_count = 0
+        self._cooldown = np.zeros(rows, dtype=np.int64)
+        self._was_above = np.zeros(rows, dtype=bool)
+        self.flux = np.zeros(rows)
+        self.limits = np.zeros(rows)
+
+    def index(self, name: str) -> int:
+        return self.names.index(name)
+
+    @tracer.traced("MultibandDetector.detect")
+    def detect(self, data: AudioData, append_current_energy=True) -> np.ndarray:
+        """Onsets of this frame, one bool per band (in self.names order)."""
+        energy = np.log1p(data.get_band_means(self.slots))
+        previous = self._energies[:, self._energy_head].copy()
+        self._energies[:, self._energy_head] = energy
+        self._energy_head = (self._energy_head + 1) % self.lookback
+        if self._energy_count < self.lookback:
+            self._energy_count += 1
+            return np.zeros(len(self.bands), dtype=bool)
+        flux = np.maximum(energy - previous, 0.0)
+        np.nan_to_num(flux, copy=False)
+        self.flux = flux
+
+        count = self._count
+        if count:
+            mean = self._sum / count
+            std = np.sqrt(np.maximum(self._sum_sq / count - mean * mean, 0.0))
+            self.limits = np.maximum(mean + self.sensitivity * std, self.flux_floor)
+        above = (flux > self.limits) & (count >= self.window_size // 2)
+
+        onsets = above & ~self._was_above & (self._cooldown == 0)
+        onsets &= ~(self.masks & onsets).any(axis=1)
+        np.maximum(self._cooldown - 1, 0, out=self._cooldown)
+        self._cooldown[onsets] = self.cooldown_frames[onsets]
+        self._was_above = above
+
+        if append_current_energy:
+            self._append(flux)
+        return onsets
+
+    def _append(self, flux: np.ndarray) -> None:
+        column = self._history[:, self._head]
+        if self._count == self.window_size:
+            self._sum -= column
+            self._sum_sq -= column * column
+        else:
+            self._count += 1
+        column[:] = flux
+        self._sum += flux
+        self._sum_sq += flux * flux
+        self._head = (self._head + 1) % self.window_size
+        if self._head == 0:
+            # Exact recompute once per window, no drift over long sessions
+            self._sum = self._history.sum(axis=1)
+            self._sum_sq = np.square(self._history).sum(axis=1)
@@ -0,0 +1,108 @@
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Iterator
+
+
+class RollingWindow:
+    """
+    Fixed-length window of floats with O(1) running mean and variance.
+
+    Behaves like deque(maxlen=...) for append / clear / len / indexing /
+    iteration, and keeps a running sum and sum of squares updated on every
+    append and eviction. Both sums are recomputed exactly once per maxlen
+    appends so floating point drift cannot build up over a long session.
+    """
+
+    def __init__(self, maxlen: int):
+        if maxlen <= 0:
+            raise ValueError("Window length must be a positive non-nul int.")
+        self.maxlen = maxlen
+        self._values: deque[float] = deque(maxlen=maxlen)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._appends = 0
+
+    def append(self, value: float) -> None:
+        value = float(value)
+        values = self._values
+        if len(values) == self.maxlen:
+            oldest = values[0]
+            self._sum -= oldest
+            self._sum_sq -= oldest * oldest
+        values.append(value)
+        self._sum += value
+        self._sum_sq += value * value
+
+        self._appends += 1
+        if self._appends >= self.maxlen:
+            self._appends = 0
+            self._sum = sum(values)
+            self._sum_sq = sum(v * v for v in values)
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._appends = 0
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def mean(self) -> float:
+        return self._sum / len(self._values) if self._values else 0.0
+
+    def variance(self) -> float:
+        """Population variance of the window."""
+        n = len(self._values)
+        if n == 0:
+            return 0.0
+        mean = self._sum / n
+        return max(0.0, self._sum_sq / n - mean * mean)
+
+    def std(self) -> float:
+        return self.variance() ** 0.5
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: int) -> float:
+        return self._values[index]
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self._values)
+
+
+class QuantileWindow(RollingWindow):
+    """
+    RollingWindow that also keeps its values sorted (bisect insert / delete),
+    so any percentile of the window is a lookup instead of a sort.
+    """
+
+    def __init__(self, maxlen: int):
+        super().__init__(maxlen)
+        self._sorted: list[float] = []
+
+    def append(self, value: float) -> None:
+        value = float(value)
+        if len(self._values) == self.maxlen:
+            oldest = self._values[0]
+            del self._sorted[bisect_left(self._sorted, oldest)]
+        insort(self._sorted, value)
+        super().append(value)
+
+    def clear(self) -> None:
+        super().clear()
+        self._sorted.clear()
+
+    def percentile(self, q: float) -> float:
+        """q-th percentile (0-100), linear interpolation like np.percentile."""
+        values = self._sorted
+        if not values:
+            return 0.0
+        position = q / 100 * (len(values) - 1)
+        lower = int(position)
+        if lower + 1 >= len(values):
+            return values[-1]
+        fraction = position - lower
+        return values[lower] + (values[lower + 1] - values[lower]) * fraction
@@ -2,6 +2,12 @@ from lightshow.audio.audio_types import AudioData
 
 
 class SilentDetector:
+    # ~0-1.8 kHz: first 14 of the processor's 40 mel bands, or the first 40
+    # linear bins of a 1024 FFT when the processor has no mel stage
+    MEL_RANGE = (0, 14)
+    LINEAR_RANGE = (0, 40)
+
     def detect(self, data: AudioData):
-        # Use mel energies for silence detection - more accurate across frequency spectrum
-        return data.get_mel_mean([0, 40]) < 2 * 1e5  # Mean of all mel bins
+        if data.mel is None:
+            return data.get_freq_mean(self.LINEAR_RANGE) < 2 * 1e5
+        return data.get_mel_mean(self.MEL_RANGE) < 2 * 1e5
@@ -1,8 +1,8 @@
-from collections import deque
 from enum import Enum
 
 from lightshow.audio.audio_streams import AAudioCapture, AAudioStreamHandler
 from lightshow.audio.audio_types import AudioData
+from lightshow.audio.detectors.rolling_window import RollingWindow
 from lightshow.audio.processors import SpectrumProcessor
 
 
@@ -40,8 +40,8 @@ class SpikeDetector:
         self.chunks_per_second = chunks_per_second
         self.sensitivity = sensitivity
         self.p_window_size = window_size
-        self.window_size = int(window_size * chunks_per_second)
-        self.energy_history = deque(maxlen=self.window_size)
+        self.window_size = max(1, int(window_size * chunks_per_second))
+        self.energy_history = RollingWindow(self.window_size)
         self.freq_range = freq_range
         self.bin_range = (
             SpectrumProcessor.hz_to_bin(self.freq_range[0], 44100, 1024),
@@ -58,8 +58,8 @@ class SpikeDetector:
 
     def on_device_change(self, device: AAudioCapture):
         self.chunks_per_second = int(device.sample_rate / device.chunk_size)
-        self.window_size = int(self.p_window_size * self.chunks_per_second)
-        self.energy_history = deque(maxlen=self.window_size)
+        self.window_size = max(1, int(self.p_window_size * self.chunks_per_second))
+        self.energy_history = RollingWindow(self.window_size)
         self.min_frame_duration = int(
             self.p_min_frame_duration * self.chunks_per_second
         )
@@ -69,10 +69,10 @@ class SpikeDetector:
         self.cooldown_counter = 0
         self.bin_range = (
             SpectrumProcessor.hz_to_bin(
-                self.freq_range[0], device.sample_rate, device.chunk_size
+                self.freq_range[0], device.sample_rate, device.fft_size
             ),
             SpectrumProcessor.hz_to_bin(
-                self.freq_range[1], device.sample_rate, device.chunk_size
+                self.freq_range[1], device.sample_rate, device.fft_size
             ),
         )
 
@@ -85,8 +85,7 @@ class SpikeDetector:
             self.energy_history.append(current_energy)
         if len(self.energy_history) < 1:
             return False
-        avg_energy = sum(self.energy_history) / len(self.energy_history)
-        limit = self.sensitivity * avg_energy
+        limit = self.sensitivity * self.energy_history.mean()
         result = (
             current_energy > limit
             if (self.detection_type == DetectionType.UPPER)
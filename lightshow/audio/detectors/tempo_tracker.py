@@ -0,0 +1,269 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+import numpy as np
+
+from lightshow.audio.data import AudioData
+from lightshow.utils.logger import Logger
+from lightshow.utils.tracing import tracer
+
+logger = Logger.for_class("TempoTracker")
+
+
+class TempoTracker:
+    """
+    Locks onto the beat grid and predicts upcoming beats.
+
+    Every frame adds one value to an onset envelope (positive log-energy flux
+    over the mel bands, or the lowest linear bins without a mel stage). Every
+    analysis_interval seconds the envelope is autocorrelated to pick the beat
+    period (60-200 BPM, weighted towards 120) and comb-filtered at that period
+    to find the phase. The grid is considered locked once the period is stable
+    and the reactive kick detections keep landing on it.
+
+    While locked, start() runs a scheduler thread calling on_beat(beat_ns)
+    lead_ms before each predicted beat, beat_ns being on the
+    time.monotonic_ns() clock used to timestamp the frames.
+    """
+
+    MIN_BPM = 60.0
+    MAX_BPM = 200.0
+    PRIOR_BPM = 120.0
+    # Minimum autocorrelation peak (relative to lag 0) and stable analyses to lock
+    MIN_CONFIDENCE = 0.2
+    MIN_STABLE = 2
+    # Reactive beats further than this from the grid count as misses
+    MATCH_TOLERANCE_NS = 70_000_000
+
+    def __init__(
+        self,
+        history_seconds: float = 6.0,
+        analysis_interval: float = 0.5,
+        lead_ms: float = 40.0,
+    ):
+        self.history_seconds = history_seconds
+        self.analysis_interval = analysis_interval
+        self.lead_ms = lead_ms
+
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stop = False
+        self._on_beat: Callable[[int], None] | None = None
+
+        self.configure(44100, 1024)
+
+    # ------------------------------------------------------------------
+    # Configuration / state
+    # ------------------------------------------------------------------
+
+    def configure(self, sample_rate: int, chunk_size: int) -> None:
+        self.frame_rate = sample_rate / chunk_size
+        self._envelope = np.zeros(
+            max(16, int(self.history_seconds * self.frame_rate)), dtype=np.float64
+        )
+        self._analysis_frames = max(1, round(self.analysis_interval * self.frame_rate))
+        self.reset()
+
+    def reset(self) -> None:
+        with self._cond:
+            self._envelope[:] = 0.0
+            self._write = 0
+            self._frames = 0
+            self._previous: np.ndarray | None = None
+            self._last_frame_ns = 0
+
+            self.period_ns = 0.0
+            self.confidence = 0.0
+            self._anchor_ns = 0
+            self._stable = 0
+            self._matches: deque[bool] = deque(maxlen=4)
+            self._reactive: deque[int] = deque(maxlen=9)
+            self._last_reactive_ns = 0
+            self._last_emitted_ns = 0
+            self._cond.notify_all()
+
+    @property
+    def bpm(self) -> float:
+        return 60e9 / self.period_ns if self.period_ns else 0.0
+
+    @property
+    def locked(self) -> bool:
+        if self.period_ns == 0 or self._stable < self.MIN_STABLE:
+            return False
+        if self.confidence < self.MIN_CONFIDENCE:
+            return False
+        # Kicks must keep confirming the grid, a break drops the lock
+        if self._last_frame_ns - self._last_reactive_ns > 2.5 * self.period_ns:
+            return False
+        return len(self._matches) >= 3 and sum(self._matches) >= len(self._matches) - 1
+
+    # ------------------------------------------------------------------
+    # Per-frame input
+    # ------------------------------------------------------------------
+
+    @tracer.traced("TempoTracker.update")
+    def update(self, data: AudioData, now_ns: int | None = None) -> None:
+        """Add one frame to the onset envelope, re-analysing when due."""
+        bands = data.mel if data.mel is not None else data.frequencies[:8]
+        current = np.log1p(bands)
+        previous = self._previous
+        flux = 0.0
+        if previous is not None and previous.shape == current.shape:
+            flux = float(np.maximum(current - previous, 0.0).sum())
+        self._previous = current
+
+        self._envelope[self._write] = flux
+        self._write = (self._write + 1) % self._envelope.size
+        self._frames += 1
+        self._last_frame_ns = time.monotonic_ns() if now_ns is None else now_ns
+
+        if (
+            self._frames >= self._envelope.size // 2
+            and self._frames % self._analysis_frames == 0
+        ):
+            self._analyze()
+
+    def on_beat(self, now_ns: int | None = None) -> None:
+        """A reactive (detected) beat, used to confirm the predicted grid."""
+        now_ns = time.monotonic_ns() if now_ns is None else now_ns
+        if self.period_ns:
+            error = (now_ns - self._anchor_ns) % self.period_ns
+            error = min(error, self.period_ns - error)
+            self._matches.append(error <= self.MATCH_TOLERANCE_NS)
+        self._reactive.append(now_ns)
+        self._last_reactive_ns = now_ns
+
+    # ------------------------------------------------------------------
+    # Analysis
+    # ------------------------------------------------------------------
+
+    def _analyze(self) -> None:
+        # Oldest to newest, zero mean
+        env = np.roll(self._envelope, -self._write)
+        if self._frames < env.size:
+            env = env[env.size - self._frames :]
+        env = env - env.mean()
+        n = env.size
+
+        spectrum = np.fft.rfft(env, 2 * n)
+        acf = np.fft.irfft(spectrum.real**2 + spectrum.imag**2)[:n]
+        if acf[0] <= 0:
+            return
+
+        min_lag = max(1, int(self.frame_rate * 60.0 / self.MAX_BPM))
+        max_lag = min(n // 2, int(np.ceil(self.frame_rate * 60.0 / self.MIN_BPM)))
+        if max_lag <= min_lag + 1:
+            return
+        lags = np.arange(min_lag, max_lag + 1)
+        bpms = 60.0 * self.frame_rate / lags
+        prior = np.exp(-0.5 * np.log2(bpms / self.PRIOR_BPM) ** 2)
+        best = int(np.argmax(acf[lags] * prior))
+        lag = float(lags[best])
+
+        # Parabolic interpolation around the peak for sub-frame periods
+        i = int(lags[best])
+        if 0 < i < n - 1:
+            a, b, c = acf[i - 1], acf[i], acf[i + 1]
+            denominator = a - 2 * b + c
+            if denominator < 0:
+                lag += 0.5 * (a - c) / denominator
+
+        # Autocorrelation can't tell a tempo from its half / double, follow
+        # the interval of the detected kicks the heads react to
+        if len(self._reactive) >= 5:
+            stamps = np.fromiter(self._reactive, dtype=np.float64)
+            kick_lag = np.median(np.diff(stamps)) / 1e9 * self.frame_rate
+            candidates = [c for c in (lag / 2, lag, lag * 2) if min_lag <= c <= max_lag]
+            lag = min(candidates, key=lambda c: abs(np.log(c / kick_lag)))
+
+        # Comb filter: phase whose teeth collect the most onset energy
+        phases = np.arange(int(np.ceil(lag)))
+        teeth = np.arange(int(n // lag)) * lag
+        idx = np.rint(n - 1 - phases[:, None] - teeth[None, :]).astype(np.intp)
+        scores = np.where(idx >= 0, env[np.clip(idx, 0, None)], 0.0).sum(axis=1)
+        best_phase = int(np.argmax(scores))
+        phase = float(best_phase)
+        if scores.size >= 3:
+            a = scores[best_phase - 1]
+            b = scores[best_phase]
+            c = scores[(best_phase + 1) % scores.size]
+            denominator = a - 2 * b + c
+            if denominator < 0:
+                phase += 0.5 * (a - c) / denominator
+
+        period_ns = lag / self.frame_rate * 1e9
+        with self._cond:
+            if (
+                self.period_ns
+                and abs(period_ns - self.period_ns) < 0.04 * self.period_ns
+            ):
+                self._stable += 1
+            else:
+                self._stable = 0
+            self.period_ns = period_ns
+            self.confidence = float(acf[round(lag)] / acf[0])
+            self._anchor_ns = int(self._last_frame_ns - phase / self.frame_rate * 1e9)
+            self._cond.notify_all()
+
+    def next_beat_ns(self, after_ns: int) -> int | None:
+        """First predicted beat strictly after after_ns, None when unlocked."""
+        if not self.locked:
+            return None
+        beats = np.floor((after_ns - self._anchor_ns) / self.period_ns) + 1
+        return int(self._anchor_ns + beats * self.period_ns)
+
+    # ------------------------------------------------------------------
+    # Scheduler
+    # ------------------------------------------------------------------
+
+    def start(self, on_beat: Callable[[int], None]) -> None:
+        """Emit predicted beats through on_beat until stop()."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._on_beat = on_beat
+        self._stop = False
+        self._thread = threading.Thread(
+            target=self._schedule_loop, daemon=True, name="BeatScheduler"
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _schedule_loop(self) -> None:
+        with self._cond:
+            while not self._stop:
+                lead_ns = int(self.lead_ms * 1e6)
+                now = time.monotonic_ns()
+                # Skip beats already emitted (or within half a period of one),
+                # and tolerate waking up a few ms after the emit time
+                after = max(
+                    now + lead_ns - 5_000_000,
+                    self._last_emitted_ns + self.period_ns / 2,
+                )
+                beat = self.next_beat_ns(int(after))
+                if beat is None:
+                    self._cond.wait(timeout=0.1)
+                    continue
+                delay = (beat - lead_ns - now) / 1e9
+                if delay > 0.002:
+                    # Woken early on every re-analysis, the grid may have moved
+                    self._cond.wait(timeout=delay)
+                    continue
+                self._last_emitted_ns = beat
+                callback = self._on_beat
+                self._cond.release()
+                try:
+                    if callback:
+                        callback(beat)
+                except Exception as e:  # noqa
+                    logger.error(f"Predicted beat callback failed: {e}")
+                finally:
+                    self._cond.acquire()
@@ -0,0 +1,295 @@
+import struct
+import threading
+import time
+import traceback
+from pathlib import Path
+
+import numpy as np
+
+from lightshow.audio.audio_streams import (
+    LoopbackAudioCapture,
+    LoopbackAudioStreamHandler,
+)
+from lightshow.audio.audio_types import AAudioStreamHandler, Processor
+from lightshow.audio.ring_buffer import normalize_chunk
+from lightshow.gui.utils.ui_signals import ui_signals
+from lightshow.utils import global_config
+from lightshow.utils.config import Config, _Settings
+from lightshow.utils.logger import Logger
+
+# WAVE_FORMAT_* codes -> (bits per sample -> numpy dtype)
+_WAV_DTYPES: dict[int, dict[int, str]] = {
+    1: {8: "u1", 16: "<i2", 32: "<i4"},  # PCM
+    3: {32: "<f4", 64: "<f8"},  # IEEE float
+}
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# ---------------------------------------------------------------------------
+# PCM file mapping
+# ---------------------------------------------------------------------------
+
+
+def map_wav(path: str | Path) -> tuple[np.memmap, int]:
+    """
+    Memory-map the sample data of a PCM / IEEE float WAV file.
+
+    Returns a read-only (frames, channels) memmap and the sample rate.
+    Only the RIFF headers are read eagerly; samples are paged in on access.
+    """
+    fmt: tuple[int, int, int, int] | None = None
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, chunk_len = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = f.read(chunk_len)
+                audio_format, channels, sample_rate, _, _, bits = struct.unpack(
+                    "<HHIIHH", body[:16]
+                )
+                if audio_format == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    # Sub-format GUID starts with the actual format code
+                    (audio_format,) = struct.unpack("<H", body[24:26])
+                fmt = (audio_format, channels, sample_rate, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"{path} has a data chunk before its fmt chunk")
+                data_offset = f.tell()
+                break
+            else:
+                f.seek(chunk_len, 1)
+            if chunk_len % 2:  # chunks are word aligned
+                f.seek(1, 1)
+
+    audio_format, channels, sample_rate, bits = fmt
+    dtype = _WAV_DTYPES.get(audio_format, {}).get(bits)
+    if dtype is None:
+        raise ValueError(
+            f"Unsupported WAV encoding (format={audio_format}, bits={bits}) in {path}"
+        )
+    return map_raw_pcm(path, dtype, channels, offset=data_offset), sample_rate
+
+
+def map_raw_pcm(
+    path: str | Path, dtype: str, channels: int = 1, offset: int = 0
+) -> np.memmap:
+    """Memory-map headerless interleaved PCM as a read-only (frames, channels) array."""
+    itemsize = np.dtype(dtype).itemsize
+    frames = (Path(path).stat().st_size - offset) // (itemsize * channels)
+    return np.memmap(
+        path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels)
+    )
+
+
+# ---------------------------------------------------------------------------
+# FileAudioCapture
+# ---------------------------------------------------------------------------
+
+
+class FileAudioCapture(LoopbackAudioCapture):
+    """
+    Replays memory-mapped PCM frames through the same processor and listener
+    chain as the loopback capture, in exact chunk_size blocks.
+
+    realtime=True paces chunks at the file's sample rate, realtime=False
+    reads them as fast as possible. inline=True processes every chunk on
+    the reader thread (default for fast replays); otherwise chunks go
+    through the regular queue so GUI timer / DSP worker draining behave
+    exactly as with a live stream.
+    """
+
+    def __init__(
+        self,
+        processor: Processor,
+        stream_handler: AAudioStreamHandler,
+        frames: np.ndarray,
+        chunk_size: int = 1024,
+        sample_rate: int = 44100,
+        realtime: bool = True,
+        inline: bool | None = None,
+        dsp_thread: bool = False,
+    ):
+        inline = (not realtime) if inline is None else inline
+        super().__init__(
+            processor=processor,
+            stream_handler=stream_handler,
+            loopback_mic=None,
+            chunk_size=chunk_size,
+            channels=1,
+            sample_rate=sample_rate,
+            dsp_thread=dsp_thread and not inline,
+        )
+        self.logger = Logger("FileAudioCapture")
+        self.frames = frames
+        self.realtime = realtime
+        self.inline = inline
+        self.chunks_read = 0
+        self.finished = threading.Event()
+
+        # Integer PCM is scaled to [-1, 1] into one reusable buffer
+        kind, itemsize = frames.dtype.kind, frames.dtype.itemsize
+        self._scale = 1.0 if kind == "f" else 1.0 / (1 << (8 * itemsize - 1))
+        self._bias = -(1 << 7) if kind == "u" else 0
+        self._buffer = np.zeros(chunk_size, dtype=np.float32)
+        self._scratch = np.empty(chunk_size, dtype=np.float32)
+
+    def _read_chunk(self, start: int) -> np.ndarray:
+        block = self.frames[start : start + self.chunk_size, 0]
+        n = block.shape[0]
+        out = self._buffer
+        if self._bias:
+            np.add(block, self._bias, out=out[:n], casting="unsafe")
+            np.multiply(out[:n], self._scale, out=out[:n])
+        else:
+            np.multiply(block, self._scale, out=out[:n], casting="unsafe")
+        out[n:] = 0.0
+        return out
+
+    def _capture_loop(self) -> None:
+        """Reads the file chunk by chunk – runs in a dedicated thread."""
+        self.logger.info(
+            f"File replay started ({'realtime' if self.realtime else 'fast'})"
+        )
+        period = self.chunk_size / self.sample_rate
+        started = time.perf_counter()
+        deadline = started
+        try:
+            for start in range(0, self.frames.shape[0], self.chunk_size):
+                if self._stop_event.is_set():
+                    break
+                samples = self._read_chunk(start)
+                if self.realtime:
+                    deadline += period
+                    delay = deadline - time.perf_counter()
+                    if delay > 0 and self._stop_event.wait(delay):
+                        break
+                if self.inline:
+                    # Same normalisation as the queue path (_enqueue)
+                    normalize_chunk(samples, self._scratch)
+                    self._process_samples(samples)
+                else:
+                    self._enqueue(samples)
+                    self._data_ready.set()
+                self.chunks_read += 1
+        except Exception:  # noqa: BLE001
+            self.logger.error(f"File replay error: {traceback.format_exc()}")
+            ui_signals.show_error.emit(
+                "Audio Error",
+                f"File replay failed: \n {traceback.format_exc()}",
+            )
+
+        elapsed = time.perf_counter() - started
+        audio_seconds = self.chunks_read * period
+        self.logger.info(
+            f"File replay stopped: {audio_seconds:.1f}s of audio in {elapsed:.1f}s "
+            f"({audio_seconds / max(elapsed, 1e-9):.1f}x realtime)"
+        )
+        self.finished.set()
+
+
+# ---------------------------------------------------------------------------
+# FileAudioStreamHandler
+# ---------------------------------------------------------------------------
+
+
+class FileAudioStreamHandler(LoopbackAudioStreamHandler):
+    """
+    Stream handler that replays a WAV or raw PCM file instead of a sound
+    server loopback, e.g. to profile the processor, detectors and device
+    controllers on a headless machine.
+
+    Usage
+    -----
+    handler = FileAudioStreamHandler(SpectrumProcessor, config, "set.wav", realtime=False)
+    handler.add_listener_on_init(MainAudioListener(handler))
+    handler.run()  # blocks until the whole file was replayed
+
+    Raw PCM needs its layout: FileAudioStreamHandler(..., "set.pcm",
+    pcm_dtype="<i2", pcm_channels=2, pcm_sample_rate=48000)
+    """
+
+    def __init__(
+        self,
+        processor: type[Processor],
+        config: Config,
+        path: str | Path,
+        realtime: bool = True,
+        pcm_dtype: str | None = None,
+        pcm_channels: int = 1,
+        pcm_sample_rate: int = 44100,
+    ):
+        super().__init__(processor, config)
+        self.logger = Logger("FileAudioStreamHandler")
+        self.path = Path(path)
+        self.realtime = realtime
+        self.inline: bool | None = None  # None: inline only for fast replays
+        self.pcm_dtype = pcm_dtype
+        self.pcm_channels = pcm_channels
+        self.sample_rate = pcm_sample_rate
+        self.channels = 1
+        self._frames: np.ndarray | None = None
+
+    def setup_device(self) -> None:
+        """Map the file instead of resolving a soundcard device."""
+        try:
+            if self.pcm_dtype is None:
+                self._frames, self.sample_rate = map_wav(self.path)
+            else:
+                self._frames = map_raw_pcm(self.path, self.pcm_dtype, self.pcm_channels)
+            self.logger.debug(
+                f"Replay file: '{self.path}' | frames={self._frames.shape[0]} | "
+                f"SR={self.sample_rate} | hop={self.chunk_size} | fft={self.fft_size}"
+            )
+        except Exception as e:
+            self.logger.error(f"setup_device failed: {e}")
+            raise
+
+    def start_stream(self) -> None:
+        if self._frames is None:
+            raise RuntimeError("setup_device() must be called before start_stream()")
+        processor = self._create_processor()
+        self.audio_capture = FileAudioCapture(
+            processor=processor,
+            stream_handler=self,
+            frames=self._frames,
+            chunk_size=self.chunk_size,
+            sample_rate=self.sample_rate,
+            realtime=self.realtime,
+            inline=self.inline,
+            dsp_thread=global_config.settings[_Settings.DSP_THREAD],
+        )
+        for listener in self.device_change_listeners:
+            listener(self.audio_capture)
+        # Attach listeners before the first chunk is read, a fast replay
+        # would otherwise run part of the file without them
+        for listener in self.pending_listeners:
+            self.audio_capture.add_listener(listener)
+        self.pending_listeners.clear()
+
+        self.audio_capture.start()
+        self.logger.info("File replay stream started")
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the replay reaches the end of the file."""
+        reinit_thread = getattr(self, "_reinit_thread", None)
+        if reinit_thread:
+            reinit_thread.join(timeout)
+        if not self.audio_capture:
+            return False
+        return self.audio_capture.finished.wait(timeout)
+
+    def run(self) -> None:
+        """
+        Synchronously replay the whole file, then stop the stream.
+        There is no GUI timer to drain a queue here, so chunks are always
+        processed inline on the reader thread (paced if realtime).
+        """
+        self.inline = True
+        self.setup_device()
+        self.start_stream()
+        self.wait()
+        self.stop_stream()
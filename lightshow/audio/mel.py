@@ -0,0 +1,80 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+def hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + np.asarray(hz, dtype=np.float64) / 700.0)
+
+
+def mel_to_hz(mel):
+    return 700.0 * (10.0 ** (np.asarray(mel, dtype=np.float64) / 2595.0) - 1.0)
+
+
+class MelFilterbank:
+    """
+    Triangular mel filterbank over an rfft power spectrum.
+
+    Each filter is normalised to unit sum, so a mel energy is the weighted
+    mean power of the bins it covers (same scale as AudioData.get_freq_mean).
+    Bins above the last filter are never read: the weights only span the
+    columns [lo, hi) where at least one filter is non-zero.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        fft_size: int,
+        n_mels: int = 40,
+        fmin: float = 0.0,
+        fmax: float | None = None,
+    ):
+        self.sample_rate = sample_rate
+        self.fft_size = fft_size
+        self.n_mels = n_mels
+        fmax = sample_rate / 2 if fmax is None else fmax
+
+        bin_hz = np.fft.rfftfreq(fft_size, 1.0 / sample_rate)
+        edges_hz = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+        lower, center, upper = (
+            edges_hz[:-2, None],
+            edges_hz[1:-1, None],
+            edges_hz[2:, None],
+        )
+        rising = (bin_hz - lower) / np.maximum(center - lower, 1e-9)
+        falling = (upper - bin_hz) / np.maximum(upper - center, 1e-9)
+        weights = np.maximum(0.0, np.minimum(rising, falling))
+
+        # Low filters can be narrower than one bin, use the nearest bin then
+        empty = weights.sum(axis=1) == 0
+        if empty.any():
+            nearest = np.abs(bin_hz - center[empty]).argmin(axis=1)
+            weights[np.flatnonzero(empty), nearest] = 1.0
+        weights /= weights.sum(axis=1, keepdims=True)
+
+        columns = np.flatnonzero(weights.any(axis=0))
+        self.lo = int(columns[0])
+        self.hi = int(columns[-1]) + 1
+        self.weights = np.ascontiguousarray(
+            weights[:, self.lo : self.hi], dtype=np.float32
+        )
+        self.weights.setflags(write=False)
+        self.center_hz = center[:, 0]
+
+    def apply(self, power: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """Mel energies of one (bins,) spectrum or a (frames, bins) batch."""
+        if power.ndim == 1:
+            return np.matmul(self.weights, power[self.lo : self.hi], out=out)
+        return np.matmul(power[:, self.lo : self.hi], self.weights.T, out=out)
+
+
+@lru_cache(maxsize=8)
+def mel_filterbank(
+    sample_rate: int,
+    fft_size: int,
+    n_mels: int = 40,
+    fmin: float = 0.0,
+    fmax: float | None = None,
+) -> MelFilterbank:
+    """Shared filterbank, built once per configuration."""
+    return MelFilterbank(sample_rate, fft_size, n_mels, fmin, fmax)
@@ -1,49 +1,308 @@
 import numpy as np
 
+from lightshow.utils.tracing import tracer
+
 from .audio_types import AudioData, Processor
+from .bass_tracker import BassTracker
+from .mel import mel_filterbank
 
 # Initialize numpy to use single thread for callbacks
 np.seterr(all="ignore")
 
+# Smoothing constants and detector thresholds were tuned on non-overlapping
+# 1024-sample frames; other window / hop sizes are rescaled to match.
+REFERENCE_FFT_SIZE = 1024
+
 
 class SpectrumProcessor(Processor):
-    def __init__(self, chunk_size, sample_rate, sensitivity=2.0, attack=0.7, decay=0.4):
-        super().__init__(chunk_size, sample_rate)
+    """
+    Power spectrum with attack/decay smoothing.
+
+    When fft_size is larger than chunk_size, every incoming chunk is one hop
+    of an overlapping STFT: it is shifted into a sliding fft_size window so a
+    frame is produced per hop while keeping the window's bass resolution.
+
+    mel_bands > 0 also attaches that many mel band energies to every frame
+    (AudioData.mel), computed from the smoothed spectrum with one matmul.
+
+    bass_tracking runs a BassTracker on the raw samples, giving every frame a
+    sample-accurate bass onset offset and a 0-1 bass intensity.
+    """
+
+    def __init__(
+        self,
+        chunk_size,
+        sample_rate,
+        sensitivity=2.0,
+        attack=0.7,
+        decay=0.4,
+        fft_size=None,
+        mel_bands=40,
+        bass_tracking=True,
+    ):
+        super().__init__(chunk_size, sample_rate, fft_size)
         self.sensitivity = sensitivity
         self.attack = attack
         self.decay = decay
         self._prev = None
 
+        # Per-frame coefficients keeping the reference smoothing time constant
+        hop_ratio = chunk_size / REFERENCE_FFT_SIZE
+        self._attack = attack**hop_ratio
+        self._decay = decay**hop_ratio
+        # Power grows with the window length squared, keep reference magnitudes
+        self._power_scale = sensitivity * (REFERENCE_FFT_SIZE / self.fft_size) ** 2
+
+        self._window = (
+            np.zeros(self.fft_size, dtype=np.float32)
+            if self.fft_size > chunk_size
+            else None
+        )
+        self.mel = (
+            mel_filterbank(sample_rate, self.fft_size, mel_bands) if mel_bands else None
+        )
+        self.bass = BassTracker(sample_rate) if bass_tracking else None
+
     @staticmethod
     def hz_to_bin(freq_hz, sample_rate, fft_size):
         return int(freq_hz * fft_size / sample_rate)
 
+    def _slide(self, arr: np.ndarray) -> np.ndarray:
+        """Shift the latest hop into the STFT window and return the window."""
+        window = self._window
+        assert window is not None
+        hop = min(arr.size, window.size)
+        window[:-hop] = window[hop:]
+        window[-hop:] = arr[-hop:]
+        return window
+
+    def _slide_batch(self, batch: np.ndarray) -> np.ndarray:
+        """Frames (one per row of hops) of the STFT window, in order."""
+        window = self._window
+        assert window is not None
+        hop = batch.shape[1]
+        stream = np.concatenate((window, batch.ravel()))
+        frames = np.lib.stride_tricks.sliding_window_view(stream, window.size)
+        window[:] = stream[-window.size :]
+        return frames[hop::hop]
+
+    def _track_bass(self, arr: np.ndarray) -> tuple[int | None, float | None]:
+        """Bass onset offset and intensity of a chunk (before normalisation)."""
+        if self.bass is None or arr.size % self.bass.block:
+            return None, None
+        return self.bass.process(arr)
+
+    @tracer.traced("SpectrumProcessor.process")
     def process(self, data) -> AudioData:
         arr = np.asarray(data, dtype=np.float32)
         if arr.size == 0:
-            return AudioData(np.zeros(self.chunk_size // 2 + 1))
+            spectrum = np.zeros(self.fft_size // 2 + 1)
+            return AudioData(spectrum, self.mel.apply(spectrum) if self.mel else None)
 
         max_abs = float(np.abs(arr).max())
         if max_abs > 1.01:
             arr = np.clip(arr, -1.0, 1.0)
-        elif 0 < max_abs < 0.001:
+        onset, intensity = self._track_bass(arr)
+        if 0 < max_abs < 0.001:
             arr = arr / max_abs
 
+        if self._window is not None:
+            arr = self._slide(arr)
+
         # NO window, NO zero-padding — keeps bin math identical to old code
         fft_result = np.fft.rfft(arr)
-        power_spectrum = np.square(np.abs(fft_result)) * self.sensitivity
+        power_spectrum = np.square(np.abs(fft_result)) * self._power_scale
 
         # Restore attack/decay smoothing to preserve transients
         if self._prev is None or self._prev.shape != power_spectrum.shape:
             self._prev = power_spectrum.copy()
         rising = power_spectrum > self._prev
         self._prev[rising] = (
-            self.attack * self._prev[rising]
-            + (1 - self.attack) * power_spectrum[rising]
+            self._attack * self._prev[rising]
+            + (1 - self._attack) * power_spectrum[rising]
         )
         self._prev[~rising] = (
-            self.decay * self._prev[~rising]
-            + (1 - self.decay) * power_spectrum[~rising]
+            self._decay * self._prev[~rising]
+            + (1 - self._decay) * power_spectrum[~rising]
+        )
+
+        spectrum = self._prev.copy()
+        return AudioData(
+            spectrum,
+            self.mel.apply(spectrum) if self.mel else None,
+            onset,
+            intensity,
+        )
+
+    @tracer.traced("SpectrumProcessor.process_batch")
+    def process_batch(self, chunks: np.ndarray) -> list[AudioData]:
+        """
+        Catch-up path for a backlog of chunks: one rfft along axis 1 for all
+        of them, then the attack/decay recurrence row by row, in place.
+        """
+        batch = np.asarray(chunks, dtype=np.float32)
+        if batch.ndim != 2 or batch.shape[0] < 2 or batch.shape[1] == 0:
+            return super().process_batch(batch)
+
+        # Same per-chunk normalisation as process()
+        max_abs = np.abs(batch).max(axis=1)
+        clipped = max_abs > 1.01
+        quiet = (max_abs > 0) & (max_abs < 0.001)
+        if clipped.any() or quiet.any():
+            batch = batch.copy()  # rows may be views of capture buffers
+            batch[clipped] = np.clip(batch[clipped], -1.0, 1.0)
+        bass = [self._track_bass(row) for row in batch]
+        if quiet.any():
+            batch[quiet] /= max_abs[quiet, None]
+
+        frames = self._slide_batch(batch) if self._window is not None else batch
+        power = np.square(np.abs(np.fft.rfft(frames, axis=1)))
+        power *= self._power_scale
+
+        prev = self._prev
+        if prev is None or prev.shape != power.shape[1:]:
+            prev = power[0].copy()
+        rising = np.empty(prev.shape, dtype=bool)
+        coef = np.empty_like(prev)
+        delta = np.empty_like(prev)
+        for row in power:
+            # prev = coef * prev + (1 - coef) * row
+            np.greater(row, prev, out=rising)
+            coef.fill(self._decay)
+            np.copyto(coef, self._attack, where=rising)
+            np.subtract(prev, row, out=delta)
+            np.multiply(delta, coef, out=delta)
+            np.add(row, delta, out=prev)
+            row[:] = prev
+        self._prev = prev
+
+        mels = self.mel.apply(power) if self.mel is not None else [None] * len(power)
+        return [
+            AudioData(row, mel, onset, intensity)
+            for row, mel, (onset, intensity) in zip(power, mels, bass, strict=True)
+        ]
+
+
+class BufferedSpectrumProcessor(SpectrumProcessor):
+    """
+    SpectrumProcessor with a preallocated hot path.
+
+    Input, FFT, power, mask and smoothing buffers are allocated once and every
+    step runs through out= ufuncs, so process() does not allocate per chunk.
+    Listeners get read-only frames from a small round-robin pool: a frame
+    stays valid for pool_size chunks, copy it to keep it longer.
+    """
+
+    def __init__(
+        self,
+        chunk_size,
+        sample_rate,
+        sensitivity=2.0,
+        attack=0.7,
+        decay=0.4,
+        fft_size=None,
+        mel_bands=40,
+        pool_size=8,
+        bass_tracking=True,
+    ):
+        super().__init__(
+            chunk_size,
+            sample_rate,
+            sensitivity,
+            attack,
+            decay,
+            fft_size,
+            mel_bands,
+            bass_tracking,
+        )
+        bins = self.fft_size // 2 + 1
+        self._input = np.zeros(chunk_size, dtype=np.float32)
+        self._magnitude = np.zeros(chunk_size, dtype=np.float32)
+        self._spectrum = np.zeros(bins, dtype=np.complex64)
+        self._power = np.zeros(bins, dtype=np.float32)
+        self._rising = np.zeros(bins, dtype=bool)
+        self._coef = np.zeros(bins, dtype=np.float32)
+        self._state = np.zeros(bins, dtype=np.float32)
+        self._pool = np.zeros((pool_size, bins), dtype=np.float32)
+        self._pool.setflags(write=False)
+        self._mel_pool = (
+            np.zeros((pool_size, self.mel.n_mels), dtype=np.float32)
+            if self.mel
+            else None
         )
+        if self._mel_pool is not None:
+            self._mel_pool.setflags(write=False)
+        self._pool_index = 0
+
+    @tracer.traced("BufferedSpectrumProcessor.process")
+    def process(self, data) -> AudioData:
+        if np.shape(data) != self._input.shape:
+            # Odd-sized chunk, take the generic path and resync the state
+            audio_data = super().process(data)
+            if self._prev is not self._state and self._prev.shape == self._state.shape:
+                np.copyto(self._state, self._prev)
+                self._prev = self._state
+            return audio_data
+
+        arr = self._input
+        np.copyto(arr, data, casting="unsafe")
+        np.abs(arr, out=self._magnitude)
+        max_abs = float(self._magnitude.max())
+        if max_abs > 1.01:
+            np.clip(arr, -1.0, 1.0, out=arr)
+        bass = self._track_bass(arr)
+        if 0 < max_abs < 0.001:
+            np.divide(arr, max_abs, out=arr)
+
+        if self._window is not None:
+            arr = self._slide(arr)
+
+        power = self._power
+        np.fft.rfft(arr, out=self._spectrum)
+        np.abs(self._spectrum, out=power)
+        np.square(power, out=power)
+        np.multiply(power, self._power_scale, out=power)
+
+        prev = self._state
+        if self._prev is None:
+            np.copyto(prev, power)
+            self._prev = prev
+        # prev = coef * prev + (1 - coef) * power, coef = attack where rising
+        np.greater(power, prev, out=self._rising)
+        self._coef.fill(self._decay)
+        np.copyto(self._coef, self._attack, where=self._rising)
+        np.subtract(prev, power, out=prev)
+        np.multiply(prev, self._coef, out=prev)
+        np.add(prev, power, out=prev)
+
+        return self._publish(prev, *bass)
+
+    @tracer.traced("BufferedSpectrumProcessor.process_batch")
+    def process_batch(self, chunks: np.ndarray) -> list[AudioData]:
+        frames = super().process_batch(chunks)
+        # The batch path rebinds _prev, copy it back into the state buffer
+        if self._prev is not self._state and self._prev is not None:
+            np.copyto(self._state, self._prev)
+            self._prev = self._state
+        return frames
 
-        return AudioData(self._prev.copy())
+    def _publish(
+        self,
+        frame: np.ndarray,
+        onset: int | None = None,
+        intensity: float | None = None,
+    ) -> AudioData:
+        """Copy frame (and its mel energies) into the next pool slot, read-only."""
+        pool, mel_pool = self._pool, self._mel_pool
+        index = self._pool_index
+        self._pool_index = (index + 1) % pool.shape[0]
+        pool.setflags(write=True)
+        np.copyto(pool[index], frame)
+        pool.setflags(write=False)
+        if mel_pool is None or self.mel is None:
+            return AudioData(pool[index], None, onset, intensity)
+        mel_pool.setflags(write=True)
+        self.mel.apply(frame, out=mel_pool[index])
+        mel_pool.setflags(write=False)
+        # Views inherit the flag when taken, so index after locking the pools
+        return AudioData(pool[index], mel_pool[index], onset, intensity)
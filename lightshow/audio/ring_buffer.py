@@ -0,0 +1,127 @@
+import numpy as np
+
+
+def normalize_chunk(samples: np.ndarray, scratch: np.ndarray | None = None) -> None:
+    """
+    Normalise / clamp a mono chunk in place, the same way for every capture:
+    quiet signals (peak below 0.1) get a x5 gain, peaks above 1 are clipped.
+    scratch, a float buffer of the chunk's size, avoids allocating.
+    """
+    magnitude = np.abs(samples, out=scratch)
+    max_abs = float(magnitude.max())
+    if 0.001 < max_abs < 0.1:
+        np.multiply(samples, 5.0, out=samples)
+    elif max_abs > 1.0:
+        np.clip(samples, -1.0, 1.0, out=samples)
+
+
+class SampleRingBuffer:
+    """
+    Preallocated single-producer / single-consumer ring of float32 chunks.
+
+    The capture thread writes each chunk in place into the next free slot and
+    publishes it by bumping the write counter; the consumer reads slots as
+    views and releases them by bumping the read counter. Each counter is only
+    ever written by one side, so no lock is needed and the producer never
+    blocks: when the ring is full the incoming chunk is dropped and counted.
+
+    Usage
+    -----
+    ring = SampleRingBuffer(chunk_size=1024, capacity=64)
+
+    # producer (capture thread)
+    ring.write(raw)
+
+    # consumer
+    samples = ring.peek()
+    if samples is not None:
+        ...  # samples is a view, valid until release()
+        ring.release()
+    """
+
+    def __init__(self, chunk_size: int, capacity: int = 64):
+        if capacity <= 0:
+            raise ValueError("Ring capacity must be a positive non-nul int.")
+        self.chunk_size = chunk_size
+        self.capacity = capacity
+        self.dropped = 0
+
+        self._slots = np.zeros((capacity, chunk_size), dtype=np.float32)
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._scratch = np.empty(chunk_size, dtype=np.float32)
+        # Monotonic counters, slot index is counter % capacity.
+        # _write is only touched by the producer, _read only by the consumer.
+        self._write = 0
+        self._read = 0
+
+    def __len__(self) -> int:
+        return self._write - self._read
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def write(self, raw: np.ndarray, timestamp: int = 0) -> bool:
+        """
+        Copy, pad and normalise a raw (frames, channels) or (frames,) block
+        into the next slot, with its capture timestamp. Returns False if the
+        ring was full and the chunk was dropped.
+        """
+        if self._write - self._read >= self.capacity:
+            self.dropped += 1
+            return False
+
+        slot = self._slots[self._write % self.capacity]
+        # Mix down to mono by keeping the first channel, same as the queue path
+        mono = raw[:, 0] if raw.ndim == 2 else raw
+        frames = min(mono.shape[0], self.chunk_size)
+        np.copyto(slot[:frames], mono[:frames], casting="unsafe")
+        slot[frames:] = 0.0
+
+        normalize_chunk(slot, self._scratch)
+
+        self._timestamps[self._write % self.capacity] = timestamp
+        # Publish only once the slot is fully written
+        self._write += 1
+        return True
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    def peek(self) -> np.ndarray | None:
+        """Return a view of the oldest unread chunk, or None if empty."""
+        if self._read >= self._write:
+            return None
+        return self._slots[self._read % self.capacity]
+
+    def peek_batch(self, max_chunks: int) -> np.ndarray | None:
+        """
+        Return a (n, chunk_size) view of up to max_chunks unread chunks that
+        are contiguous in memory (stops at the end of the ring), or None.
+        """
+        available = self._write - self._read
+        if available <= 0:
+            return None
+        start = self._read % self.capacity
+        count = min(available, max_chunks, self.capacity - start)
+        return self._slots[start : start + count]
+
+    def peek_timestamps(self, count: int) -> np.ndarray:
+        """Capture timestamps of the chunks returned by peek_batch(count)."""
+        start = self._read % self.capacity
+        return self._timestamps[start : start + count]
+
+    def release(self, count: int = 1) -> None:
+        """Hand the slot(s) returned by peek() / peek_batch() back to the producer."""
+        self._read = min(self._read + count, self._write)
+
+    def clear(self) -> None:
+        """Drop every pending chunk (consumer side)."""
+        self._read = self._write
+
+    def latest(self) -> np.ndarray | None:
+        """Return a view of the most recently written chunk, if any."""
+        if self._write == 0:
+            return None
+        return self._slots[(self._write - 1) % self.capacity]
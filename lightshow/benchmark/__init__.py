@@ -0,0 +1,13 @@
+from .runner import DETECTORS, StreamFormat, run_suite, run_track
+from .tracks import Section, SyntheticTrack, default_suite, render_track
+
+__all__ = [
+    "DETECTORS",
+    "Section",
+    "StreamFormat",
+    "SyntheticTrack",
+    "default_suite",
+    "render_track",
+    "run_suite",
+    "run_track",
+]
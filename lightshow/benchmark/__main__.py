@@ -0,0 +1,113 @@
+"""
+Beat detection benchmark on synthetic annotated tracks.
+
+    python -m lightshow.benchmark [--detectors Percentile Spike]
+                                  [--formats 1024/1024 512/1024]
+                                  [--hop 512] [--fft 1024] [--output results.json]
+
+Runs the suite once per stream format (hop / FFT size), the defaults plus
+overlapping and long-window ones, since frame-rate dependent tuning only
+shows off the defaults. --hop / --fft run a single format instead. Prints
+a summary table per format on stderr and the full results as JSON on
+stdout (or in --output), so runs can be diffed between algorithm changes.
+"""
+
+import argparse
+import json
+import sys
+
+from lightshow.audio.processors import BufferedSpectrumProcessor, SpectrumProcessor
+from lightshow.benchmark.runner import DETECTORS, StreamFormat, run_suite
+from lightshow.benchmark.tracks import default_suite
+from lightshow.utils.config import VERSION
+
+# hop/FFT sizes run by default: the reference stream, overlapping hops and
+# a longer window
+FORMATS = ("1024/1024", "512/1024", "256/1024", "1024/2048")
+
+PROCESSORS = {
+    "SpectrumProcessor": SpectrumProcessor,
+    "BufferedSpectrumProcessor": BufferedSpectrumProcessor,
+}
+
+
+def _fmt(value, pattern="{:.3f}") -> str:
+    return "-" if value is None else pattern.format(value)
+
+
+def _stream_format(spec: str, sample_rate: int) -> StreamFormat:
+    hop, _, fft = spec.partition("/")
+    chunk_size = int(hop)
+    return StreamFormat(
+        sample_rate=sample_rate,
+        chunk_size=chunk_size,
+        fft_size=max(int(fft or hop), chunk_size),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m lightshow.benchmark")
+    parser.add_argument("--detectors", nargs="+", choices=list(DETECTORS))
+    parser.add_argument("--tracks", nargs="+", help="Only run these tracks")
+    parser.add_argument(
+        "--formats", nargs="+", default=list(FORMATS), help="hop/FFT sizes to run"
+    )
+    parser.add_argument("--hop", type=int, help="Chunk (hop) size, single format")
+    parser.add_argument("--fft", type=int, default=None, help="FFT window size")
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    parser.add_argument(
+        "--processor", choices=list(PROCESSORS), default="SpectrumProcessor"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    tracks = default_suite(args.sample_rate, args.seed)
+    if args.tracks:
+        tracks = [t for t in tracks if t.name in args.tracks]
+    formats = args.formats
+    if args.hop or args.fft:
+        hop = args.hop or 1024
+        formats = [f"{hop}/{args.fft or hop}"]
+    runs = [
+        run_suite(
+            tracks,
+            args.detectors,
+            _stream_format(spec, args.sample_rate),
+            PROCESSORS[args.processor],
+        )
+        for spec in formats
+    ]
+    report = {"version": VERSION, "runs": runs}
+
+    for run in runs:
+        config = run["config"]
+        print(
+            f"\nhop {config['chunk_size']} / FFT {config['fft_size']}", file=sys.stderr
+        )
+        print(
+            f"{'detector':<20} {'F':>6} {'P':>6} {'R':>6} {'lat ms':>7} {'p99 ms':>7} {'onset':>6} {'fps':>9}",
+            file=sys.stderr,
+        )
+        for name, row in run["summary"].items():
+            print(
+                f"{name:<20} {_fmt(row['f_measure']):>6} {_fmt(row['precision']):>6} "
+                f"{_fmt(row['recall']):>6} {_fmt(row['latency_ms']['mean'], '{:.1f}'):>7} "
+                f"{_fmt(row['latency_ms']['p99'], '{:.1f}'):>7} "
+                f"{_fmt(row['onset_error_ms'], '{:.1f}'):>6} {row['fps']:>9.0f}",
+                file=sys.stderr,
+            )
+            for voice, f in row.get("voices", {}).items():
+                print(f"  {voice:<18} {_fmt(f):>6}", file=sys.stderr)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Output engine scaling benchmark: N moving heads fed at the audio frame
+rate, sending to local UDP sinks, with each output engine.
+
+    python -m lightshow.benchmark.output_scaling [--devices 1 4 16 32]
+                                                 [--engines Threads Asyncio]
+                                                 [--seconds 5] [--output r.json]
+                                                 [--binary] [--delta]
+                                                 [--interpolation]
+
+Reports, per engine and device count, the threads the output added, CPU
+use, context switches per second (Unix only), queue-to-send latency and
+the datagrams / bytes each head received. --binary, --delta and
+--interpolation turn on the matching output options for every case.
+"""
+
+import argparse
+import json
+import random
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from lightshow.audio.processors import SpectrumProcessor
+from lightshow.devices.device import PacketData, PacketStatus, PacketType
+from lightshow.devices.moving_head import protocol
+from lightshow.devices.moving_head.moving_head import MovingHead
+from lightshow.devices.output_engine import output_engine
+from lightshow.utils.config import VERSION, _Settings, global_config
+from lightshow.utils.latency import LatencyStats, latency_stats
+
+ENGINES = ("Threads", "Asyncio")
+
+
+def _fmt(value, pattern="{:.2f}") -> str:
+    return "-" if value is None else pattern.format(value)
+
+
+def _context_switches() -> int | None:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_nvcsw + usage.ru_nivcsw
+
+
+def _drain(sink: socket.socket) -> tuple[int, int]:
+    """(datagrams, bytes) waiting on sink."""
+    received = size = 0
+    while True:
+        try:
+            size += len(sink.recv(2048))
+        except BlockingIOError:
+            return received, size
+        received += 1
+
+
+def run_case(
+    engine: str,
+    devices: int,
+    seconds: float,
+    sample_rate: int = 44100,
+    chunk_size: int = 1024,
+    beat_interval: float = 0.5,
+    binary: bool = False,
+) -> dict:
+    """Options other than the engine come from global_config.settings."""
+    global_config.settings[_Settings.OUTPUT_ENGINE] = engine
+    random.seed(0)  # Same animations for every case
+    processor = SpectrumProcessor(chunk_size, sample_rate)
+    rng = np.random.default_rng(0)
+    frames = [processor.process(rng.standard_normal(chunk_size)) for _ in range(8)]
+
+    # One sink per head, drained after the run: nothing reads during it
+    sinks = []
+    for _ in range(devices):
+        sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        sink.bind(("127.0.0.1", 0))
+        sink.setblocking(False)
+        sinks.append(sink)
+
+    threads_before = threading.active_count()
+    heads = []
+    for sink in sinks:
+        head = MovingHead()
+        head.ip, head.port = sink.getsockname()
+        if binary:
+            head.set_protocol(protocol.BINARY_VERSION)
+        head.open_output()
+        heads.append(head)
+    threads_added = threading.active_count() - threads_before
+    latency_stats.reset()
+
+    frame_time = chunk_size / sample_rate
+    frame_count = int(seconds / frame_time)
+    beat_every = max(1, round(beat_interval / frame_time))
+    switches = _context_switches()
+    cpu = time.process_time()
+    start = time.perf_counter()
+    for i in range(frame_count):
+        data = frames[i % len(frames)]
+        packets = [PacketData(PacketType.TICK, PacketStatus.ON, audio_data=data)]
+        if i % beat_every == 0:
+            packets.append(
+                PacketData(PacketType.BEAT, PacketStatus.ON, audio_data=data)
+            )
+        for packet in packets:
+            for head in heads:
+                head.on(packet)
+        # Fixed schedule like the capture, late frames don't shift the others
+        delay = start + (i + 1) * frame_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    if switches is not None:
+        switches = _context_switches() - switches
+
+    time.sleep(0.1)  # Let the last packets out
+    queues = [head._packet_queue.stats() for head in heads]
+    for head in heads:
+        head.close_output()
+    output_engine.stop()
+    received, size = (sum(column) for column in zip(*map(_drain, sinks), strict=True))
+    for sink in sinks:
+        sink.close()
+
+    p50, _, p99 = latency_stats.summary()[LatencyStats.QUEUE_TO_SEND]
+    return {
+        "engine": engine,
+        "devices": devices,
+        "threads": threads_added,
+        "cpu_percent": 100 * cpu / wall,
+        "context_switches_per_s": None if switches is None else switches / wall,
+        "packets": sum(q["enqueued"] for q in queues),
+        "coalesced": sum(q["coalesced"] for q in queues),
+        "datagrams": received,
+        "bytes": size,
+        "datagrams_per_head_s": received / devices / wall,
+        "queue_to_send_ms": {"p50": p50, "p99": p99},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m lightshow.benchmark.output_scaling"
+    )
+    parser.add_argument("--devices", nargs="+", type=int, default=[1, 4, 16, 32])
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--binary", action="store_true", help="Binary (v2) frames")
+    parser.add_argument("--delta", action="store_true", help="Delta frames")
+    parser.add_argument(
+        "--interpolation", action="store_true", help="Device interpolation keyframes"
+    )
+    args = parser.parse_args(argv)
+
+    global_config.settings[_Settings.DELTA_FRAMES] = args.delta
+    global_config.settings[_Settings.DEVICE_INTERPOLATION] = args.interpolation
+    results = [
+        run_case(engine, devices, args.seconds, binary=args.binary)
+        for engine in args.engines
+        for devices in args.devices
+    ]
+
+    print(
+        f"{'engine':<8} {'heads':>5} {'threads':>7} {'cpu %':>6} {'csw/s':>8} "
+        f"{'p50 ms':>7} {'p99 ms':>7} {'pkt/s':>6} {'bytes':>8}",
+        file=sys.stderr,
+    )
+    for row in results:
+        latency = row["queue_to_send_ms"]
+        print(
+            f"{row['engine']:<8} {row['devices']:>5} {row['threads']:>7} "
+            f"{row['cpu_percent']:>6.1f} "
+            f"{_fmt(row['context_switches_per_s'], '{:.0f}'):>8} "
+            f"{_fmt(latency['p50']):>7} {_fmt(latency['p99']):>7} "
+            f"{row['datagrams_per_head_s']:>6.1f} {row['bytes']:>8}",
+            file=sys.stderr,
+        )
+
+    payload = json.dumps({"version": VERSION, "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any, Protocol
+
+import numpy as np
+
+from lightshow.audio.audio_types import AAudioCapture, AAudioStreamHandler, Processor
+from lightshow.audio.data import AudioData
+from lightshow.audio.detectors import (
+    BeatIntervalTracker,
+    BreakDetector,
+    DropDetector,
+    KickDetector,
+    MultibandDetector,
+    SpikeDetector,
+)
+from lightshow.audio.detectors.methods.average_difference import AverageDifference
+from lightshow.audio.detectors.methods.percentil import Percentile
+from lightshow.audio.detectors.methods.spectral_flux import SpectralFlux
+from lightshow.audio.processors import SpectrumProcessor
+from lightshow.benchmark.tracks import SyntheticTrack
+
+# ---------------------------------------------------------------------------
+# Headless stream
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class StreamFormat:
+    """Stands in for the capture passed to device change listeners."""
+
+    sample_rate: int = 44100
+    chunk_size: int = 1024
+    fft_size: int = 1024
+    channels: int = 1
+
+
+class BenchmarkStreamHandler(AAudioStreamHandler):
+    """
+    Stream handler without a device: detectors register their device change
+    listener as usual and get configured for the benchmark's stream format
+    by start_stream().
+    """
+
+    def __init__(self, processor: type[Processor], stream_format: StreamFormat):
+        super().__init__(processor)
+        self.processor_class = processor
+        self.format = stream_format
+        self.device_change_listeners: list[Callable[[AAudioCapture], None]] = []
+
+    def add_device_change_listener(
+        self, listener: Callable[[AAudioCapture], None]
+    ) -> None:
+        self.device_change_listeners.append(listener)
+
+    def reinit_stream(self) -> None:
+        pass
+
+    def setup_device(self) -> None:
+        pass
+
+    def start_stream(self) -> None:
+        for listener in self.device_change_listeners:
+            listener(self.format)  # type: ignore[arg-type]
+
+    def stop_stream(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class BeatDetector(Protocol):
+    def detect(self, data: AudioData, append_current_energy: bool = True) -> bool: ...
+
+
+DETECTORS: dict[str, Callable[[BenchmarkStreamHandler], BeatDetector]] = {
+    "Percentile": lambda handler: KickDetector(handler, Percentile),
+    "Average Difference": lambda handler: KickDetector(handler, AverageDifference),
+    "Spectral Flux": lambda handler: KickDetector(handler, SpectralFlux),
+    "Spike": lambda handler: SpikeDetector(handler, freq_range=[0, 150]),
+    # Kick row scored as the beats, the other rows in TrackResult.voices
+    "Multiband": lambda handler: MultibandDetector(handler),
+}
+
+# Same bound as the app: an older bass onset belongs to an earlier beat
+MAX_ONSET_AGE = 0.15
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SectionScore:
+    annotated: int = 0
+    hit: int = 0
+    false: int = 0
+
+
+@dataclass
+class TrackResult:
+    detector: str
+    track: str
+    frames: int
+    beats: int
+    detections: int
+    true_positives: int
+    false_positives: int
+    false_negatives: int
+    precision: float | None
+    recall: float | None
+    f_measure: float | None
+    latency_ms: dict[str, float | None]
+    # Same, using the bass tracker's onset time of each detected beat
+    onset_error_ms: dict[str, float | None]
+    fps: float
+    breaks: SectionScore = field(default_factory=SectionScore)
+    drops: SectionScore = field(default_factory=SectionScore)
+    # Per-voice counts of multiband detectors, besides the kick
+    voices: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def match_onsets(
+    detections: np.ndarray,
+    reference: np.ndarray,
+    early: float = 0.03,
+    late: float = 0.1,
+) -> list[tuple[float, float]]:
+    """
+    Greedy one-to-one matching in time order: a detection matches the first
+    unmatched reference onset in [onset - early, onset + late].
+    Returns the (reference, detection) pairs.
+    """
+    pairs = []
+    j = 0
+    for detection in detections:
+        while j < reference.size and reference[j] + late < detection:
+            j += 1
+        if j < reference.size and reference[j] - early <= detection:
+            pairs.append((float(reference[j]), float(detection)))
+            j += 1
+    return pairs
+
+
+def f_measure(tp: int, detections: int, reference: int):
+    precision = tp / detections if detections else None
+    recall = tp / reference if reference else None
+    if not precision or not recall:
+        return precision, recall, (0.0 if reference or detections else None)
+    return precision, recall, 2 * precision * recall / (precision + recall)
+
+
+def _score_sections(
+    events: list[float], starts: list[float], window: float
+) -> SectionScore:
+    """Events within window seconds after an annotated start count as hits."""
+    score = SectionScore(annotated=len(starts))
+    for event in events:
+        if any(start <= event <= start + window for start in starts):
+            score.hit += 1
+        else:
+            score.false += 1
+    score.hit = min(score.hit, score.annotated)
+    return score
+
+
+def _score_voice(times: list[float], reference: np.ndarray) -> dict[str, int]:
+    tp = len(match_onsets(np.asarray(times), reference))
+    return {"annotated": int(reference.size), "detections": len(times), "hit": tp}
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+def run_track(
+    name: str,
+    track: SyntheticTrack,
+    stream_format: StreamFormat,
+    processor_class: type[Processor] = SpectrumProcessor,
+) -> TrackResult:
+    """Replay a track chunk by chunk through the processor and one detector."""
+    stream_format.sample_rate = track.sample_rate
+    handler = BenchmarkStreamHandler(processor_class, stream_format)
+    detector = DETECTORS[name](handler)
+    handler.start_stream()
+    processor = processor_class(
+        stream_format.chunk_size, track.sample_rate, fft_size=stream_format.fft_size
+    )
+
+    # Break / drop follow the app's flow, on the audio clock
+    hop = stream_format.chunk_size
+    position_ns = 0
+    tracker = BeatIntervalTracker(30)
+    break_detector = BreakDetector(30, tracker)
+    break_detector.clock = lambda: position_ns
+    drop_detector = DropDetector(30, 5, tracker)
+    in_break = in_drop = False
+    break_events: list[float] = []
+    drop_events: list[float] = []
+
+    detections: list[float] = []
+    onsets: list[float] = []
+    voice_detections: dict[str, list[float]] = {}
+    multiband = isinstance(detector, MultibandDetector)
+    if multiband:
+        voice_detections = {v: [] for v in detector.names if v != "kick"}
+    frames = track.samples.size // hop
+    elapsed = 0
+    for i in range(frames):
+        chunk = track.samples[i * hop : (i + 1) * hop]
+        started = time.perf_counter_ns()
+        data = processor.process(chunk)
+        beat = detector.detect(data)
+        elapsed += time.perf_counter_ns() - started
+
+        # The chunk is complete (and detectable) once its last sample arrived
+        now = (i + 1) * hop / track.sample_rate
+        if multiband:
+            rows = beat
+            beat = bool(rows[detector.index("kick")])
+            for voice, times in voice_detections.items():
+                if rows[detector.index(voice)]:
+                    times.append(now)
+        position_ns = int(now * 1e9)
+        if beat:
+            detections.append(now)
+            onset = now
+            if data.onset_offset is not None:
+                onset = (i * hop + data.onset_offset) / track.sample_rate
+                onset = onset if now - onset <= MAX_ONSET_AGE else now
+            onsets.append(onset)
+            in_break = False
+            tracker.on_beat(position_ns)
+        if not in_break and break_detector.detect(None):  # type: ignore[arg-type]
+            in_break = True
+            break_events.append(now)
+        dropping = drop_detector.detect(None)
+        if dropping and not in_drop:
+            drop_events.append(now)
+        in_drop = dropping
+
+    detected = np.asarray(detections)
+    pairs = match_onsets(detected, track.beats)
+    tp = len(pairs)
+    precision, recall, f = f_measure(tp, detected.size, track.beats.size)
+    latencies = np.array([(d - r) * 1e3 for r, d in pairs])
+    onset_errors = np.array([(onsets[detections.index(d)] - r) * 1e3 for r, d in pairs])
+    return TrackResult(
+        detector=name,
+        track=track.name,
+        frames=frames,
+        beats=int(track.beats.size),
+        detections=int(detected.size),
+        true_positives=tp,
+        false_positives=int(detected.size) - tp,
+        false_negatives=int(track.beats.size) - tp,
+        precision=precision,
+        recall=recall,
+        f_measure=f,
+        latency_ms={
+            "mean": float(latencies.mean()) if latencies.size else None,
+            "p99": float(np.percentile(latencies, 99)) if latencies.size else None,
+        },
+        onset_error_ms={
+            "mean": float(onset_errors.mean()) if onset_errors.size else None,
+            "p99": (
+                float(np.percentile(np.abs(onset_errors), 99))
+                if onset_errors.size
+                else None
+            ),
+        },
+        fps=frames / (elapsed / 1e9) if elapsed else 0.0,
+        breaks=_score_sections(break_events, [s for s, _ in track.breaks], 4.0),
+        drops=_score_sections(drop_events, track.drops, 4.0),
+        voices={
+            voice: _score_voice(times, track.annotations.get(voice, np.zeros(0)))
+            for voice, times in voice_detections.items()
+        },
+    )
+
+
+def summarize(results: list[TrackResult]) -> dict[str, dict[str, Any]]:
+    """Pool the per-track counts of each detector into suite-wide figures."""
+    summary: dict[str, dict[str, Any]] = {}
+    for name in dict.fromkeys(r.detector for r in results):
+        rows = [r for r in results if r.detector == name]
+        tp = sum(r.true_positives for r in rows)
+        precision, recall, f = f_measure(
+            tp, sum(r.detections for r in rows), sum(r.beats for r in rows)
+        )
+        means = [r.latency_ms["mean"] for r in rows if r.latency_ms["mean"] is not None]
+        p99s = [r.latency_ms["p99"] for r in rows if r.latency_ms["p99"] is not None]
+        onset_means = [
+            r.onset_error_ms["mean"]
+            for r in rows
+            if r.onset_error_ms["mean"] is not None
+        ]
+        summary[name] = {
+            "precision": precision,
+            "recall": recall,
+            "f_measure": f,
+            "latency_ms": {
+                "mean": float(np.mean(means)) if means else None,
+                "p99": max(p99s) if p99s else None,
+            },
+            "onset_error_ms": (float(np.mean(onset_means)) if onset_means else None),
+            "fps": float(np.mean([r.fps for r in rows])),
+            "false_positives": sum(r.false_positives for r in rows),
+        }
+        voices: dict[str, dict[str, int]] = {}
+        for r in rows:
+            for voice, counts in r.voices.items():
+                pooled = voices.setdefault(voice, dict.fromkeys(counts, 0))
+                for key, value in counts.items():
+                    pooled[key] += value
+        if voices:
+            summary[name]["voices"] = {
+                voice: f_measure(c["hit"], c["detections"], c["annotated"])[2]
+                for voice, c in voices.items()
+            }
+    return summary
+
+
+def run_suite(
+    tracks: list[SyntheticTrack],
+    detectors: list[str] | None = None,
+    stream_format: StreamFormat | None = None,
+    processor_class: type[Processor] = SpectrumProcessor,
+) -> dict[str, Any]:
+    stream_format = stream_format or StreamFormat()
+    results = [
+        run_track(name, track, stream_format, processor_class)
+        for name in detectors or list(DETECTORS)
+        for track in tracks
+    ]
+    return {
+        "config": asdict(stream_format) | {"processor": processor_class.__name__},
+        "results": [r.to_dict() for r in results],
+        "summary": summarize(results),
+    }
@@ -0,0 +1,178 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# ---------------------------------------------------------------------------
+# Drum voices
+# ---------------------------------------------------------------------------
+
+
+def kick_voice(sample_rate: int, length: float = 0.18) -> np.ndarray:
+    """Pitch-swept sine kick, 155 Hz -> 45 Hz."""
+    t = np.arange(int(length * sample_rate)) / sample_rate
+    freq = 45.0 + 110.0 * np.exp(-t * 30.0)
+    phase = 2 * np.pi * np.cumsum(freq) / sample_rate
+    return (np.sin(phase) * np.exp(-t * 18.0)).astype(np.float32)
+
+
+def snare_voice(
+    sample_rate: int, rng: np.random.Generator, length: float = 0.15
+) -> np.ndarray:
+    """Noise burst over a 190 Hz body."""
+    t = np.arange(int(length * sample_rate)) / sample_rate
+    body = np.sin(2 * np.pi * 190.0 * t) * np.exp(-t * 35.0)
+    noise = rng.standard_normal(t.size) * np.exp(-t * 25.0)
+    return (0.4 * body + 0.35 * noise).astype(np.float32)
+
+
+def hihat_voice(
+    sample_rate: int, rng: np.random.Generator, length: float = 0.05
+) -> np.ndarray:
+    """Short high-passed noise tick."""
+    t = np.arange(int(length * sample_rate)) / sample_rate
+    noise = np.diff(rng.standard_normal(t.size + 1))
+    return (0.12 * noise * np.exp(-t * 120.0)).astype(np.float32)
+
+
+# ---------------------------------------------------------------------------
+# Tracks
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Section:
+    """
+    A stretch of a synthetic track.
+
+    kicks_per_beat=2 doubles the kick density (drop), kick=False leaves only
+    the pad / hats (break, unless nothing else plays either). noise is the
+    level of the white noise bed.
+    """
+
+    seconds: float
+    bpm: float
+    kick: bool = True
+    kicks_per_beat: int = 1
+    snare: bool = True
+    hihat: bool = True
+    pad: bool = True
+    noise: float = 0.005
+    drop: bool = False
+
+
+@dataclass
+class SyntheticTrack:
+    """
+    Rendered mono track with its ground truth: onset times in seconds per
+    voice ("kick", "snare", "hihat"), break sections and drop start times.
+    """
+
+    name: str
+    samples: np.ndarray
+    sample_rate: int
+    annotations: dict[str, np.ndarray] = field(default_factory=dict)
+    breaks: list[tuple[float, float]] = field(default_factory=list)
+    drops: list[float] = field(default_factory=list)
+
+    @property
+    def beats(self) -> np.ndarray:
+        return self.annotations.get("kick", np.zeros(0))
+
+    @property
+    def duration(self) -> float:
+        return self.samples.size / self.sample_rate
+
+
+def _place(out: np.ndarray, voice: np.ndarray, times: np.ndarray, sr: int) -> None:
+    for start in (times * sr).astype(np.intp):
+        end = min(start + voice.size, out.size)
+        out[start:end] += voice[: end - start]
+
+
+def render_track(
+    name: str, sections: list[Section], sample_rate: int = 44100, seed: int = 0
+) -> SyntheticTrack:
+    rng = np.random.default_rng(seed)
+    kick = kick_voice(sample_rate)
+    snare = snare_voice(sample_rate, rng)
+    hihat = hihat_voice(sample_rate, rng)
+
+    total = int(sum(s.seconds for s in sections) * sample_rate)
+    out = np.zeros(total, dtype=np.float32)
+    onsets: dict[str, list[np.ndarray]] = {"kick": [], "snare": [], "hihat": []}
+    track = SyntheticTrack(name, out, sample_rate)
+
+    offset = 0.0
+    for section in sections:
+        beat = 60.0 / section.bpm
+        beats = offset + np.arange(0.0, section.seconds - 1e-9, beat)
+        start, stop = (
+            int(offset * sample_rate),
+            int((offset + section.seconds) * sample_rate),
+        )
+
+        if section.kick:
+            kicks = offset + np.arange(
+                0.0, section.seconds - 1e-9, beat / section.kicks_per_beat
+            )
+            _place(out, kick, kicks, sample_rate)
+            onsets["kick"].append(kicks)
+        elif section.pad or section.hihat:
+            track.breaks.append((offset, offset + section.seconds))
+        if section.drop:
+            track.drops.append(offset)
+        if section.snare:
+            snares = beats[1::2]
+            _place(out, snare, snares, sample_rate)
+            onsets["snare"].append(snares)
+        if section.hihat:
+            hats = beats + beat / 2
+            hats = hats[hats < offset + section.seconds]
+            _place(out, hihat, hats, sample_rate)
+            onsets["hihat"].append(hats)
+        if section.pad:
+            t = np.arange(stop - start) / sample_rate
+            pad = sum(np.sin(2 * np.pi * f * t) for f in (220.0, 277.2, 329.6))
+            out[start:stop] += (0.04 * pad).astype(np.float32)
+        if section.noise:
+            out[start:stop] += (
+                section.noise * rng.standard_normal(stop - start)
+            ).astype(np.float32)
+        offset += section.seconds
+
+    np.clip(out, -1.0, 1.0, out=out)
+    track.annotations = {
+        voice: np.concatenate(times) if times else np.zeros(0)
+        for voice, times in onsets.items()
+    }
+    return track
+
+
+def default_suite(sample_rate: int = 44100, seed: int = 0) -> list[SyntheticTrack]:
+    """Steady tempos, a noisy mix, a break followed by a drop and silence."""
+    return [
+        render_track("kick_90", [Section(20, 90)], sample_rate, seed),
+        render_track("kick_128", [Section(20, 128)], sample_rate, seed),
+        render_track("kick_174", [Section(20, 174)], sample_rate, seed),
+        render_track("noisy_128", [Section(20, 128, noise=0.15)], sample_rate, seed),
+        render_track(
+            "break_drop_128",
+            [
+                Section(16, 128),
+                Section(8, 128, kick=False, snare=False),
+                Section(16, 128, kicks_per_beat=2, drop=True),
+            ],
+            sample_rate,
+            seed,
+        ),
+        render_track(
+            "silence",
+            [
+                Section(
+                    10, 120, kick=False, snare=False, hihat=False, pad=False, noise=1e-4
+                )
+            ],
+            sample_rate,
+            seed,
+        ),
+    ]
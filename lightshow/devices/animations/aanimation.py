@@ -13,6 +13,10 @@ class Command(ABC):
     def toUDP_MH_Command(self) -> str:
         pass
 
+    @abstractmethod
+    def toMHFields(self) -> dict[str, float]:
+        """{UDP argument key: value}, the input of the binary encoder."""
+
 
 """
 
@@ -39,6 +43,9 @@ Fade:
 - fg : From Green Value (0-255)
 - fb : From Blue Value (0-255)
 
+Move:
+- mv : Servo Move Duration (ms)
+
 """
 
 
@@ -61,6 +68,9 @@ class RGB(Command):  # out of 255
     def toUDP_MH_Command(self) -> str:
         return f"r={self.r};g={self.g};b={self.b}"
 
+    def toMHFields(self) -> dict[str, float]:
+        return {"r": self.r, "g": self.g, "b": self.b}
+
     @classmethod
     def fromTuple(cls, tuple: tuple[int, int, int]) -> RGB:
         return cls.fromList(list(tuple))
@@ -92,6 +102,9 @@ class FlickerCommand(Command):
     def toUDP_MH_Command(self) -> str:
         return self.color.toUDP_MH_Command() + f";fl={int(self.flicker)}"
 
+    def toMHFields(self) -> dict[str, float]:
+        return self.color.toMHFields() | {"fl": self.flicker}
+
 
 class FadeCommand(Command):
     from_: RGB
@@ -112,6 +125,14 @@ class FadeCommand(Command):
             + f";fa={int(self.fade)};fr={self.from_.r};fg={self.from_.g};fb={self.from_.b}"
         )
 
+    def toMHFields(self) -> dict[str, float]:
+        return self.to.toMHFields() | {
+            "fa": self.fade,
+            "fr": self.from_.r,
+            "fg": self.from_.g,
+            "fb": self.from_.b,
+        }
+
 
 class AAnimation(ABC):
     def __init__(self):
@@ -1,3 +1,4 @@
+import time
 from abc import ABC, abstractmethod
 from enum import Enum
 from typing import Any, ClassVar
@@ -13,6 +14,7 @@ class PacketType(Enum):
     TICK = 5
     PAUSE = 6
     FLICKER = 7
+    HIHAT = 8
     # Input [256, 511]
     MANUAL_MODE = 256
     AUTO_TICK = 257  # Enables/Disables auto ticking, useful when in manual mode
@@ -30,6 +32,7 @@ class PacketData:
         packet_status: PacketStatus,
         power: int = 1,
         audio_data=None,
+        timestamp: int | None = None,
     ):
         self.packet_type = packet_type
         self.packet_status = packet_status
@@ -37,6 +40,11 @@ class PacketData:
         self.audio_data = (
             audio_data  # Optional AudioData object for audio-reactive effects
         )
+        # time.monotonic_ns() of the audio event, when known precisely
+        self.timestamp = timestamp
+        # Capture time of the audio behind the packet, and creation time
+        self.captured_ns: int | None = getattr(audio_data, "captured_ns", None)
+        self.created_ns = time.monotonic_ns()
 
 
 class Device(ABC):
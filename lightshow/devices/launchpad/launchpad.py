@@ -447,7 +447,9 @@ class LaunchpadX(InputDevice):
 
     def start_effect_engine(self):
         self.running = True
-        self._effect_thread = threading.Thread(target=self._effect_loop, daemon=True)
+        self._effect_thread = threading.Thread(
+            target=self._effect_loop, daemon=True, name="LaunchpadEffects"
+        )
         self._effect_thread.start()
 
     def _effect_loop(self):
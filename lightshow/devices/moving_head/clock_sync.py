@@ -0,0 +1,94 @@
+import time
+from collections import deque
+
+# Device timestamps are the firmware's micros(), an u32 that wraps every ~71 min
+WRAP = 1 << 32
+
+
+def _signed(value: int) -> int:
+    """value mod 2^32 as the nearest signed offset."""
+    value %= WRAP
+    return value - WRAP if value >= WRAP // 2 else value
+
+
+class ClockSync:
+    """
+    NTP-style offset between the host's time.monotonic_ns() and a moving
+    head's micros() clock, from ping / pong exchanges.
+
+    A ping carries the host send time t0, the pong the device receive and
+    send times t1, t2, and the host notes the arrival t3. The exchange gives
+    offset = ((t1 - t0) + (t2 - t3)) / 2, off by at most half its network
+    delay (t3 - t0) - (t2 - t1). The estimate is the sample with the lowest
+    delay among the recent ones: queuing only ever adds delay, the fastest
+    exchange is the most symmetric one.
+    """
+
+    def __init__(self, window: int = 8, min_samples: int = 3):
+        self.window = window
+        self.min_samples = min_samples
+        self.reset()
+
+    def reset(self) -> None:
+        # (delay us, offset us, host us when measured)
+        self._samples: deque[tuple[int, int, int]] = deque(maxlen=self.window)
+        self.offset_us: int | None = None  # device us - host us, mod 2^32
+        self.delay_us: int | None = None
+
+    @staticmethod
+    def host_us(now_ns: int | None = None) -> int:
+        return (time.monotonic_ns() if now_ns is None else now_ns) // 1000
+
+    def ping(self, now_ns: int | None = None) -> bytes:
+        return f"ping;{self.host_us(now_ns)}".encode()
+
+    def on_pong(self, data: bytes, now_ns: int | None = None) -> bool:
+        """Feed a 'pong;t0;t1;t2' reply. False when it isn't one."""
+        t3 = self.host_us(now_ns)
+        parts = data.split(b";")
+        if len(parts) != 4 or parts[0] != b"pong":
+            return False
+        try:
+            t0, t1, t2 = (int(part) for part in parts[1:])
+        except ValueError:
+            return False
+        delay = (t3 - t0) - _signed(t2 - t1)
+        if delay < 0 or t3 - t0 > 1_000_000:
+            return False  # Clock glitch, or a reply to a ping from long ago
+        # Both differences are offset +- delay / 2, average them on the wrap
+        forward, backward = (t1 - t0) % WRAP, (t2 - t3) % WRAP
+        offset = (backward + _signed(forward - backward) // 2) % WRAP
+        self._samples.append((delay, offset, t3))
+
+        best_delay, best_offset, _ = min(self._samples)
+        self.delay_us, self.offset_us = best_delay, best_offset
+        return True
+
+    @property
+    def synced(self) -> bool:
+        return len(self._samples) >= self.min_samples
+
+    @property
+    def error_bound_ms(self) -> float | None:
+        """Bound on the offset error: half the best exchange's delay."""
+        return None if self.delay_us is None else self.delay_us / 2000
+
+    def to_device(self, host_ns: int) -> int | None:
+        """Device micros() at host time host_ns, None until synced."""
+        if not self.synced or self.offset_us is None:
+            return None
+        return (host_ns // 1000 + self.offset_us) % WRAP
+
+
+def rig_skew_bound_ms(clocks: list[ClockSync]) -> float | None:
+    """
+    Bound on how far apart two synced devices can execute the same
+    scheduled command: the sum of the two largest offset error bounds.
+    """
+    bounds = sorted(
+        (c.error_bound_ms for c in clocks if c.synced and c.error_bound_ms is not None),
+        reverse=True,
+    )
+    if not bounds:
+        return None
+    return bounds[0] + (bounds[1] if len(bounds) > 1 else 0.0)
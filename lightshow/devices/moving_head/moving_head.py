@@ -1,5 +1,6 @@
 import socket
 import threading
+import time
 import traceback
 from typing import Any, ClassVar, Literal
 
@@ -8,9 +9,23 @@ import requests
 from lightshow.devices.animations.aanimation import RGB, Command
 from lightshow.devices.device import OutputDevice, PacketStatus, PacketType
 from lightshow.devices.devices_types import DeviceTypeName
+from lightshow.devices.moving_head import protocol
+from lightshow.devices.moving_head.clock_sync import ClockSync
 from lightshow.devices.moving_head.moving_head_controller import MovingHeadController
+from lightshow.devices.output_engine import DeviceChannel, output_engine
+from lightshow.devices.packet_queue import CoalescingPacketQueue
 from lightshow.gui.utils import ui_signals
+from lightshow.utils.config import _Settings, global_config
+from lightshow.utils.latency import LatencyStats, latency_stats
 from lightshow.utils.logger import Logger
+from lightshow.utils.tracing import tracer
+
+# Seconds between two clock sync pings
+PING_INTERVAL = 1.0
+
+
+def _encode_message(packet_id: int, message: str) -> bytes:
+    return f"{packet_id};{message}".encode()
 
 
 class MovingHead(OutputDevice):
@@ -21,6 +36,8 @@ class MovingHead(OutputDevice):
         "base_servo_range",
         "top_servo_range",
         "current_anim",
+        "protocol",
+        "clock_sync",
     ]
     EDITABLE_PROPS: ClassVar = [("ip", str)]
 
@@ -30,9 +47,19 @@ class MovingHead(OutputDevice):
 
         self.socket = None
         self.ip = "192.168.1.XX"  # ESP32 IP
+        self.port = 1234
         self.udp_address = f"{self.ip}:1234"
         self.addr = (self.ip, 1234)
         self.packetIndex = 0
+        # UDP frame format, negotiated through /infos on connect
+        self.protocol_version = protocol.TEXT_VERSION
+        self.protocol = "Text (v1)"
+        # Set when sending delta frames, see protocol.DeltaFrames
+        self.delta: protocol.DeltaFrames | None = None
+        # Offset to the device clock, for beats scheduled with at=
+        self.clock = ClockSync()
+        self.clock_sync = "Off"
+        self._sync_thread = None
 
         self.device_name = ""  # Eg "Living Room Moving Head"
 
@@ -47,11 +74,16 @@ class MovingHead(OutputDevice):
         self.top_range = (0, 180)
         self.top_servo_range = f"({self.top_range[0]},{self.top_range[1]})"
 
-        # Packet queue for async processing
-        self._packet_queue = []
-        self._packet_lock = threading.Lock()
+        # Packet queue for async processing, (packet, queued at) pairs
+        self._packet_queue = CoalescingPacketQueue()
+        # Queue / capture stamps of the packet being handled, until its first send
+        self._sending: tuple[int, int | None] | None = None
+        self._dropped_seen = 0
+        self._drop_warned_at = 0.0
         self._packet_thread = None
         self._packet_thread_running = False
+        # Set instead of the socket and thread when on the shared output engine
+        self._channel: DeviceChannel | None = None
 
         super().__init__()
 
@@ -63,12 +95,8 @@ class MovingHead(OutputDevice):
         """Establish a persistent WebSocket connection."""
         try:
             if self.test_connection():
-                self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                self.socket.settimeout(1)
-                self.addr = (self.ip, 1234)
-                self.packetIndex = 0
-                self.udp_address = f"{self.ip}:1234"
-                self.showed_props_update()
+                self.set_protocol(self._negotiate_protocol())
+                self.open_output()
                 self.logger.info(f"Successfully tested connection to {self.ip}")
             else:
                 raise ConnectionError("Not received resetIndex, ip problem?")
@@ -80,12 +108,85 @@ class MovingHead(OutputDevice):
             )
             self.socket = None
 
+    def _negotiate_protocol(self) -> int:
+        if not global_config.settings[_Settings.BINARY_PROTOCOL]:
+            return protocol.TEXT_VERSION
+        try:
+            infos = requests.get(f"http://{self.ip}:81/infos", timeout=1).json()
+        except (requests.RequestException, ValueError) as e:
+            self.logger.warning(f"No /infos from {self.ip}, using the text format: {e}")
+            return protocol.TEXT_VERSION
+        return protocol.negotiate(infos)
+
+    def set_protocol(self, version: int):
+        self.protocol_version = version
+        self.protocol = (
+            "Binary (v2)" if version == protocol.BINARY_VERSION else "Text (v1)"
+        )
+        self.logger.info(f"Using UDP protocol {self.protocol} with {self.ip}")
+
+    def open_output(self):
+        """
+        Open the UDP output to self.ip and start consuming packets: a socket
+        and packet thread of its own, or a channel on the shared output
+        engine when the Output Engine setting is Asyncio.
+        """
+        self.addr = (self.ip, self.port)
+        self.packetIndex = 0
+        self.udp_address = f"{self.ip}:{self.port}"
+        self.controller.configure_output()
+        self.delta = (
+            protocol.DeltaFrames(global_config.settings[_Settings.KEYFRAME_INTERVAL])
+            if global_config.settings[_Settings.DELTA_FRAMES]
+            else None
+        )
+        self.clock.reset()
+        sync = global_config.settings[_Settings.BEAT_SYNC]
+        self.clock_sync = "Syncing" if sync else "Off"
+        if global_config.settings[_Settings.OUTPUT_ENGINE] == "Asyncio":
+            self.socket = None
+            self._channel = output_engine.register(
+                self.addr, self._packet_queue, self._handle_queued, self._on_datagram
+            )
+            if sync:
+                self._channel.every(PING_INTERVAL, self.send_ping)
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.settimeout(1)
+            self._start_packet_thread()
+            if sync:
+                self._sync_thread = threading.Thread(
+                    target=self._sync_clock,
+                    daemon=True,
+                    name=f"MovingHeadSync-{self.device_name or self.id}",
+                )
+                self._sync_thread.start()
+        self.showed_props_update()
+
+    @property
+    def connected(self) -> bool:
+        return self.socket is not None or self._channel is not None
+
     def disconnect(self):
+        self.close_output()
+        self.test_connection()
+        return super().disconnect()
+
+    def close_output(self):
+        """Stop consuming packets and release the engine channel."""
+        if self._channel:
+            self._channel.close()
+            self._channel = None
         self._packet_thread_running = False
+        self._packet_queue.close()
         if self._packet_thread:
             self._packet_thread.join(timeout=1)
-        self.test_connection()
-        return super().disconnect()
+        if self._sync_thread:
+            self._sync_thread.join(timeout=1.5)
+            self._sync_thread = None
+        self.logger.info(f"Packet queue: {self._packet_queue.stats()}")
+        if self.delta:
+            self.logger.info(f"Delta frames: {self.delta.stats()}")
 
     def scan_for_device(self):
         return self.test_connection()
@@ -95,51 +196,125 @@ class MovingHead(OutputDevice):
         self.test_connection()
         self.connect_socket()
         self.sendCommand(RGB(255, 255, 255))
-        # Start packet processing thread
-        self._start_packet_thread()
         return True
 
     def _start_packet_thread(self):
         """Start the background thread for processing device packets."""
         if not self._packet_thread_running:
             self._packet_thread_running = True
+            self._packet_queue.reopen()
             self._packet_thread = threading.Thread(
-                target=self._process_packets, daemon=True
+                target=self._process_packets,
+                daemon=True,
+                name=f"MovingHead-{self.device_name or self.id}",
             )
             self._packet_thread.start()
 
     def _process_packets(self):
         """Background thread that processes queued packets."""
         while self._packet_thread_running:
-            with self._packet_lock:
-                if self._packet_queue:
-                    packet = self._packet_queue.pop(0)
-                else:
-                    packet = None
-
-            if packet:
-                self.controller.handlePacket(packet)
-            else:
-                threading.Event().wait(0.001)  # Sleep briefly if no packets
+            item = self._packet_queue.get(timeout=0.5)
+            if item is not None:
+                self._handle_queued(*item)
+
+    def _handle_queued(self, packet, queued_ns: int):
+        """Handle one dequeued packet, on the packet thread or the engine loop."""
+        self._sending = (queued_ns, packet.captured_ns)
+        self.controller.handlePacket(packet)
+        self._sending = None
+
+        # At most one warning per second while the network stalls
+        dropped = self._packet_queue.dropped
+        if (
+            dropped != self._dropped_seen
+            and time.monotonic() > self._drop_warned_at + 1
+        ):
+            self._dropped_seen, self._drop_warned_at = dropped, time.monotonic()
+            self.logger.warning(f"Packet queue full, {dropped} events dropped so far")
 
+    def send_ping(self):
+        """Send a clock sync ping, the reply goes to _on_datagram."""
+        data = self.clock.ping()
+        if self._channel:
+            self._channel.send(data)
+        elif self.socket:
+            self.socket.sendto(data, self.addr)
+
+    def _sync_clock(self):
+        """Thread output: ping every PING_INTERVAL and read the replies."""
+        next_ping = 0.0
+        while self._packet_thread_running and self.socket:
+            try:
+                if time.monotonic() >= next_ping:
+                    next_ping = time.monotonic() + PING_INTERVAL
+                    self.send_ping()
+                data = self.socket.recv(256)  # Times out after 1s
+            except TimeoutError:
+                continue
+            except OSError:
+                return  # Socket closed
+            self._on_datagram(data)
+
+    def _on_datagram(self, data: bytes):
+        if not self.clock.on_pong(data) or not self.clock.synced:
+            return
+        clock_sync = f"±{self.clock.error_bound_ms:.1f} ms"
+        if clock_sync != self.clock_sync:
+            self.clock_sync = clock_sync
+            self.showed_props_update()
+
+    def device_time(self, host_ns: int) -> int | None:
+        """The device's micros() at time.monotonic_ns() host_ns, None until synced."""
+        return self.clock.to_device(host_ns)
+
+    @tracer.traced("MovingHead.send_message")
     def send_message(self, message: str):
-        """Send a JSON message over the UDP connection.
+        """Send a text (v1) message over the UDP connection.
 
         If the connection is lost, this function will attempt to reconnect.
         """
-        if not self.socket:
+        self._send(_encode_message, message)
+
+    @tracer.traced("MovingHead.send_frame")
+    def send_frame(self, fields: dict[str, float]):
+        """Send {argument key: value} as a binary (v2) frame."""
+        self._send(protocol.encode_binary, fields)
+
+    def send_fields(self, fields: dict[str, float]):
+        """Send {argument key: value} in the negotiated format, as a delta if enabled."""
+        if self.delta is not None:
+            fields = self.delta.diff(fields)
+            if fields is None:
+                return  # Nothing changed since the last frame
+        if self.protocol_version == protocol.BINARY_VERSION:
+            self.send_frame(fields)
+        else:
+            self._send(protocol.encode_text, fields)
+
+    def _send(self, encode, payload):
+        if not self.connected:
             try:
                 self.connect_socket()
             except ConnectionError:
                 return
         try:
-            if self.socket:
+            if self.connected:
                 self.packetIndex += 1
-                self.socket.sendto(
-                    (f"{self.packetIndex};{message}").encode(), self.addr
-                )
+                data = encode(self.packetIndex, payload)
+                if self._channel:
+                    self._channel.send(data)
+                elif self.socket:
+                    self.socket.sendto(data, self.addr)
+                if self._sending:
+                    queued_ns, captured_ns = self._sending
+                    self._sending = None
+                    now = time.monotonic_ns()
+                    latency_stats.record(LatencyStats.QUEUE_TO_SEND, queued_ns, now)
+                    latency_stats.record(LatencyStats.CAPTURE_TO_SEND, captured_ns, now)
 
         except ConnectionError as e:
+            if self.delta:
+                self.delta.invalidate()  # The device may have missed state
             self.logger.error(f"Error sending message : {e}")
             ui_signals.show_error.emit(
                 "Connection Error",
@@ -148,14 +323,23 @@ class MovingHead(OutputDevice):
 
     def sendCommand(self, command: Command):
         # print(command.toMHCommand())
+        if self.protocol_version == protocol.BINARY_VERSION or self.delta:
+            self.send_fields(command.toMHFields())
+            return
         self.send_message(command.toUDP_MH_Command())
 
     def sendCommands(self, commands: list[Command]):
+        if self.protocol_version == protocol.BINARY_VERSION or self.delta:
+            fields = {}
+            for command in commands:
+                fields.update(command.toMHFields())
+            self.send_fields(fields)
+            return
         commands_dicts = [command.toUDP_MH_Command() for command in commands]
         self.send_message(";".join(commands_dicts))
 
     def on(self, packet):
-        if not self.socket:
+        if not self.connected:
             return
 
         if packet.packet_type == PacketType.MANUAL_MODE:
@@ -166,8 +350,11 @@ class MovingHead(OutputDevice):
             return
 
         # Queue the packet for async processing instead of blocking
-        with self._packet_lock:
-            self._packet_queue.append(packet)
+        now = time.monotonic_ns()
+        latency_stats.record(LatencyStats.DETECTOR_TO_DEVICE, packet.created_ns, now)
+        self._packet_queue.put(packet, now)
+        if self._channel:
+            self._channel.wake()
 
         return super().on(packet)
 
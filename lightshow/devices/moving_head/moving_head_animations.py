@@ -37,6 +37,9 @@ class ServoCommand(Command):
     def toUDP_MH_Command(self) -> str:
         return ("tS" if self.servo == "top" else "bS") + f"={self.angle}"
 
+    def toMHFields(self) -> dict[str, float]:
+        return {"tS" if self.servo == "top" else "bS": self.angle}
+
 
 class BaseServoCommand(ServoCommand):
     def __init__(self, angle: int):
@@ -48,6 +51,42 @@ class TopServoCommand(ServoCommand):
         super().__init__("top", angle)
 
 
+class MoveCommand(Command):
+    """Servo angles sent with it are reached over duration ms instead of at once."""
+
+    duration: int  # Milliseconds
+
+    def __init__(self, duration: int):
+        self.duration = duration
+
+    def toMHCommand(self):
+        return {"move": int(self.duration)}
+
+    def toUDP_MH_Command(self) -> str:
+        return f"mv={int(self.duration)}"
+
+    def toMHFields(self) -> dict[str, float]:
+        return {"mv": self.duration}
+
+
+class ScheduleCommand(Command):
+    """The frame sent with it runs when the device's micros() reaches at."""
+
+    at: int  # Device microseconds, see clock_sync.ClockSync.to_device
+
+    def __init__(self, at: int):
+        self.at = at
+
+    def toMHCommand(self):
+        return {"at": int(self.at)}
+
+    def toUDP_MH_Command(self) -> str:
+        return f"at={int(self.at)}"
+
+    def toMHFields(self) -> dict[str, float]:
+        return {"at": self.at}
+
+
 class MHAnimationFrame(TypedDict):
     duration: int  # Used to determine cooldown to add after
     rgb: RGB | FlickerCommand | FadeCommand
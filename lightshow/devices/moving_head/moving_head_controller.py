@@ -7,7 +7,8 @@ from typing import TypeGuard
 import numpy as np
 
 from lightshow.audio.data import AudioData
-from lightshow.devices.animations.aanimation import RGB, FlickerCommand
+from lightshow.audio.detectors.beat_tracker import BeatIntervalTracker
+from lightshow.devices.animations.aanimation import RGB, FadeCommand, FlickerCommand
 from lightshow.devices.device import PacketData, PacketStatus, PacketType
 from lightshow.devices.moving_head.animations import (
     BernoulliLemniscateAnimation,
@@ -21,6 +22,8 @@ from lightshow.devices.moving_head.moving_head_animations import (
     QUART_OUT,
     AMHAnimation,
     MHAnimationFrame,
+    MoveCommand,
+    ScheduleCommand,
 )
 from lightshow.devices.moving_head.moving_head_colors import (
     RAINBOW_KICK_COLORS,
@@ -31,6 +34,7 @@ from lightshow.devices.moving_head.moving_head_colors import (
 )
 from lightshow.utils.config import _Settings, global_config
 from lightshow.utils.logger import Logger
+from lightshow.utils.tracing import tracer
 
 if typing.TYPE_CHECKING:
     from lightshow.devices.moving_head.moving_head import MovingHead
@@ -72,7 +76,7 @@ class MovingHeadController:
 
         self.beats_since_anim_change = 0
         self.disable_anim_change = False
-        self.beats_time = deque(maxlen=30)  # last 30 beats to calculate average for BPM
+        self.beats_time = BeatIntervalTracker(30)  # last 30 beats for the BPM
         self.last_fps_log_time = 0  # Throttle FPS logging
         self.current_fps = 0  # Store current FPS for display
 
@@ -81,6 +85,9 @@ class MovingHeadController:
         self.next_frame_time = 0
         self.avg_fps = deque(maxlen=self.max_fps * 2)
 
+        # Device interpolation: sparse keyframes the firmware moves between
+        self.configure_output()
+
         self.blackout = False
 
         self.latest_audio_data = AudioData(np.zeros(20000))
@@ -88,6 +95,30 @@ class MovingHeadController:
         self.init_lists()
         self.init_state()
 
+    def configure_output(self):
+        self.interpolate = global_config.settings[_Settings.DEVICE_INTERPOLATION]
+        self.keyframe_ms = global_config.settings[_Settings.INTERPOLATION_INTERVAL]
+        self.next_keyframe_time = 0
+        self.last_color: RGB | None = None  # Color the device ends up on
+        # Synchronized beats: beat frames run margin ns after the beat
+        self.beat_sync = global_config.settings[_Settings.BEAT_SYNC]
+        self.beat_sync_margin = (
+            global_config.settings[_Settings.BEAT_SYNC_MARGIN_MS] * 1e6
+        )
+
+    def scheduleFor(self, packet: PacketData) -> ScheduleCommand | None:
+        """
+        When the beat of packet should run on the device, None to run it on
+        arrival (sync off, or the device clock not synced yet). Every head
+        gets the same packet, so the same host instant: predicted beats at
+        their beat time, reactive ones at detection, plus the margin.
+        """
+        if not self.beat_sync:
+            return None
+        beat_ns = max(packet.timestamp or 0, packet.created_ns)
+        at = self.device.device_time(int(beat_ns + self.beat_sync_margin))
+        return None if at is None else ScheduleCommand(at)
+
     def init_lists(self):
         self.anim_list: list[AMHAnimation] = [
             TRIANGLE_ANIMATION,
@@ -139,11 +170,7 @@ class MovingHeadController:
                 self.current_anim.setTransformer(toFadeBlack)"""
 
     def calcBPM(self):
-        # Convert nanoseconds to seconds by dividing by 1e9
-        time_diffs = np.diff(self.beats_time) / 1e9
-        if len(time_diffs) == 0:
-            return 0  # Avoid division by zero if there are no differences
-        return 60 / np.mean(time_diffs)  # Convert to BPM
+        return self.beats_time.bpm()
 
     def randomAnimation(self):
         self.current_anim = random.choice(
@@ -161,6 +188,7 @@ class MovingHeadController:
         self.last_tick = time.time_ns() / 1e9
         self.updateFromFrame(frm)
 
+    @tracer.traced("MovingHeadController.handlePacket")
     def handlePacket(self, packet: PacketData):
 
         if packet.packet_type == PacketType.FLICKER:
@@ -195,8 +223,19 @@ class MovingHeadController:
             self.handleBeat(packet)
         # Change animation after 14 beats
 
-    def updateFromFrame(self, frame: MHAnimationFrame):
-        if self.next_frame_time > time.time_ns() or frame["duration"] == -1:
+    def updateFromFrame(
+        self,
+        frame: MHAnimationFrame,
+        immediate: bool = False,
+        schedule: ScheduleCommand | None = None,
+    ):
+        if self.interpolate:
+            self.sendKeyframe(frame, immediate, schedule)
+            return
+        if frame["duration"] == -1:
+            return
+        # Scheduled (beat) frames skip the rate limit, dropping one desyncs it
+        if schedule is None and self.next_frame_time > time.time_ns():
             return
         self.next_frame_time = time.time_ns() + self.frame_time
         self.avg_fps.append(time.time_ns())
@@ -206,7 +245,47 @@ class MovingHeadController:
         self.device.sendCommand(frame["baseServo"])
         self.device.sendCommand(frame["topServo"])
         """
-        self.device.sendCommands([color, frame["baseServo"], frame["topServo"]])
+        commands = [color, frame["baseServo"], frame["topServo"]]
+        if schedule is not None:
+            commands.append(schedule)
+        self.device.sendCommands(commands)
+
+    def sendKeyframe(
+        self,
+        frame: MHAnimationFrame,
+        immediate: bool,
+        schedule: ScheduleCommand | None = None,
+    ):
+        """
+        Interpolation mode: every keyframe_ms, send the current pose and
+        color as targets the device moves / fades to over the next
+        keyframe_ms, so motion trails the animation by one keyframe.
+        Immediate frames (beats) snap right away.
+        """
+        now = time.time_ns()
+        if frame["duration"] == -1:
+            return
+        if not immediate and now < self.next_keyframe_time:
+            return
+        self.next_keyframe_time = now + self.keyframe_ms * 1e6
+        self.avg_fps.append(now)
+
+        color = frame["rgb"]
+        commands = [frame["baseServo"], frame["topServo"]]
+        if not immediate:
+            commands.append(MoveCommand(self.keyframe_ms))
+            if isinstance(color, RGB) and self.last_color is not None:
+                color = FadeCommand(self.last_color, color, self.keyframe_ms)
+        if isinstance(color, FadeCommand):
+            self.last_color = color.to
+        elif isinstance(color, RGB):
+            self.last_color = color
+        else:
+            self.last_color = None  # Flicker, fade from wherever it ends
+        commands.append(color)
+        if schedule is not None:
+            commands.append(schedule)
+        self.device.sendCommands(commands)
 
     def calcAverageFPS(self):
         if len(self.avg_fps) < 2:
@@ -249,9 +328,7 @@ class MovingHeadController:
         if packet.packet_type == PacketType.BREAK:
             if packet.packet_status == PacketStatus.OFF:
                 self.breaking = False
-                self.beats_time.extend(
-                    [x + current_time - self.breaking_since for x in self.beats_time]
-                )
+                self.beats_time.shift(current_time - self.breaking_since)
                 added_time_t = min((current_time - self.breaking_since) / 1e9 / 15, 1.0)
                 added_time = (
                     self.BREAK_ADDED_TIME_CURVE(added_time_t)
@@ -280,10 +357,13 @@ class MovingHeadController:
             fps_value = self.calcAverageFPS()
             self.current_fps = fps_value
             self.last_fps_log_time = current_time
-            UIManager.get().stats_panel.update_fps(fps_value)
+            try:
+                UIManager.get().stats_panel.update_fps(fps_value)
+            except RuntimeError:
+                pass  # Headless, e.g. the output benchmark
 
         if packet.packet_status == PacketStatus.ON:
-            self.beats_time.append(time.time_ns())
+            self.beats_time.on_beat()
             if time.time_ns() < self.next_beat_cool:
                 # Skip beat
                 return False
@@ -293,6 +373,8 @@ class MovingHeadController:
                 self.latest_audio_data, False, time.time_ns() / 1e9 - self.last_tick
             )
             self.last_tick = time.time_ns() / 1e9
-            self.updateFromFrame(frame)
+            self.updateFromFrame(
+                frame, immediate=True, schedule=self.scheduleFor(packet)
+            )
             # bpm = self.calcBPM()
             # print(f"bpm: {bpm}")
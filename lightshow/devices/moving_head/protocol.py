@@ -0,0 +1,203 @@
+"""
+Moving head UDP frame formats, see specs/mh_head_protocole.md.
+
+Version 1 is the text format ("17;r=255;g=0;b=0;bS=90;tS=30"), version 2
+a struct-packed binary frame:
+
+    u8  version (2)
+    u32 packet ID
+    u16 field mask, bit i set when field i follows
+    the present fields, in bit order
+
+All little-endian. Commands describe themselves as {text key: value}
+(Command.toMHFields), the same keys as the text format, so both encoders
+take the same input.
+"""
+
+import struct
+from typing import ClassVar
+
+TEXT_VERSION = 1
+BINARY_VERSION = 2
+SUPPORTED_VERSIONS = (TEXT_VERSION, BINARY_VERSION)
+
+HEADER = struct.Struct("<BIH")
+
+# Bit i of the mask is FIELDS[i], a group of (text key, struct format) values
+FIELDS: tuple[tuple[tuple[str, str], ...], ...] = (
+    (("r", "B"), ("g", "B"), ("b", "B")),  # LED color
+    (("bS", "B"),),  # Base servo angle
+    (("tS", "B"),),  # Top servo angle
+    (("fl", "H"),),  # Flicker duration, ms
+    (("fa", "H"), ("fr", "B"), ("fg", "B"), ("fb", "B")),  # Fade, ms + from color
+    (("mv", "H"),),  # Servo move duration, ms
+    (("at", "I"),),  # Execute at this device micros()
+)
+
+_LIMITS = {"B": 0xFF, "H": 0xFFFF, "I": 0xFFFFFFFF}
+
+
+def _compile(mask: int) -> tuple[struct.Struct, tuple[str, ...], tuple[int, ...]]:
+    values = [
+        value
+        for bit, group in enumerate(FIELDS)
+        if mask & (1 << bit)
+        for value in group
+    ]
+    frame = struct.Struct(HEADER.format + "".join(fmt for _, fmt in values))
+    return (
+        frame,
+        tuple(key for key, _ in values),
+        tuple(_LIMITS[fmt] for _, fmt in values),
+    )
+
+
+# Frame structs by mask, compiled once
+_FRAMES = {mask: _compile(mask) for mask in range(1 << len(FIELDS))}
+_BY_KEYS: dict[
+    tuple[str, ...], tuple[int, struct.Struct, tuple[str, ...], tuple[int, ...]]
+] = {}
+_GROUPS = tuple(tuple(key for key, _ in group) for group in FIELDS)
+_KEY_BITS = {key: 1 << bit for bit, group in enumerate(FIELDS) for key, _ in group}
+
+
+def field_mask(fields: dict[str, float]) -> int:
+    mask = 0
+    for key in fields:
+        mask |= _KEY_BITS[key]
+    return mask
+
+
+def encode_binary(packet_id: int, fields: dict[str, float]) -> bytes:
+    """
+    Version 2 frame of fields. Values are rounded and clamped to their
+    field's range; a group missing a key (a fade without its from color)
+    sends 0 for it.
+    """
+    # Commands always produce the same keys in the same order, cache the
+    # frame by key order and only fall back to clamping on bad values
+    keys = tuple(fields)
+    entry = _BY_KEYS.get(keys)
+    if entry is None:
+        mask = field_mask(fields)
+        entry = _BY_KEYS[keys] = (mask, *_FRAMES[mask])
+    mask, frame, order, limits = entry
+    packet_id &= 0xFFFFFFFF
+    try:
+        return frame.pack(
+            BINARY_VERSION, packet_id, mask, *[round(fields[key]) for key in order]
+        )
+    except struct.error, KeyError:
+        values = [
+            min(max(round(fields.get(key, 0)), 0), limit)
+            for key, limit in zip(order, limits, strict=True)
+        ]
+        return frame.pack(BINARY_VERSION, packet_id, mask, *values)
+
+
+def encode_text(packet_id: int, fields: dict[str, float]) -> bytes:
+    """Version 1 frame of fields."""
+    args = ";".join(f"{key}={round(value)}" for key, value in fields.items())
+    return f"{packet_id};{args}".encode()
+
+
+def decode_binary(data: bytes) -> tuple[int, dict[str, int]]:
+    """(packet ID, fields) of a version 2 frame, the device side of encode_binary."""
+    version, packet_id, mask = HEADER.unpack_from(data)
+    if version != BINARY_VERSION:
+        raise ValueError(f"Not a version {BINARY_VERSION} frame: {version}")
+    frame, keys, _ = _FRAMES[mask]
+    values = frame.unpack(data)[3:]
+    return packet_id, dict(zip(keys, values, strict=True))
+
+
+def negotiate(infos: dict) -> int:
+    """Highest version both sides support, from the device's /infos reply."""
+    offered = infos.get("protocols") or [TEXT_VERSION]
+    common = set(offered) & set(SUPPORTED_VERSIONS)
+    return max(common) if common else TEXT_VERSION
+
+
+class DeltaFrames:
+    """
+    Per-device delta encoding of frames, for either format.
+
+    Remembers the last state sent and reduces each frame to the field groups
+    that changed (a whole group, v2 frames can't carry half a color). Every
+    keyframe_interval frames, and after invalidate(), the full frame goes
+    out so a device that lost packets resyncs. Unchanged frames are
+    suppressed, they still count towards the next keyframe.
+
+    Transition fields ride along with the state they lead to: a fade with
+    a changed color, a servo move with a changed angle. Frames carrying a
+    flicker are sent whole and force a keyframe next, the device state
+    after it isn't known. Scheduled frames (with an at field) are sent whole
+    as a keyframe: a partial frame would run its other fields at once.
+    """
+
+    STATE_KEYS = frozenset(("r", "g", "b", "bS", "tS"))
+    # Transition fields, sent when one of the state keys they lead to is
+    TRANSITIONS: ClassVar[dict[str, frozenset[str]]] = {
+        "fa": frozenset(("r", "g", "b")),
+        "fr": frozenset(("r", "g", "b")),
+        "fg": frozenset(("r", "g", "b")),
+        "fb": frozenset(("r", "g", "b")),
+        "mv": frozenset(("bS", "tS")),
+    }
+    KNOWN_KEYS = STATE_KEYS | TRANSITIONS.keys() | {"at"}
+
+    def __init__(self, keyframe_interval: int = 30):
+        self.keyframe_interval = keyframe_interval
+        self._last: dict[str, int] = {}
+        self._since_keyframe = 0
+
+        self.frames = 0
+        self.keyframes = 0
+        self.suppressed = 0
+
+    def invalidate(self) -> None:
+        """Send the next frame whole."""
+        self._last.clear()
+
+    def diff(self, fields: dict[str, float]) -> dict[str, float] | None:
+        """The part of fields to send, None when nothing changed."""
+        self.frames += 1
+        if not self.KNOWN_KEYS.issuperset(fields):
+            self.invalidate()
+            return fields
+
+        rounded = {
+            key: round(value) for key, value in fields.items() if key in self.STATE_KEYS
+        }
+        self._since_keyframe += 1
+        if (
+            not self._last
+            or self._since_keyframe >= self.keyframe_interval
+            or "at" in fields
+        ):
+            self._last = rounded
+            self._since_keyframe = 0
+            self.keyframes += 1
+            return fields
+
+        changed = {}
+        for group in _GROUPS:
+            if any(
+                key in rounded and rounded[key] != self._last.get(key) for key in group
+            ):
+                changed.update((key, fields[key]) for key in group if key in fields)
+        if not changed:
+            self.suppressed += 1
+            return None
+        for key, targets in self.TRANSITIONS.items():
+            if key in fields and not targets.isdisjoint(changed):
+                changed[key] = fields[key]
+        self._last.update(rounded)
+        return changed
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "frames": self.frames,
+            "keyframes": self.keyframes,
+            "suppressed": self.suppressed,
+        }
@@ -0,0 +1,215 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+
+from lightshow.devices.device import PacketData
+from lightshow.devices.packet_queue import CoalescingPacketQueue
+from lightshow.utils.logger import Logger
+
+logger = Logger.for_class("UDPOutputEngine")
+
+Address = tuple[str, int]
+
+
+class _EngineProtocol(asyncio.DatagramProtocol):
+    def __init__(self, engine: UDPOutputEngine):
+        self.engine = engine
+
+    def datagram_received(self, data: bytes, addr: Address) -> None:
+        channel = self.engine.channels.get(addr[:2])
+        if channel and channel.on_datagram:
+            channel.on_datagram(data)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.warning(f"UDP error: {exc}")
+
+
+class DeviceChannel:
+    """
+    One device on the engine: its address, packet queue and the task
+    draining that queue on the engine loop.
+    """
+
+    def __init__(
+        self,
+        engine: UDPOutputEngine,
+        addr: Address,
+        queue: CoalescingPacketQueue,
+        handler: Callable[[PacketData, int], None],
+        on_datagram: Callable[[bytes], None] | None = None,
+    ):
+        self.engine = engine
+        self.addr = addr
+        self.queue = queue
+        self.handler = handler
+        self.on_datagram = on_datagram
+        self.closed = False
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._timers: list[Future] = []
+
+    async def _run(self) -> None:
+        self._wake = asyncio.Event()
+        while not self.closed:
+            # get(0) never blocks, the loop only sleeps on the wake event
+            while (item := self.queue.get(timeout=0)) is not None:
+                try:
+                    self.handler(*item)
+                except Exception as e:  # noqa
+                    logger.error(f"Packet handler of {self.addr} failed: {e}")
+                # One packet at a time per device, the others get their turn
+                await asyncio.sleep(0)
+            await self._wake.wait()
+            self._wake.clear()
+
+    def wake(self) -> None:
+        """Signal queued packets, from any thread."""
+        if self._wake is not None and not self._wake.is_set():
+            self.engine.call_soon(self._wake.set)
+
+    def send(self, data: bytes) -> None:
+        self.engine.sendto(data, self.addr)
+
+    def every(self, interval: float, callback: Callable[[], None]) -> None:
+        """Call callback on the loop every interval seconds until closed."""
+        self._timers.append(self.engine.run(self._every(interval, callback)))
+
+    async def _every(self, interval: float, callback: Callable[[], None]) -> None:
+        while not self.closed:
+            try:
+                callback()
+            except Exception as e:  # noqa
+                logger.error(f"Timer of {self.addr} failed: {e}")
+            await asyncio.sleep(interval)
+
+    def close(self) -> None:
+        self.engine.unregister(self)
+
+
+class UDPOutputEngine:
+    """
+    Shared output for every UDP device: one asyncio loop on one thread and
+    one non-blocking UDP socket.
+
+    Devices register a DeviceChannel with their packet queue and handler;
+    each channel is a task on the loop, woken when its queue gets a packet.
+    Adding a device adds a task, not a thread or a socket, so thread count
+    and context switches stay flat as the rig grows. Handlers run on the
+    loop thread and must not block.
+    """
+
+    def __init__(self):
+        self.channels: dict[Address, DeviceChannel] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._transport: asyncio.DatagramTransport | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            self._thread = threading.Thread(
+                target=loop.run_forever, daemon=True, name="UDPOutputEngine"
+            )
+            self._thread.start()
+            transport, _ = asyncio.run_coroutine_threadsafe(
+                loop.create_datagram_endpoint(
+                    lambda: _EngineProtocol(self), local_addr=("0.0.0.0", 0)
+                ),
+                loop,
+            ).result(timeout=5)
+            self._transport = transport
+            logger.info("Output engine started")
+
+    def stop(self) -> None:
+        with self._lock:
+            if not self.running or self._loop is None:
+                return
+            for channel in list(self.channels.values()):
+                channel.closed = True
+                channel.queue.close()
+            self.channels.clear()
+            loop = self._loop
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=1)
+            loop.call_soon_threadsafe(loop.stop)
+            if self._thread:
+                self._thread.join(timeout=1.0)
+            loop.close()
+            self._loop = self._thread = self._transport = None
+            logger.info("Output engine stopped")
+
+    async def _shutdown(self) -> None:
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._transport:
+            self._transport.close()
+
+    def in_loop(self) -> bool:
+        return self._thread is not None and threading.get_ident() == self._thread.ident
+
+    def call_soon(self, callback: Callable, *args) -> None:
+        """Run callback on the loop thread, right away when already there."""
+        if self._loop is None:
+            return
+        if self.in_loop():
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+
+    def run(self, coroutine) -> Future:
+        """Schedule coroutine on the loop from any thread."""
+        assert self._loop is not None
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+    def sendto(self, data: bytes, addr: Address) -> None:
+        if self._transport is not None:
+            self.call_soon(self._transport.sendto, data, addr)
+
+    def register(
+        self,
+        addr: Address,
+        queue: CoalescingPacketQueue,
+        handler: Callable[[PacketData, int], None],
+        on_datagram: Callable[[bytes], None] | None = None,
+    ) -> DeviceChannel:
+        """Start draining queue into handler on the loop, starting the engine."""
+        self.start()
+        assert self._loop is not None
+        if addr in self.channels:
+            self.channels[addr].close()
+        channel = DeviceChannel(self, addr, queue, handler, on_datagram)
+        self.channels[addr] = channel
+        queue.reopen()
+        channel._task = asyncio.run_coroutine_threadsafe(
+            self._spawn(channel), self._loop
+        ).result(timeout=5)
+        return channel
+
+    @staticmethod
+    async def _spawn(channel: DeviceChannel) -> asyncio.Task:
+        task = asyncio.create_task(channel._run())
+        await asyncio.sleep(0)  # Let it create its wake event
+        return task
+
+    def unregister(self, channel: DeviceChannel) -> None:
+        channel.closed = True
+        channel.queue.close()
+        if self.channels.get(channel.addr) is channel:
+            del self.channels[channel.addr]
+        if channel._task is not None:
+            self.call_soon(channel._task.cancel)
+        for timer in channel._timers:
+            timer.cancel()
+
+
+output_engine = UDPOutputEngine()
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import deque
+
+from lightshow.devices.device import PacketData, PacketType
+
+# (packet, time.monotonic_ns() when queued)
+QueuedPacket = tuple[PacketData, int]
+
+
+class CoalescingPacketQueue:
+    """
+    Blocking, bounded packet queue of one output device.
+
+    Three lanes, drained in this order:
+      - priority: beats, breaks, drops, flickers, music / pause changes. Never
+        dropped, they change what the device does next.
+      - bounded: every other event (snare, hi-hat...). When full, the oldest
+        one is dropped and counted.
+      - TICK: a single slot, the newest tick replaces a pending one. Ticks
+        carry the full spectrum and only the latest matters.
+
+    A stalled network then holds at most `maxlen` events and one tick, and
+    an idle consumer sleeps on a condition instead of polling.
+    """
+
+    PRIORITY_TYPES = frozenset(
+        (
+            PacketType.BEAT,
+            PacketType.BREAK,
+            PacketType.DROP,
+            PacketType.FLICKER,
+            PacketType.NEW_MUSIC,
+            PacketType.PAUSE,
+        )
+    )
+
+    def __init__(self, maxlen: int = 64):
+        self._cond = threading.Condition()
+        self._priority: deque[QueuedPacket] = deque()
+        self._events: deque[QueuedPacket] = deque(maxlen=maxlen)
+        self._tick: QueuedPacket | None = None
+        self._closed = False
+
+        self.enqueued = 0
+        self.coalesced = 0  # Ticks replaced by a newer one before being sent
+        self.dropped = 0  # Events pushed out of the full bounded lane
+
+    def __len__(self) -> int:
+        return len(self._priority) + len(self._events) + (self._tick is not None)
+
+    def put(self, packet: PacketData, queued_ns: int | None = None) -> None:
+        item = (packet, time.monotonic_ns() if queued_ns is None else queued_ns)
+        with self._cond:
+            self.enqueued += 1
+            if packet.packet_type == PacketType.TICK:
+                if self._tick is not None:
+                    self.coalesced += 1
+                self._tick = item
+            elif packet.packet_type in self.PRIORITY_TYPES:
+                self._priority.append(item)
+            else:
+                if len(self._events) == self._events.maxlen:
+                    self.dropped += 1
+                self._events.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: float | None = None) -> QueuedPacket | None:
+        """Next packet, waiting up to timeout. None on timeout or once closed."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                if self._priority:
+                    return self._priority.popleft()
+                if self._events:
+                    return self._events.popleft()
+                if self._tick is not None:
+                    item, self._tick = self._tick, None
+                    return item
+                if not self._cond.wait(timeout):
+                    return None
+
+    def clear(self) -> None:
+        with self._cond:
+            self._priority.clear()
+            self._events.clear()
+            self._tick = None
+
+    def close(self) -> None:
+        """Wake up and release the consumer, pending packets are discarded."""
+        with self._cond:
+            self._closed = True
+            self.clear()
+            self._cond.notify_all()
+
+    def reopen(self) -> None:
+        with self._cond:
+            self._closed = False
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "pending": len(self),
+        }
@@ -19,6 +19,7 @@ from lightshow.audio.audio_types import AudioDevice
 from lightshow.devices.device import Device
 from lightshow.devices.launchpad.launchpad import LaunchpadX
 from lightshow.devices.moving_head.moving_head import MovingHead
+from lightshow.devices.output_engine import output_engine
 from lightshow.gui.dialogs.about_dialog import AboutDialog
 from lightshow.gui.dialogs.settings_dialog import SettingsDialog
 from lightshow.gui.panels import AudioPanel, DeviceDetailsPanel, DevicesPanel
@@ -28,6 +29,8 @@ from lightshow.gui.utils.ui_signals import ui_signals
 from lightshow.utils import global_config
 from lightshow.utils.config import SETTINGS_CATEGORIES, _Settings, live_devices
 from lightshow.utils.logger import Logger
+from lightshow.utils.profiler import profiler
+from lightshow.utils.tracing import tracer
 
 
 class UIManager(QMainWindow):
@@ -43,6 +46,9 @@ class UIManager(QMainWindow):
         self.audio_handler = audio_handler
         self.device_types: list[type[Device]] = [MovingHead, LaunchpadX]
         self.ui_signals = ui_signals
+        tracer.set_enabled(global_config.settings[_Settings.TRACING])
+        if global_config.settings[_Settings.PROFILING]:
+            profiler.start(global_config.settings[_Settings.PROFILING_RATE])
 
         # Initialize panels
         self.audio_panel = AudioPanel(audio_listener, audio_handler)
@@ -216,6 +222,9 @@ class UIManager(QMainWindow):
         settings_action = QAction("Settings", self)
         settings_action.triggered.connect(self._show_settings_dialog)
         edit_menu.addAction(settings_action)
+        dump_trace_action = QAction("Dump Trace", self)
+        dump_trace_action.triggered.connect(self._dump_trace)
+        edit_menu.addAction(dump_trace_action)
 
         help_menu = menu_bar.addMenu("Help")
         assert help_menu is not None
@@ -230,6 +239,36 @@ class UIManager(QMainWindow):
     def _show_settings_dialog(self):
         self.settings_dialog.exec()
 
+    def _stop_profiler(self):
+        try:
+            path = profiler.stop(global_config.config_folder)
+        except OSError as e:
+            self.logger.error(f"Failed to write the profile: {e}")
+            self.ui_signals.show_error.emit(
+                "Profiling", f"Failed to write the profile: {e}"
+            )
+            return
+        if path is not None:
+            self._show_info_dialog("Profiling", f"Profile written to {path}")
+
+    def _dump_trace(self):
+        if not len(tracer):
+            self._show_info_dialog(
+                "Dump Trace",
+                "Nothing recorded yet, enable Record Trace in the performance settings.",
+            )
+            return
+        try:
+            path = tracer.dump(global_config.config_folder)
+        except OSError as e:
+            self.logger.error(f"Failed to dump the trace: {e}")
+            self.ui_signals.show_error.emit(
+                "Dump Trace", f"Failed to write the trace: {e}"
+            )
+            return
+        self.logger.info(f"Trace of {len(tracer)} spans written to {path}")
+        self._show_info_dialog("Dump Trace", f"Trace written to {path}")
+
     def _apply_settings(self, settings: dict[str, Any]) -> None:
         for sid, value in settings.items():
             if sid == _Settings.SHOW_SPECTRUM.id:
@@ -238,6 +277,26 @@ class UIManager(QMainWindow):
                 else:
                     self.audio_panel.spectrumWidget.hide()
 
+            elif sid == _Settings.PROFILING.id:
+                if value:
+                    profiler.start(
+                        settings.get(
+                            _Settings.PROFILING_RATE.id,
+                            global_config.settings[_Settings.PROFILING_RATE],
+                        )
+                    )
+                else:
+                    self._stop_profiler()
+
+            elif sid == _Settings.PROFILING_RATE.id:
+                profiler.rate = value
+
+            elif sid == _Settings.TRACING.id:
+                tracer.set_enabled(value)
+
+            elif sid == _Settings.BEAT_ALGORITHM.id:
+                self.listener.set_beat_algorithm(value)
+
             elif sid == _Settings.SHOW_BEAT_DETECTION.id:
                 w = self.audio_panel.kick_visualizer
                 if isinstance(w, QWidget):
@@ -306,7 +365,10 @@ class UIManager(QMainWindow):
                     del live_devices[device_id]
 
         threading.Thread(
-            target=connection_finished, args=[live_devices, device_id], daemon=True
+            target=connection_finished,
+            args=[live_devices, device_id],
+            daemon=True,
+            name=f"Connect-{device_id}",
         ).start()
 
     def _on_connection_finished(self, device_id):
@@ -376,10 +438,12 @@ class UIManager(QMainWindow):
         process_log_queue()
 
         # Process queued audio samples (from audio callback thread)
+        # unless the capture drains them on its own DSP worker thread
         if (
             self.audio_panel.is_streaming
             and hasattr(self.audio_handler, "audio_capture")
             and self.audio_handler.audio_capture
+            and not self.audio_handler.audio_capture.dsp_thread_enabled
         ):
             try:
                 self.audio_handler.audio_capture.process_queued_samples()
@@ -407,6 +471,12 @@ class UIManager(QMainWindow):
         if self.audio_panel.is_streaming:
             self._stop_stream_callback()
         self.audio_handler.close()
+        output_engine.stop()
+        if profiler.running:
+            try:
+                profiler.stop(global_config.config_folder)
+            except OSError as e:
+                self.logger.error(f"Failed to write the profile: {e}")
         global_config.save()
 
     def closeEvent(self, a0):
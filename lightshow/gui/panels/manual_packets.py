@@ -24,6 +24,8 @@ class ManualPacketsSenderPanel(BasePanel):
         super().__init__()
         self.buttons = [
             ("Send Beat", PacketData(PacketType.BEAT, PacketStatus.ON)),
+            ("Send Snare", PacketData(PacketType.SNARE, PacketStatus.ON)),
+            ("Send Hi-hat", PacketData(PacketType.HIHAT, PacketStatus.ON)),
             ("Send Break On", PacketData(PacketType.BREAK, PacketStatus.ON)),
             ("Send Break Off", PacketData(PacketType.BREAK, PacketStatus.OFF)),
             ("Send Tick", PacketData(PacketType.TICK, PacketStatus.ON)),
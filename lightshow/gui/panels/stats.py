@@ -1,6 +1,15 @@
-from PyQt6.QtWidgets import QHBoxLayout, QLabel, QVBoxLayout
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QGridLayout, QHBoxLayout, QLabel, QVBoxLayout
 
+from lightshow.devices.moving_head.clock_sync import rig_skew_bound_ms
+from lightshow.devices.moving_head.moving_head import MovingHead
 from lightshow.gui.panels.base_panel import BasePanel
+from lightshow.utils import live_devices
+from lightshow.utils.latency import latency_stats
+
+
+def _ms(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
 
 
 class StatsPanel(BasePanel):
@@ -10,12 +19,51 @@ class StatsPanel(BasePanel):
         self,
     ):
         super().__init__()
+        self.latency_labels: dict[str, QLabel] = {}
 
     def create_qt_ui(self, layout: QVBoxLayout):
         main_layout = QHBoxLayout()
         self.fps_viewer = QLabel("FPS: Unknown")
         main_layout.addWidget(self.fps_viewer)
+        self.skew_viewer = QLabel("Beat skew: -")
+        self.skew_viewer.setToolTip(
+            "Worst case time between two synced moving heads running the same beat"
+        )
+        main_layout.addWidget(self.skew_viewer)
         layout.addLayout(main_layout)
 
+        # Per-stage latency, p50 / p95 / p99 in ms
+        latency_grid = QGridLayout()
+        for column, stage in enumerate(latency_stats.STAGES):
+            label = QLabel(f"{stage}: -")
+            label.setStyleSheet("color: #aaa; font-size: 11px;")
+            latency_grid.addWidget(label, 0, column)
+            self.latency_labels[stage] = label
+        layout.addLayout(latency_grid)
+
+        self.latency_timer = QTimer(self)
+        self.latency_timer.timeout.connect(self.update_latency)
+        self.latency_timer.start(1000)
+
     def update_fps(self, fps: float):
         self.fps_viewer.setText(f"FPS : {round(fps * 10) / 10}")
+
+    def update_latency(self):
+        for stage, (p50, p95, p99) in latency_stats.summary().items():
+            self.latency_labels[stage].setText(
+                f"{stage}: {_ms(p50)} / {_ms(p95)} / {_ms(p99)} ms"
+            )
+            self.latency_labels[stage].setToolTip(
+                f"{stage} latency, p50 / p95 / p99 over "
+                f"{latency_stats.histograms[stage].count} samples"
+            )
+        clocks = [
+            device.clock
+            for device in list(live_devices.values())
+            if isinstance(device, MovingHead)
+        ]
+        synced = sum(clock.synced for clock in clocks)
+        self.skew_viewer.setText(
+            f"Beat skew: ≤ {_ms(rig_skew_bound_ms(clocks))} ms "
+            f"({synced}/{len(clocks)} heads synced)"
+        )
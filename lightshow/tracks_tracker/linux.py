@@ -42,7 +42,7 @@ class PlayerInterface(Protocol):
 
 
 _loop: Final[asyncio.AbstractEventLoop] = asyncio.new_event_loop()
-threading.Thread(target=_loop.run_forever, daemon=True).start()
+threading.Thread(target=_loop.run_forever, daemon=True, name="TrackTrackerLoop").start()
 
 
 MPRIS_PREFIX: Final = "org.mpris.MediaPlayer2."
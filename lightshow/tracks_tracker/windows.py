@@ -17,7 +17,7 @@ from lightshow.tracks_tracker.abstract_tracker import ATrackTracker
 from lightshow.tracks_tracker.types import PlaybackStatus, TrackInfo
 
 _loop: Final[asyncio.AbstractEventLoop] = asyncio.new_event_loop()
-threading.Thread(target=_loop.run_forever, daemon=True).start()
+threading.Thread(target=_loop.run_forever, daemon=True, name="TrackTrackerLoop").start()
 
 
 class WindowsTracksInfoTracker(ATrackTracker):
@@ -189,7 +189,16 @@ class _Settings:
     CHUNK_SIZE: Setting[int] = Setting(
         id="audio.general.chunk_size",
         name="Chunk Size",
-        description="Number of audio frames per processing buffer",
+        description="Number of audio frames per FFT window",
+        type=int,
+        default=1024,
+        options=[256, 512, 1024, 2048, 4096],
+    )
+
+    HOP_SIZE: Setting[int] = Setting(
+        id="audio.general.hop_size",
+        name="Hop Size",
+        description="Number of audio frames between two analysis frames. Smaller than Chunk Size gives overlapping frames and lower beat latency",
         type=int,
         default=1024,
         options=[256, 512, 1024, 2048, 4096],
@@ -203,7 +212,32 @@ class _Settings:
         description="Beat detection algorithm",
         type=str,
         default="Percentile",
-        options=["Average Diff", "Percentile"],
+        options=["Average Diff", "Percentile", "Spectral Flux"],
+    )
+
+    PREDICTIVE_BEATS: Setting[bool] = Setting(
+        id="audio.detection.predictive_beats",
+        name="Predictive Beats",
+        description="Once the tempo is locked, send beats at their predicted time instead of when the kick is detected",
+        type=bool,
+        default=False,
+    )
+
+    BEAT_LEAD_MS: Setting[int] = Setting(
+        id="audio.detection.beat_lead_ms",
+        name="Beat Lead (ms)",
+        description="How early predicted beats are sent, to cancel capture, processing and network latency",
+        type=int,
+        default=40,
+        options=[0, 20, 40, 60, 80, 100],
+    )
+
+    PERCUSSION_PACKETS: Setting[bool] = Setting(
+        id="audio.detection.percussion_packets",
+        name="Snare / Hi-hat Packets",
+        description="Detect snare and hi-hat onsets and send them to the devices",
+        type=bool,
+        default=False,
     )
 
     # ── Performance › General ─────────────────────────────────────────────────
@@ -217,6 +251,126 @@ class _Settings:
         options=[10, 20, 30, 60],
     )
 
+    PROFILING: Setting[bool] = Setting(
+        id="performance.general.profiling",
+        name="Profiling",
+        description="Sample the stacks of every thread and write a flamegraph profile (collapsed stacks) to the config folder when turned off or on exit",
+        type=bool,
+        default=False,
+    )
+
+    PROFILING_RATE: Setting[int] = Setting(
+        id="performance.general.profiling_rate",
+        name="Profiling Rate (Hz)",
+        description="Stack samples per second while profiling, higher rates cost more CPU",
+        type=int,
+        default=100,
+        options=[25, 50, 100, 250, 500],
+    )
+
+    TRACING: Setting[bool] = Setting(
+        id="performance.general.tracing",
+        name="Record Trace",
+        description="Record the timing of every pipeline stage in memory, saved with Edit → Dump Trace as a Chrome trace (chrome://tracing, ui.perfetto.dev)",
+        type=bool,
+        default=False,
+    )
+
+    # ── Performance › Audio ───────────────────────────────────────────────────
+
+    CAPTURE_BUFFER: Setting[str] = Setting(
+        id="performance.audio.capture_buffer",
+        name="Capture Buffer",
+        description="Queue: bounded queue of chunks. Ring Buffer: preallocated lock-free ring, no per-chunk allocation (applied on stream restart)",
+        type=str,
+        default="Queue",
+        options=["Queue", "Ring Buffer"],
+    )
+
+    DSP_THREAD: Setting[bool] = Setting(
+        id="performance.audio.dsp_thread",
+        name="Dedicated DSP Thread",
+        description="Run the FFT, beat detection and packet sending on a worker thread instead of the GUI thread (applied on stream restart)",
+        type=bool,
+        default=False,
+    )
+
+    SPECTRUM_BUFFERS: Setting[bool] = Setting(
+        id="performance.audio.spectrum_buffers",
+        name="Preallocated FFT Buffers",
+        description="Compute the spectrum in preallocated buffers without per-chunk allocations (applied on stream restart)",
+        type=bool,
+        default=False,
+    )
+
+    OUTPUT_ENGINE: Setting[str] = Setting(
+        id="performance.devices.output_engine",
+        name="Output Engine",
+        description="Threads: a packet thread and socket per moving head. Asyncio: one event loop thread and one UDP socket shared by every moving head (applied on device reconnect)",
+        type=str,
+        default="Threads",
+        options=["Threads", "Asyncio"],
+    )
+
+    BINARY_PROTOCOL: Setting[bool] = Setting(
+        id="performance.devices.binary_protocol",
+        name="Binary Protocol",
+        description="Send compact binary frames to moving heads whose firmware supports them, the text format otherwise (applied on device reconnect)",
+        type=bool,
+        default=True,
+    )
+
+    DELTA_FRAMES: Setting[bool] = Setting(
+        id="performance.devices.delta_frames",
+        name="Delta Frames",
+        description="Only send the fields of a moving head frame that changed, skipping unchanged frames, with a full keyframe every Keyframe Interval frames (applied on device reconnect)",
+        type=bool,
+        default=False,
+    )
+
+    KEYFRAME_INTERVAL: Setting[int] = Setting(
+        id="performance.devices.keyframe_interval",
+        name="Keyframe Interval",
+        description="Frames between two full frames in delta mode, lower resyncs faster after packet loss",
+        type=int,
+        default=30,
+        options=[10, 30, 60, 120],
+    )
+
+    DEVICE_INTERPOLATION: Setting[bool] = Setting(
+        id="performance.devices.device_interpolation",
+        name="Device Interpolation",
+        description="Send moving heads sparse keyframes they move and fade between instead of every frame, beats are still sent at once (applied on device reconnect, needs firmware support for mv)",
+        type=bool,
+        default=False,
+    )
+
+    INTERPOLATION_INTERVAL: Setting[int] = Setting(
+        id="performance.devices.interpolation_interval",
+        name="Interpolation Keyframe Interval (ms)",
+        description="Time between two keyframes with Device Interpolation, motion trails the animation by this much",
+        type=int,
+        default=250,
+        options=[100, 150, 250, 400],
+    )
+
+    BEAT_SYNC: Setting[bool] = Setting(
+        id="performance.devices.beat_sync",
+        name="Synchronized Beats",
+        description="Estimate each moving head's clock offset with ping / pong and schedule beat frames to run at the same instant on every head, Beat Sync Margin after the beat (applied on device reconnect, needs firmware support for at)",
+        type=bool,
+        default=False,
+    )
+
+    BEAT_SYNC_MARGIN_MS: Setting[int] = Setting(
+        id="performance.devices.beat_sync_margin_ms",
+        name="Beat Sync Margin (ms)",
+        description="How far after the beat scheduled frames run, must cover the network delay of the slowest head or it runs them late",
+        type=int,
+        default=30,
+        options=[10, 20, 30, 50, 80],
+    )
+
     # ── helpers ───────────────────────────────────────────────────────────────
 
     def all(self) -> list[Setting[Any]]:
@@ -294,6 +448,7 @@ SETTINGS_CATEGORIES: list[SettingListItem] = [
                 settings=[
                     SETTINGS.SENSITIVITY,
                     SETTINGS.CHUNK_SIZE,
+                    SETTINGS.HOP_SIZE,
                 ],
             ),
             SettingTab(
@@ -302,6 +457,9 @@ SETTINGS_CATEGORIES: list[SettingListItem] = [
                 description="Beat detection settings",
                 settings=[
                     SETTINGS.BEAT_ALGORITHM,
+                    SETTINGS.PREDICTIVE_BEATS,
+                    SETTINGS.BEAT_LEAD_MS,
+                    SETTINGS.PERCUSSION_PACKETS,
                 ],
             ),
         ],
@@ -318,6 +476,34 @@ SETTINGS_CATEGORIES: list[SettingListItem] = [
                 description="General performance settings",
                 settings=[
                     SETTINGS.MAX_FPS,
+                    SETTINGS.PROFILING,
+                    SETTINGS.PROFILING_RATE,
+                    SETTINGS.TRACING,
+                ],
+            ),
+            SettingTab(
+                id="performance.audio",
+                name="Audio",
+                description="Audio capture and processing performance settings",
+                settings=[
+                    SETTINGS.CAPTURE_BUFFER,
+                    SETTINGS.DSP_THREAD,
+                    SETTINGS.SPECTRUM_BUFFERS,
+                ],
+            ),
+            SettingTab(
+                id="performance.devices",
+                name="Devices",
+                description="Device output performance settings",
+                settings=[
+                    SETTINGS.OUTPUT_ENGINE,
+                    SETTINGS.BINARY_PROTOCOL,
+                    SETTINGS.DELTA_FRAMES,
+                    SETTINGS.KEYFRAME_INTERVAL,
+                    SETTINGS.DEVICE_INTERPOLATION,
+                    SETTINGS.INTERPOLATION_INTERVAL,
+                    SETTINGS.BEAT_SYNC,
+                    SETTINGS.BEAT_SYNC_MARGIN_MS,
                 ],
             ),
         ],
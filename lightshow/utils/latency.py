@@ -0,0 +1,91 @@
+import threading
+import time
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """
+    Log-spaced latency histogram, 10 us to 10 s at ~5% resolution.
+
+    record() is one searchsorted and one increment, cheap enough for every
+    chunk and packet. A stage can be recorded from several threads (packet
+    senders, the beat scheduler), so writes and snapshots share a lock.
+    """
+
+    EDGES_NS = np.geomspace(1e4, 1e10, 284)
+
+    def __init__(self):
+        self.counts = np.zeros(self.EDGES_NS.size + 1, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ns: int) -> None:
+        index = int(np.searchsorted(self.EDGES_NS, latency_ns))
+        with self._lock:
+            self.counts[index] += 1
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return int(self.counts.sum())
+
+    def percentile(self, q: float) -> float | None:
+        """q-th percentile (0-100) in ms, upper edge of its bin. None if empty."""
+        with self._lock:
+            counts = self.counts.copy()
+        total = int(counts.sum())
+        if total == 0:
+            return None
+        index = int(np.searchsorted(np.cumsum(counts), q / 100 * total))
+        index = min(index, self.EDGES_NS.size - 1)
+        return float(self.EDGES_NS[index] / 1e6)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts[:] = 0
+
+
+class LatencyStats:
+    """Named pipeline stages, each with its own histogram."""
+
+    CAPTURE_TO_FFT = "Capture → FFT"
+    FFT_TO_DETECTOR = "FFT → Detector"
+    DETECTOR_TO_DEVICE = "Detector → Device"
+    QUEUE_TO_SEND = "Queue → Send"
+    CAPTURE_TO_SEND = "Capture → Send"
+
+    STAGES = (
+        CAPTURE_TO_FFT,
+        FFT_TO_DETECTOR,
+        DETECTOR_TO_DEVICE,
+        QUEUE_TO_SEND,
+        CAPTURE_TO_SEND,
+    )
+
+    def __init__(self):
+        self.histograms = {stage: LatencyHistogram() for stage in self.STAGES}
+
+    def record(self, stage: str, since_ns: int | None, now_ns: int | None = None):
+        """Record now - since for a stage, since being a time.monotonic_ns() stamp."""
+        if since_ns is None:
+            return
+        now_ns = time.monotonic_ns() if now_ns is None else now_ns
+        self.histograms[stage].record(now_ns - since_ns)
+
+    def summary(self) -> dict[str, tuple[float | None, float | None, float | None]]:
+        """p50 / p95 / p99 in ms for each stage."""
+        return {
+            stage: (
+                histogram.percentile(50),
+                histogram.percentile(95),
+                histogram.percentile(99),
+            )
+            for stage, histogram in self.histograms.items()
+        }
+
+    def reset(self) -> None:
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+
+latency_stats = LatencyStats()
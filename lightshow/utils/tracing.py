@@ -0,0 +1,122 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+
+class _Span:
+    __slots__ = ("name", "start", "tracer")
+
+    def __init__(self, tracer: Tracer, name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+_DISABLED = nullcontext()
+
+
+class Tracer:
+    """
+    In-memory recorder of timed spans, dumped as Chrome trace-event JSON
+    (chrome://tracing, ui.perfetto.dev).
+
+    Each span is one tuple appended to a bounded deque, the oldest spans
+    falling off once it is full. Appending is atomic, spans can be recorded
+    from any thread without a lock. While disabled, span() returns a shared
+    no-op context and traced functions only check the flag.
+    """
+
+    def __init__(self, capacity: int = 200_000):
+        self.enabled = False
+        self._events: deque[tuple[str, int, int, int]] = deque(maxlen=capacity)
+        self._threads: dict[int, str] = {}
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+
+    def add(self, name: str, start_ns: int, end_ns: int) -> None:
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self._events.append((name, start_ns, end_ns - start_ns, tid))
+
+    def span(self, name: str):
+        """Context manager recording the time spent in its block as name."""
+        if not self.enabled:
+            return _DISABLED
+        return _Span(self, name)
+
+    def traced(self, name: str) -> Callable[[Callable], Callable]:
+        """Decorator recording every call of the function as name."""
+
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add(name, start, time.perf_counter_ns())
+
+            return wrapper
+
+        return decorator
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def to_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        events: list[dict] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in list(self._threads.items())
+        ]
+        events.extend(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, duration, tid in self._events.copy()
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump(self, folder: Path) -> Path:
+        """Write the recorded spans to folder/traces, returns the file path."""
+        trace_folder = folder / "traces"
+        trace_folder.mkdir(parents=True, exist_ok=True)
+        path = trace_folder / f"trace-{datetime.now():%Y%m%d-%H%M%S}.json"
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+
+tracer = Tracer()
@@ -1,8 +1,10 @@
 import importlib.util
+import threading
 import traceback
 
 import numpy as np
 import pyqtgraph as pg
+from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtWidgets import QVBoxLayout, QWidget
 
 from lightshow.audio.audio_types import AudioData
@@ -46,11 +48,16 @@ class FrequenciesVisualizer(QWidget):
     - Log-scaled frequency axis (Hz labels)
     - Log-scaled power axis (dB)
     - Hermite-smoothed curve
+
+    Can be called from any thread: only the latest frame is kept and it is
+    rendered on the Qt thread.
     """
 
     SAMPLE_RATE = 44100
     CHUNK_SIZE = 1024
 
+    _data_received = pyqtSignal()
+
     def __init__(
         self,
         freq_range: tuple[int, int] = (0, 2049),
@@ -71,6 +78,10 @@ class FrequenciesVisualizer(QWidget):
             chunk_size, d=1.0 / sample_rate
         )  # shape: (n_bins,)
 
+        self._pending: AudioData | None = None
+        self._pending_lock = threading.Lock()
+        self._data_received.connect(self._render_pending)
+
         self._setup_ui()
         self._setup_log_x_axis()
 
@@ -164,6 +175,20 @@ class FrequenciesVisualizer(QWidget):
     # ------------------------------------------------------------------
 
     def __call__(self, data: AudioData) -> None:
+        # Latest frame wins; only schedule a render if none is pending yet
+        with self._pending_lock:
+            schedule = self._pending is None
+            self._pending = data
+        if schedule:
+            self._data_received.emit()
+
+    def _render_pending(self) -> None:
+        with self._pending_lock:
+            data, self._pending = self._pending, None
+        if data is not None:
+            self._render(data)
+
+    def _render(self, data: AudioData) -> None:
         try:
             lo, hi = self.freq_range
             hi = min(hi, len(data.frequencies))
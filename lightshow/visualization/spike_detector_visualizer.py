@@ -14,6 +14,7 @@ from PyQt6.QtWidgets import QVBoxLayout, QWidget
 from lightshow.audio.data import AudioData
 from lightshow.gui.utils import ui_signals
 from lightshow.utils.logger import Logger
+from lightshow.utils.tracing import tracer
 
 _logger = Logger.for_class("Audio Visualization")
 
@@ -38,6 +39,16 @@ MarkerTypes = Literal["beat", "break", "drop"]
 class SpikeDetectorVisualizer(QWidget):
     """Real-time spike visualizer using pyqtgraph for efficient plotting."""
 
+    @property
+    def detection_method(self):
+        """
+        Support both old and new architecture: the DetectionMethod of the
+        detector (looked up every time, it can be swapped at runtime) or the
+        spike detector itself when it has no .detector attribute.
+        """
+        detector = getattr(self.spike_detector, "detector", None)
+        return detector if detector is not None else self.spike_detector
+
     def __init__(
         self,
         spike_detector,
@@ -49,14 +60,6 @@ class SpikeDetectorVisualizer(QWidget):
         self.visualization_len = visualization_len
         self.expected_max = expected_max
 
-        # Support both old and new architecture
-        # New architecture: detector has a .detector attribute with DetectionMethod
-        # Fall back to spike_detector itself if no .detector attribute exists
-        if hasattr(spike_detector, "detector") and spike_detector.detector is not None:
-            self.detection_method = spike_detector.detector
-        else:
-            self.detection_method = spike_detector
-
         pg.setConfigOption("antialias", True)
 
         self.x_history = deque(maxlen=visualization_len)
@@ -156,9 +159,13 @@ class SpikeDetectorVisualizer(QWidget):
     def __call__(
         self, data, beat_detected=False, break_detected=False, drop_detected=False
     ):
+        # Called on the detecting thread right after detect(): the limit it
+        # published for this frame travels with it, the GUI thread never
+        # touches the detector's state
+        limit = getattr(self.detection_method, "limit", 0.0)
         try:
             self.update_queue.put_nowait(
-                (data, beat_detected, break_detected, drop_detected)
+                (data, beat_detected, break_detected, drop_detected, limit)
             )
         except Full:
             pass
@@ -191,7 +198,12 @@ class SpikeDetectorVisualizer(QWidget):
             self.qt_update()
 
     def _on_update_data(
-        self, data: AudioData, beat_detected, break_detected, drop_detected
+        self,
+        data: AudioData,
+        beat_detected,
+        break_detected,
+        drop_detected,
+        limit: float = 0.0,
     ):
         try:
             # Get freq_range from spike_detector or its parent if using new architecture
@@ -201,7 +213,7 @@ class SpikeDetectorVisualizer(QWidget):
                 getattr(self.spike_detector, "bin_range", [0, 1]),
             )
 
-            current_energy = data.frequencies[freq_range[0] : freq_range[1] + 1].mean()
+            current_energy = data.get_freq_mean([freq_range[0], freq_range[1] + 1])
             raw = np.log1p(data.frequencies).mean()
             alpha = 0.02
             if not hasattr(self, "smoothed_global"):
@@ -232,11 +244,6 @@ class SpikeDetectorVisualizer(QWidget):
                 self.global_index += 1
                 return
 
-            if hasattr(self.detection_method, "get_limit"):
-                limit = self.detection_method.get_limit()
-            else:
-                # Fallback for old detectors without get_limit
-                limit = 0
             self.limit_history.append(limit)
             self._add_marker("beat", beat_detected, current_energy)
             self._add_marker("break", break_detected, current_energy)
@@ -264,6 +271,7 @@ class SpikeDetectorVisualizer(QWidget):
                 ]
             self.marker_data[marker_type].dirty = True
 
+    @tracer.traced("SpikeDetectorVisualizer.qt_update")
     def qt_update(self):
         """Update plot items with buffered data."""
         if not self.x_history: